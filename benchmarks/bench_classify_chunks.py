@@ -0,0 +1,70 @@
+"""
+classify_names 분할 병렬 처리: 묶음 크기별 지연시간
+
+가짜 LLM 백엔드의 출력 토큰당 생성 시간(FAKE_LLM_MS_PER_OUTPUT_TOKEN)을 켜서
+출력 길이가 지연을 지배하는 상황을 흉내 내고, 같은 이름 목록을 묶음 크기만 바꿔 분류한다.
+--fail-rate 를 주면 가짜 LLM 응답 일부를 잘린 JSON / 규칙에 어긋난 항목으로 만들어
+classify_names 안의 재시도(묶음당 최대 OCR_OUTPUT_RETRIES + 1 회 호출)를 확인한다.
+실행 (저장소 루트에서):
+    python -m benchmarks.bench_classify_chunks --names 60 --chunk-sizes 60,20,10,5
+"""
+import os
+import tempfile
+
+# 모듈 import 전에 설정해야 가짜 백엔드가 선택된다
+os.environ.setdefault("LLM_BACKEND", "fake")
+os.environ.setdefault("OPENAI_API_KEY", "fake")
+os.environ.setdefault("FAKE_LLM_LATENCY_MS", "300")
+os.environ.setdefault("FAKE_LLM_JITTER_MS", "0")
+os.environ.setdefault("FAKE_LLM_MS_PER_OUTPUT_TOKEN", "5")
+os.environ.setdefault(
+    "SQLALCHEMY_DATABASE_URL",
+    f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}",
+)
+
+import argparse
+import asyncio
+import random
+import time
+
+import llm_backend
+from database import Base, engine
+from domain.ocr import ocr_router
+from domain.ocr.ocr_service import structured_output_stats
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--names", type=int, default=60)
+    parser.add_argument("--chunk-sizes", default="60,20,10,5")
+    parser.add_argument("--fail-rate", type=float, default=0.0)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    random.seed(args.seed)
+    llm_backend.FAKE_LLM_INVALID_RATE = args.fail_rate
+
+    print(f"names={args.names} fail_rate={args.fail_rate} "
+          f"latency={os.environ['FAKE_LLM_LATENCY_MS']}ms + {os.environ['FAKE_LLM_MS_PER_OUTPUT_TOKEN']}ms/token")
+    print(f"{'chunk':>6} {'elapsed(s)':>11} {'items':>6} {'lost':>5} {'calls':>6} {'retried':>8}  result")
+    for run, size in enumerate(int(s) for s in args.chunk_sizes.split(",")):
+        ocr_router.OCR_CLASSIFY_CHUNK_SIZE = size
+        before = structured_output_stats()["classify"]
+        # 실행마다 이름을 바꿔서 앞 실행이 채운 사전에 걸리지 않도록 (중복 이름도 섞음)
+        names = [f"식재료{run}-{i % (args.names - 5)}" for i in range(args.names)]
+        started = time.perf_counter()
+        try:
+            items, unclassified = await ocr_router._classify(names)
+            kept = [name for name in names if name not in unclassified]
+            result = "ok" if [it["item_name"] for it in items] == kept else "ORDER MISMATCH"
+        except Exception as e:
+            items, unclassified, result = [], [], f"failed: {e}"
+        after = structured_output_stats()["classify"]
+        print(f"{size:>6} {time.perf_counter() - started:>11.3f} {len(items):>6} {len(unclassified):>5} "
+              f"{after['calls'] - before['calls']:>6} "
+              f"{after['retried_entries'] - before['retried_entries']:>8}  {result}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,94 @@
+"""
+가짜 LLM 백엔드로 QA / OCR 경로의 동시 처리량 측정 (OpenAI 호출 없음)
+
+- route_request           : aroute_request (분류 → 생성)
+- extract_names_from_image: 영수증 이미지 → 상품명
+- classify_names          : 상품명 → 카테고리/유통기한
+
+FAKE_LLM_LATENCY_MS / FAKE_LLM_JITTER_MS 로 가짜 응답 지연을 조절한다.
+실행 (저장소 루트에서):
+    python -m benchmarks.bench_llm_throughput --requests 200 --concurrency 32
+"""
+import os
+import tempfile
+
+# 모듈 import 전에 설정해야 가짜 백엔드가 선택된다
+# DB 를 지정하지 않으면 임시 sqlite 파일 사용 (분류 메모 테이블용)
+os.environ.setdefault("LLM_BACKEND", "fake")
+os.environ.setdefault("OPENAI_API_KEY", "fake")
+os.environ.setdefault(
+    "SQLALCHEMY_DATABASE_URL",
+    f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}",
+)
+
+import argparse
+import asyncio
+import io
+import statistics
+import time
+
+import domain.qa.qa_chain as qa_chain
+from database import Base, engine
+from domain.ocr.ocr_service import extract_names_from_image, classify_names
+from benchmarks.bench_route_modes import SAMPLE_REQUESTS, SAMPLE_INGREDIENTS, percentile
+
+SAMPLE_IMAGE = b"\xff\xd8\xff\xe0" + os.urandom(64 * 1024)
+SAMPLE_NAMES = ["감자", "양파", "두부", "삼겹살", "우유", "과자", "쌈무", "대파"]
+
+
+async def run_route(i: int):
+    # 요청마다 재료를 달리해서 디스패처의 중복 호출 합치기를 피함
+    await qa_chain.aroute_request(SAMPLE_REQUESTS[i % len(SAMPLE_REQUESTS)], f"{SAMPLE_INGREDIENTS}, 재료{i}")
+
+
+async def run_extract(i: int):
+    await extract_names_from_image(io.BytesIO(SAMPLE_IMAGE))
+
+
+async def run_classify(i: int):
+    await classify_names(SAMPLE_NAMES + [f"재료{i}"])
+
+
+async def measure(fn, requests: int, concurrency: int) -> tuple[float, list[float]]:
+    sem = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def one(i: int):
+        async with sem:
+            start = time.perf_counter()
+            await fn(i)
+            latencies.append(time.perf_counter() - start)
+
+    started = time.perf_counter()
+    await asyncio.gather(*(one(i) for i in range(requests)))
+    return time.perf_counter() - started, latencies
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--requests", type=int, default=100)
+    parser.add_argument("--concurrency", type=int, default=16)
+    parser.add_argument("--llm-only", action="store_true",
+                        help="로컬 분류기/레시피 인덱스를 끄고 모든 요청이 LLM 을 타도록 함")
+    args = parser.parse_args()
+
+    Base.metadata.create_all(bind=engine)
+    if args.llm_only:
+        qa_chain.QA_FAST_CLASSIFIER_THRESHOLD = 2.0
+        qa_chain.recommend_by_inventory = lambda *a: None
+        qa_chain.recommend_by_keyword = lambda *a: None
+
+    print(f"backend={os.environ['LLM_BACKEND']} requests={args.requests} concurrency={args.concurrency}")
+    print(f"{'path':<26} {'req/s':>8} {'p50(s)':>8} {'p95(s)':>8} {'mean(s)':>8}")
+    for name, fn in (
+        ("route_request", run_route),
+        ("extract_names_from_image", run_extract),
+        ("classify_names", run_classify),
+    ):
+        elapsed, lat = await measure(fn, args.requests, args.concurrency)
+        print(f"{name:<26} {len(lat) / elapsed:>8.1f} {percentile(lat, 50):>8.3f} "
+              f"{percentile(lat, 95):>8.3f} {statistics.mean(lat):>8.3f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,154 @@
+"""
+OCR 호출 중에도 이벤트 루프가 막히지 않는지 확인하는 회귀 벤치마크
+
+item + ocr 라우터로 앱을 띄우고 (가짜 LLM 백엔드, 임시 sqlite)
+1) OCR 없이 /item/{user_id}/ 조회 지연
+2) /ocr/extract-names, /ocr/classify-names 호출이 진행 중일 때의 조회 지연
+을 비교한다. 2)의 최대 지연이 --max-latency-ms 를 넘으면 종료 코드 1.
+(루프가 막히면 그동안의 조회 몇 건만 크게 느려지므로 p95 가 아닌 최대값으로 판정)
+
+--simulate-blocking 을 주면 OCR 호출을 동기 sleep 으로 바꿔 예전(루프 차단) 동작을 재현한다.
+실행 (저장소 루트에서):
+    python -m benchmarks.bench_ocr_event_loop --ocr-calls 8 --reads 200
+"""
+import os
+import tempfile
+
+# 모듈 import 전에 설정해야 가짜 백엔드가 선택된다
+os.environ.setdefault("LLM_BACKEND", "fake")
+os.environ.setdefault("OPENAI_API_KEY", "fake")
+os.environ.setdefault("FAKE_LLM_LATENCY_MS", "1000")
+os.environ.setdefault(
+    "SQLALCHEMY_DATABASE_URL",
+    f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}",
+)
+
+import argparse
+import asyncio
+import statistics
+import sys
+import time
+from datetime import date, timedelta
+
+import httpx
+from fastapi import FastAPI
+
+import llm_backend
+from database import Base, engine, SessionLocal
+from domain.item import item_router
+from domain.ocr import ocr_router
+from models import User, Category, Item
+from benchmarks.bench_route_modes import percentile
+
+USER_ID = 1
+
+
+def build_app() -> FastAPI:
+    app = FastAPI()
+    app.include_router(item_router.router)
+    app.include_router(ocr_router.router)
+    return app
+
+
+def seed(items: int):
+    Base.metadata.create_all(bind=engine)
+    db = SessionLocal()
+    try:
+        db.add(User(user_id=USER_ID, login_id="bench", username="bench", password="x"))
+        category = Category(category_major_name="식물성", category_sub_name="채소류")
+        db.add(category)
+        db.flush()
+        today = date.today()
+        db.add_all(
+            Item(user_id=USER_ID, category_id=category.category_id,
+                 item_name=f"재료{i}", expiry_date=today + timedelta(days=i % 30))
+            for i in range(items)
+        )
+        db.commit()
+    finally:
+        db.close()
+
+
+async def read_items(client: httpx.AsyncClient, reads: int, interval: float) -> list[float]:
+    latencies = []
+    for _ in range(reads):
+        start = time.perf_counter()
+        resp = await client.get(f"/item/{USER_ID}/")
+        resp.raise_for_status()
+        latencies.append(time.perf_counter() - start)
+        await asyncio.sleep(interval)
+    return latencies
+
+
+async def ocr_call(client: httpx.AsyncClient, i: int):
+    # 이미지/이름을 매번 달리해서 디스패처의 중복 호출 합치기를 피함
+    image = b"\xff\xd8\xff\xe0" + i.to_bytes(4, "big") + os.urandom(32 * 1024)
+    resp = await client.post("/ocr/extract-names", files={"file": ("r.jpg", image, "image/jpeg")})
+    resp.raise_for_status()
+    names = resp.json()["extracted_names"] + [f"재료{i}"]
+    resp = await client.post("/ocr/classify-names", json={"names": names})
+    resp.raise_for_status()
+
+
+def simulate_blocking():
+    """예전 동작 재현: 동기 클라이언트처럼 호출 동안 루프 전체를 멈춤"""
+    completions = llm_backend.get_openai_client().chat.completions
+    original = completions.create
+    delay = llm_backend.FAKE_LLM_LATENCY_MS / 1000
+    # 지연은 동기 sleep 으로만, 원래 create 의 비동기 지연은 0 으로
+    llm_backend.FAKE_LLM_LATENCY_MS = 0.0
+    llm_backend.FAKE_LLM_JITTER_MS = 0.0
+
+    async def blocking_create(*args, **kwargs):
+        time.sleep(delay)
+        return await original(*args, **kwargs)
+
+    completions.create = blocking_create
+
+
+def summary(name: str, lat: list[float]) -> str:
+    return (f"{name:<12} {len(lat):>5} {percentile(lat, 50) * 1000:>9.1f} "
+            f"{percentile(lat, 95) * 1000:>9.1f} {max(lat) * 1000:>9.1f} "
+            f"{statistics.mean(lat) * 1000:>9.1f}")
+
+
+async def main() -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--items", type=int, default=50)
+    parser.add_argument("--reads", type=int, default=100)
+    parser.add_argument("--read-interval-ms", type=float, default=10)
+    parser.add_argument("--ocr-calls", type=int, default=8)
+    parser.add_argument("--max-latency-ms", type=float, default=250)
+    parser.add_argument("--simulate-blocking", action="store_true")
+    args = parser.parse_args()
+
+    seed(args.items)
+    if args.simulate_blocking:
+        simulate_blocking()
+
+    interval = args.read_interval_ms / 1000
+    transport = httpx.ASGITransport(app=build_app())
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+        await read_items(client, 5, 0)  # 워밍업
+        baseline = await read_items(client, args.reads, interval)
+
+        ocr = asyncio.gather(*(ocr_call(client, i) for i in range(args.ocr_calls)))
+        await asyncio.sleep(0.05)  # OCR 호출이 먼저 시작되도록
+        during = await read_items(client, args.reads, interval)
+        await ocr
+
+    print(f"OCR 동시 호출 {args.ocr_calls}개, 가짜 LLM 지연 {os.environ['FAKE_LLM_LATENCY_MS']}ms")
+    print(f"{'/item reads':<12} {'n':>5} {'p50(ms)':>9} {'p95(ms)':>9} {'max(ms)':>9} {'mean(ms)':>9}")
+    print(summary("baseline", baseline))
+    print(summary("during OCR", during))
+
+    worst = max(during) * 1000
+    if worst > args.max_latency_ms:
+        print(f"FAIL: OCR 중 /item 조회 최대 지연 {worst:.1f}ms > {args.max_latency_ms}ms")
+        return 1
+    print("OK")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
@@ -0,0 +1,97 @@
+"""
+route_request 두 가지 모드의 지연시간 비교 (p50 / p95)
+
+- two_hop: LLM 분류 → LLM 생성 (직렬 2회)
+- single : 분류 + 답변 단일 호출
+
+LLM 을 건너뛰게 하는 층(로컬 빠른 분류기, 분류 메모, 로컬 레시피 인덱스)을 끄고
+요청마다 문장/재료를 달리해서 디스패처의 중복 호출 합치기도 피한다 → 매 요청이 LLM 경로를 탄다.
+(응답 캐시는 user_id 를 넘기지 않으므로 쓰이지 않음)
+LLM_BACKEND 를 지정하지 않으면 가짜 백엔드 (FAKE_LLM_LATENCY_MS 로 지연 조절).
+실행 (저장소 루트에서):
+    python -m benchmarks.bench_route_modes --rounds 20 --concurrency 4
+"""
+import os
+import tempfile
+
+# 모듈 import 전에 설정해야 적용된다
+os.environ.setdefault("LLM_BACKEND", "fake")
+os.environ.setdefault("OPENAI_API_KEY", "fake")
+os.environ.setdefault(
+    "SQLALCHEMY_DATABASE_URL",
+    f"sqlite:///{os.path.join(tempfile.mkdtemp(), 'bench.db')}",
+)
+
+import argparse
+import asyncio
+import statistics
+import time
+
+import domain.qa.qa_chain as qa_chain
+
+SAMPLE_REQUESTS = [
+    "오늘 뭐 먹지?",
+    "김치찌개 레시피 알려줘",
+    "감자로 만들 수 있는 요리",
+    "중식 추천해줘",
+    "너 뭐야?",
+    "두부 보관은 어떻게 해?",
+]
+SAMPLE_INGREDIENTS = "감자, 양파, 두부, 김치, 달걀, 대파, 돼지고기, 애호박, 된장, 고추장"
+
+
+def percentile(values: list[float], pct: float) -> float:
+    ordered = sorted(values)
+    idx = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[idx]
+
+
+async def _no_memo(user_request: str) -> None:
+    return None
+
+
+async def _skip_memo_save(user_request: str, label: str):
+    pass
+
+
+async def run_mode(mode: str, rounds: int, concurrency: int) -> list[float]:
+    qa_chain.QA_ROUTE_MODE = mode
+    sem = asyncio.Semaphore(concurrency)
+    latencies: list[float] = []
+
+    async def one(i: int, req: str):
+        async with sem:
+            start = time.perf_counter()
+            # 문장과 재료를 요청마다 다르게 → 같은 프롬프트 합치기 없이 매번 LLM 호출
+            await qa_chain.aroute_request(f"{req} ({mode} {i})", f"{SAMPLE_INGREDIENTS}, 재료{i}")
+            latencies.append(time.perf_counter() - start)
+
+    jobs = [one(i, req) for i, req in enumerate(SAMPLE_REQUESTS * rounds)]
+    await asyncio.gather(*jobs)
+    return latencies
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=5)
+    parser.add_argument("--concurrency", type=int, default=4)
+    args = parser.parse_args()
+
+    # 로컬 분류기 / 분류 메모 / 로컬 레시피 인덱스를 꺼서 모든 요청이 LLM 경로를 타도록 함
+    qa_chain.QA_FAST_CLASSIFIER_THRESHOLD = 2.0
+    qa_chain.get_memo_label = lambda user_request: None
+    qa_chain.save_memo_label = lambda user_request, label: None
+    qa_chain.aget_memo_label = _no_memo
+    qa_chain.asave_memo_label = _skip_memo_save
+    qa_chain.recommend_by_inventory = lambda *args, **kwargs: None
+    qa_chain.recommend_by_keyword = lambda *args, **kwargs: None
+
+    print(f"{'mode':<8} {'n':>5} {'p50(s)':>8} {'p95(s)':>8} {'mean(s)':>8}")
+    for mode in ("two_hop", "single"):
+        lat = await run_mode(mode, args.rounds, args.concurrency)
+        print(f"{mode:<8} {len(lat):>5} {percentile(lat, 50):>8.3f} "
+              f"{percentile(lat, 95):>8.3f} {statistics.mean(lat):>8.3f}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
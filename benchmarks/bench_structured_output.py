@@ -0,0 +1,57 @@
+"""
+OCR structured output 검증/재요청 비용: 불량 응답 비율별 LLM 호출 수와 결과
+
+가짜 LLM 백엔드가 FAKE_LLM_INVALID_RATE 비율로 규칙에 어긋난 항목과 잘린 JSON 을 섞어 돌려주게 하고
+같은 이름 목록을 classify_names 로 분류한다. 예전처럼 불량 하나에 요청 전체를 버렸다면
+"whole-retry" 열 만큼의 이름을 다시 보내야 했다.
+실행 (저장소 루트에서):
+    python -m benchmarks.bench_structured_output --names 10 --requests 50 --rates 0,0.05,0.2
+"""
+import os
+
+# 모듈 import 전에 설정해야 가짜 백엔드가 선택된다
+os.environ.setdefault("LLM_BACKEND", "fake")
+os.environ.setdefault("OPENAI_API_KEY", "fake")
+os.environ.setdefault("FAKE_LLM_LATENCY_MS", "0")
+os.environ.setdefault("FAKE_LLM_JITTER_MS", "0")
+os.environ.setdefault("SQLALCHEMY_DATABASE_URL", "sqlite://")
+
+import argparse
+import asyncio
+import logging
+import random
+
+import llm_backend
+from domain.ocr import ocr_service
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--names", type=int, default=10, help="요청 1건의 이름 수 (묶음 크기)")
+    parser.add_argument("--requests", type=int, default=50)
+    parser.add_argument("--rates", default="0,0.05,0.2")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    logging.disable(logging.WARNING)
+    random.seed(args.seed)
+    names = [f"식재료{i}" for i in range(args.names)]
+
+    print(f"{'rate':>5} {'calls':>6} {'parse fail':>11} {'invalid':>8} {'repaired':>9} "
+          f"{'retried':>8} {'dropped':>8} {'whole-retry':>12}")
+    for rate in (float(r) for r in args.rates.split(",")):
+        llm_backend.FAKE_LLM_INVALID_RATE = rate
+        for counters in ocr_service._output_stats.values():
+            counters.update(dict.fromkeys(counters, 0))
+        for _ in range(args.requests):
+            await ocr_service.classify_names(names)
+        s = ocr_service.structured_output_stats()["classify"]
+        # 예전 방식: 첫 응답에 불량이 하나라도 있으면 이름 전부를 다시 보냄 (첫 응답 기준 근사치)
+        bad_response = 1 - (1 - rate) ** args.names * (1 - rate)
+        print(f"{rate:>5.2f} {s['calls']:>6} {s['parse_failure_rate']:>11.1%} {s['invalid_rate']:>8.1%} "
+              f"{s['repaired_entries']:>9} {s['retried_entries']:>8} {s['dropped_entries']:>8} "
+              f"{round(bad_response * args.requests * args.names):>12}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,98 @@
+"""
+OCR 업로드 1건당 최대 메모리 사용량 비교
+
+- read_all : 예전 방식. file.read() → base64.b64encode().decode() → f-string data URL
+- stream   : spooled 파일에서 조각 단위로 base64 data URL 생성 (전처리 없이 원본 전송 시)
+- pipeline : 현재 경로. 해시(조각 단위) → 전처리(draft 디코딩) → 전처리 결과의 data URL
+
+시나리오마다 새 프로세스에서 실행해서 tracemalloc 최대값(bytes/str 사본, numpy 배열)을 잰다.
+Pillow 내부 픽셀 버퍼는 tracemalloc 에 잡히지 않는다 (전처리는 draft 디코딩으로 이를 1/4 정도로 줄임).
+업로드는 실제 요청처럼 디스크로 넘어간 SpooledTemporaryFile 로 흉내 낸다.
+실행 (저장소 루트에서):
+    python -m benchmarks.bench_upload_memory [--image 영수증.jpg]
+"""
+import argparse
+import json
+import os
+import subprocess
+import sys
+import tempfile
+
+SCENARIOS = ("read_all", "stream", "pipeline")
+
+
+def run_scenario(name: str, path: str) -> dict:
+    os.environ.setdefault("OPENAI_API_KEY", "fake")
+    os.environ.setdefault("SQLALCHEMY_DATABASE_URL", "sqlite://")
+
+    import base64
+    import shutil
+    import tempfile
+    import tracemalloc
+
+    from domain.ocr.ocr_cache import image_key
+    from domain.ocr.ocr_utils import image_data_url, preprocess_receipt, file_size
+
+    # starlette 와 같은 1MB spooled 파일 (넘으면 디스크)
+    upload = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    with open(path, "rb") as fp:
+        shutil.copyfileobj(fp, upload)
+    size = file_size(upload)
+
+    tracemalloc.start()
+
+    if name == "read_all":
+        upload.seek(0)
+        img = upload.read()
+        b64 = base64.b64encode(img).decode("utf-8")
+        url = f"data:image/jpeg;base64,{b64}"
+    elif name == "stream":
+        url = image_data_url(upload)
+    else:
+        image_key(upload)
+        processed, _ = preprocess_receipt(upload)
+        url = image_data_url(processed)
+
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return {
+        "file_bytes": size,
+        "payload_bytes": len(url),
+        "tracemalloc_peak": peak,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--width", type=int, default=4032)
+    parser.add_argument("--height", type=int, default=3024)
+    parser.add_argument("--image", help="측정할 이미지 (없으면 합성 영수증 사진)")
+    parser.add_argument("--scenario", choices=SCENARIOS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.scenario:
+        print(json.dumps(run_scenario(args.scenario, args.image)))
+        return
+
+    path = args.image
+    if path is None:
+        from benchmarks.bench_receipt_preprocess import synthetic_receipt
+        fd, path = tempfile.mkstemp(suffix=".jpg")
+        with os.fdopen(fd, "wb") as fp:
+            fp.write(synthetic_receipt(args.width, args.height))
+
+    mb = 1024 * 1024
+    print(f"{'scenario':<10} {'file(MB)':>9} {'payload(MB)':>12} {'py peak(MB)':>12} "
+          f"{'x file':>7}")
+    for name in SCENARIOS:
+        out = subprocess.run(
+            [sys.executable, "-m", "benchmarks.bench_upload_memory", "--scenario", name, "--image", path],
+            capture_output=True, text=True, check=True,
+        ).stdout
+        r = json.loads(out.strip().splitlines()[-1])
+        print(f"{name:<10} {r['file_bytes'] / mb:>9.2f} {r['payload_bytes'] / mb:>12.2f} "
+              f"{r['tracemalloc_peak'] / mb:>12.2f} {r['tracemalloc_peak'] / r['file_bytes']:>7.2f}")
+
+
+if __name__ == "__main__":
+    main()
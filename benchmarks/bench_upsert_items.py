@@ -0,0 +1,126 @@
+"""
+upsert_items: 예전 행 단위 경로 vs 일괄 INSERT ... ON CONFLICT 경로
+
+SQLALCHEMY_DATABASE_URL 의 Postgres 에 대해 배치 크기별로 소요 시간, DB 왕복(SQL 실행) 수, commit 수를 잰다.
+절반은 이미 있는 재고(갱신), 절반은 새 재고(생성)가 되도록 같은 이름을 두 번 나눠 넣고,
+측정이 끝나면 넣은 행(이름이 "bench-" 로 시작)을 지운다.
+실행 (저장소 루트에서, 마이그레이션이 적용된 DB 필요):
+    python -m benchmarks.bench_upsert_items --user-id 1 --batch-sizes 1,10,40,100,200
+"""
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "fake")
+
+import argparse
+import time
+from datetime import date, datetime, timedelta, timezone
+
+from sqlalchemy import event
+
+from database import SessionLocal, engine
+from domain.item.item_crud import upsert_items
+from domain.item.item_schema import ItemCreate
+from models import Category, Item
+
+CATEGORIES = [("식물성", "채소류"), ("동물성", "육류"), ("기타", "스낵/과자"), ("식물성", "과일류")]
+
+
+def get_or_create_category(db, major, sub):
+    """예전 구현: 매번 조회, 없으면 만들고 바로 commit"""
+    cat = db.query(Category).filter(
+        Category.category_major_name == major, Category.category_sub_name == sub
+    ).first()
+    if not cat:
+        cat = Category(category_major_name=major, category_sub_name=sub)
+        db.add(cat)
+        db.commit()
+        db.refresh(cat)
+    return cat
+
+
+def legacy_upsert_items(db, items, user_id):
+    """예전 구현: 아이템마다 카테고리 조회(+commit), 기존 아이템 조회, 마지막에 아이템마다 refresh"""
+    updated_items = []
+    for item in items:
+        cat = get_or_create_category(db, item.category_major_name, item.category_sub_name)
+        db_item = (
+            db.query(Item)
+              .filter_by(user_id=user_id, item_name=item.item_name, category_id=cat.category_id)
+              .first()
+        )
+        if db_item:
+            db_item.expiry_date = item.expiry_date
+            db_item.created_at = datetime.now(timezone.utc)
+        else:
+            payload = item.model_dump()
+            payload.pop("category_major_name")
+            payload.pop("category_sub_name")
+            payload["category_id"] = cat.category_id
+            payload["user_id"] = user_id
+            db_item = Item(**payload)
+            db.add(db_item)
+        updated_items.append(db_item)
+    db.commit()
+    for item in updated_items:
+        db.refresh(item)
+    return updated_items
+
+
+def make_items(run: str, size: int) -> list[ItemCreate]:
+    return [
+        ItemCreate(
+            item_name=f"bench-{run}-{i}",
+            category_major_name=CATEGORIES[i % len(CATEGORIES)][0],
+            category_sub_name=CATEGORIES[i % len(CATEGORIES)][1],
+            expiry_date=date.today() + timedelta(days=i % 30),
+        )
+        for i in range(size)
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--user-id", type=int, default=1)
+    parser.add_argument("--batch-sizes", default="1,10,40,100,200")
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    counts = {"statements": 0, "commits": 0}
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def count_statement(*_):
+        counts["statements"] += 1
+
+    @event.listens_for(engine, "commit")
+    def count_commit(*_):
+        counts["commits"] += 1
+
+    paths = {"legacy": legacy_upsert_items, "bulk": upsert_items}
+    print(f"{'batch':>6} {'path':<7} {'ms/call':>9} {'statements':>11} {'commits':>8}")
+    try:
+        for size in (int(s) for s in args.batch_sizes.split(",")):
+            for name, upsert in paths.items():
+                elapsed, statements, commits = 0.0, 0, 0
+                for r in range(args.repeat):
+                    items = make_items(f"{name}{size}-{r}", size)
+                    # 앞 절반을 먼저 넣어 두면 측정 호출은 절반 갱신 + 절반 생성
+                    with SessionLocal() as db:
+                        upsert_items(db, items[: size // 2], args.user_id)
+                    with SessionLocal() as db:
+                        counts.update(statements=0, commits=0)
+                        started = time.perf_counter()
+                        result = upsert(db, items, args.user_id)
+                        [itm.category.category_sub_name for itm in result]  # 응답 직렬화와 같은 접근
+                        elapsed += time.perf_counter() - started
+                        statements += counts["statements"]
+                        commits += counts["commits"]
+                print(f"{size:>6} {name:<7} {elapsed / args.repeat * 1000:>9.1f} "
+                      f"{statements / args.repeat:>11.0f} {commits / args.repeat:>8.0f}")
+    finally:
+        with SessionLocal() as db:
+            db.query(Item).filter(Item.item_name.like("bench-%")).delete(synchronize_session=False)
+            db.commit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""
+로컬 빠른 분류기(fast_classify) 회귀 검사 + LLM 비교 표본
+
+SAMPLES 의 각 문장에 대해
+- 기대 라벨이 있으면: 로컬 분류기가 그 라벨로 임계값 이상 확신해야 함
+- 기대 라벨이 None 이면: 임계값 미만이어서 LLM 으로 넘어가야 함 (레시피처럼 보이는 예외 질문 등)
+하나라도 어긋나면 종료 코드 1.
+--llm 을 주면 같은 표본을 classify_input(LLM) 에도 보내서 운영의 shadow 비교처럼 일치율을 출력한다.
+실행 (저장소 루트에서):
+    python -m benchmarks.check_fast_classifier [--llm]
+"""
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "fake")
+os.environ.setdefault("SQLALCHEMY_DATABASE_URL", "sqlite://")
+
+import argparse
+import asyncio
+import sys
+
+from config import QA_FAST_CLASSIFIER_THRESHOLD
+from domain.qa.qa_classifier import fast_classify
+
+SAMPLES = [
+    ("오늘 뭐 먹지?", "일반레시피"),
+    ("오늘 저녁 뭐 먹을까", "일반레시피"),
+    ("김치찌개 레시피 알려줘", "요리키워드"),
+    ("된장찌개 만드는 법", "요리키워드"),
+    ("제육볶음 해먹고 싶어", "요리키워드"),
+    ("김치 넣은 볶음밥 만들래", "요리키워드"),
+    ("감자로 만들 수 있는 요리", "재료키워드"),
+    ("중식 추천해줘", "카테고리"),
+    ("일식으로 뭐 먹지", "카테고리"),
+    ("너 뭐야?", "챗봇정보"),
+    ("무슨 기능이 있어?", "챗봇정보"),
+    # 요리명만 있거나 레시피가 아닌 질문 → LLM
+    ("김치찌개", None),
+    ("라면의 유래가 뭘까", "예외"),
+    ("김치찌개의 유래가 뭘까", None),
+    ("카레 칼로리 얼마야", None),
+    ("감자탕 맛집 추천", None),
+    ("떡볶이 말고 다른거", None),
+    ("김밥 왜 옆구리 터져?", None),
+    ("두부 보관은 어떻게 해?", None),
+]
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--llm", action="store_true", help="같은 표본을 LLM 분류와 비교")
+    args = parser.parse_args()
+
+    failures = 0
+    print(f"{'request':<28} {'expected':<10} {'local':<10} {'conf':>5}  result")
+    results = []
+    for request, expected in SAMPLES:
+        label, confidence = fast_classify(request)
+        confident = label is not None and confidence >= QA_FAST_CLASSIFIER_THRESHOLD
+        ok = (confident and label == expected) if expected else not confident
+        failures += not ok
+        results.append((request, label if confident else None))
+        print(f"{request:<28} {expected or 'LLM':<10} {label or '-':<10} {confidence:>5.2f}  {'ok' if ok else 'FAIL'}")
+
+    if args.llm:
+        from domain.qa.qa_chain import aclassify_input
+
+        async def compare():
+            llm_labels = await asyncio.gather(*(aclassify_input(request) for request, _ in results))
+            confident = [(local, llm) for (_, local), llm in zip(results, llm_labels) if local is not None]
+            agreed = sum(local == llm for local, llm in confident)
+            print(f"\nLLM 일치율 (로컬이 확정한 {len(confident)}건): "
+                  f"{agreed / len(confident) if confident else 0.0:.2f}")
+
+        asyncio.run(compare())
+
+    if failures:
+        print(f"\n{failures}개 문장이 기대와 다르게 분류됩니다.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
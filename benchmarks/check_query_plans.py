@@ -0,0 +1,139 @@
+"""
+재고(items) 핫 쿼리 실행 계획 회귀 검사
+
+SQLALCHEMY_DATABASE_URL 의 Postgres 에 트랜잭션 하나를 열고 가짜 사용자/재고를 넣은 뒤(ANALYZE 포함)
+실제 코드 경로(get_items_by_user, get_items_page, upsert_items, get_items_expiring_on, delete_items_by_user)를 실행해서
+나간 SQL 을 EXPLAIN 한다. items 에 Seq Scan 이 하나라도 있으면 종료 코드 1.
+끝나면 전부 롤백하므로 DB 에는 아무것도 남지 않는다 (마이그레이션은 적용돼 있어야 함).
+실행 (저장소 루트에서):
+    python -m benchmarks.check_query_plans --users 500 --items-per-user 40
+"""
+import os
+
+os.environ.setdefault("OPENAI_API_KEY", "fake")
+
+import argparse
+import json
+import sys
+from datetime import date, timedelta
+
+from sqlalchemy import event, text
+from sqlalchemy.orm import Session
+
+from database import engine
+from domain.category.category_cache import get_categories
+from domain.item.item_crud import (
+    get_items_by_user, get_items_page, upsert_items, get_items_expiring_on, delete_items_by_user
+)
+from domain.item.item_schema import ItemCreate
+
+# Seq Scan 을 허용하지 않는 테이블 (categories 처럼 작은 테이블은 Seq Scan 이 정상)
+CHECKED_TABLES = {"items"}
+
+SEED_SQL = """
+    WITH new_users AS (
+        INSERT INTO users (login_id, username, password, notification)
+        SELECT 'plan-' || n, 'plan-' || n, 'x', true
+        FROM generate_series(1, :users) AS n
+        RETURNING user_id
+    )
+    INSERT INTO items (user_id, category_id, item_name, expiry_date, created_at)
+    SELECT u.user_id,
+           (:category_ids)[1 + (n % cardinality(:category_ids))],
+           'plan-item-' || n,
+           CASE WHEN n % 7 = 0 THEN NULL ELSE current_date + (n % 60) END,
+           now() - (n || ' minutes')::interval
+    FROM new_users u, generate_series(1, :items_per_user) AS n
+"""
+
+
+def scanned_tables(plan: dict, found: list):
+    """실행 계획 트리에서 (노드 종류, 테이블, 인덱스) 수집 (Bitmap Index Scan 은 테이블 없이 인덱스만)"""
+    if "Relation Name" in plan or "Index Name" in plan:
+        found.append((plan["Node Type"], plan.get("Relation Name", ""), plan.get("Index Name")))
+    for child in plan.get("Plans", []):
+        scanned_tables(child, found)
+    return found
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--users", type=int, default=500)
+    parser.add_argument("--items-per-user", type=int, default=40)
+    args = parser.parse_args()
+
+    categories = get_categories()
+    category_ids = [c["category_id"] for c in categories]
+
+    with engine.connect() as conn:
+        trans = conn.begin()
+        try:
+            conn.execute(text(SEED_SQL), {
+                "users": args.users, "items_per_user": args.items_per_user, "category_ids": category_ids,
+            })
+            conn.execute(text("ANALYZE users"))
+            conn.execute(text("ANALYZE items"))
+            user_id = conn.execute(text("SELECT max(user_id) FROM users")).scalar()
+
+            captured: list[tuple[str, str, object]] = []
+            current = {"name": None}
+
+            @event.listens_for(conn, "before_cursor_execute")
+            def capture(_conn, _cursor, statement, parameters, _context, _many):
+                if current["name"] and not statement.startswith(("EXPLAIN", "SAVEPOINT", "RELEASE")):
+                    captured.append((current["name"], statement, parameters))
+
+            # commit 은 savepoint 만 풀고 바깥 트랜잭션은 마지막에 롤백
+            db = Session(bind=conn, join_transaction_mode="create_savepoint")
+            first_page, cursor = get_items_page(db, user_id, limit=20)
+            expiry_page, expiry_cursor = get_items_page(db, user_id, sort="expiry", limit=20)
+            new_items = [
+                ItemCreate(
+                    item_name=f"plan-item-{n}",
+                    category_major_name=categories[n % len(categories)]["category_major_name"],
+                    category_sub_name=categories[n % len(categories)]["category_sub_name"],
+                    expiry_date=date.today() + timedelta(days=n),
+                )
+                for n in range(1, 41)
+            ]
+            checks = [
+                ("get_items_by_user", lambda: get_items_by_user(db, user_id)),
+                ("get_items_page created", lambda: get_items_page(db, user_id, cursor=cursor, limit=20)),
+                ("get_items_page expiry", lambda: get_items_page(
+                    db, user_id, sort="expiry", cursor=expiry_cursor, limit=20)),
+                ("get_items_page expiring range", lambda: get_items_page(
+                    db, user_id, sort="expiry", limit=20,
+                    expiring_after=date.today(), expiring_before=date.today() + timedelta(days=7))),
+                ("upsert_items", lambda: upsert_items(db, new_items, user_id)),
+                ("get_items_expiring_on", lambda: get_items_expiring_on(db, date.today() + timedelta(days=3))),
+                ("delete_items_by_user", lambda: delete_items_by_user(
+                    db, user_id, [itm.item_id for itm in first_page[:5]])),
+            ]
+            for name, run in checks:
+                current["name"] = name
+                run()
+                current["name"] = None
+
+            failures = 0
+            print(f"{'query':<32} {'result':<9} scans")
+            for name, statement, parameters in captured:
+                plan = conn.exec_driver_sql("EXPLAIN (FORMAT JSON) " + statement, parameters).scalar()
+                if isinstance(plan, str):
+                    plan = json.loads(plan)
+                scans = scanned_tables(plan[0]["Plan"], [])
+                bad = [s for s in scans if s[0] == "Seq Scan" and s[1] in CHECKED_TABLES]
+                failures += bool(bad)
+                detail = ", ".join(
+                    " ".join(filter(None, (node, table, index and f"({index})"))) for node, table, index in scans
+                )
+                print(f"{name:<32} {'SEQ SCAN' if bad else 'ok':<9} {detail}")
+        finally:
+            trans.rollback()
+
+    if failures:
+        print(f"\n{failures}개 쿼리가 items 를 Seq Scan 합니다.")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
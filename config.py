@@ -8,4 +8,77 @@ SECRET_KEY = os.getenv("SECRET_KEY")
 ALGORITHM = os.getenv("ALGORITHM")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 GOOGLE_APPLICATION_CREDENTIALS = os.getenv("GOOGLE_APPLICATION_CREDENTIALS")
-ACCESS_TOKEN_EXPIRE_MINUTES = 240
\ No newline at end of file
+ACCESS_TOKEN_EXPIRE_MINUTES = 240
+
+# QA 로컬 빠른 분류기: 확신도 임계값, LLM 비교 표본 비율
+QA_FAST_CLASSIFIER_THRESHOLD = float(os.getenv("QA_FAST_CLASSIFIER_THRESHOLD", "0.8"))
+QA_FAST_CLASSIFIER_SHADOW_RATE = float(os.getenv("QA_FAST_CLASSIFIER_SHADOW_RATE", "0.05"))
+
+# QA 라우팅 모드: "two_hop"(분류 → 생성) 또는 "single"(분류+답변 단일 호출)
+QA_ROUTE_MODE = os.getenv("QA_ROUTE_MODE", "two_hop")
+
+# QA 응답 캐시: 최대 항목 수, 만료 시간(초)
+# (무효화는 워커 프로세스별 → 여러 uvicorn 워커면 다른 워커는 최대 TTL 동안 이전 응답을 줄 수 있음)
+QA_CACHE_MAXSIZE = int(os.getenv("QA_CACHE_MAXSIZE", "1024"))
+QA_CACHE_TTL_SECONDS = int(os.getenv("QA_CACHE_TTL_SECONDS", "3600"))
+
+# QA 프롬프트에 넣을 재료 목록의 최대 토큰 수 (tiktoken 기준)
+QA_INGREDIENT_TOKEN_BUDGET = int(os.getenv("QA_INGREDIENT_TOKEN_BUDGET", "300"))
+
+# 요청 분류 메모: 프로세스 내 hot layer 크기, 공유 테이블 최대 행 수
+QA_CLASSIFICATION_MEMO_HOT_SIZE = int(os.getenv("QA_CLASSIFICATION_MEMO_HOT_SIZE", "2048"))
+QA_CLASSIFICATION_MEMO_MAX_ROWS = int(os.getenv("QA_CLASSIFICATION_MEMO_MAX_ROWS", "50000"))
+
+# 로컬 레시피 인덱스: 재고만으로 추천할 때 필요한 주재료 보유율 (0~1)
+QA_RECIPE_INDEX_MIN_COVERAGE = float(os.getenv("QA_RECIPE_INDEX_MIN_COVERAGE", "1.0"))
+
+# LLM 디스패처: 모델별 기본 동시 실행 수, 대기열 최대 길이, 모델별 개별 설정("모델=수,모델=수")
+LLM_MAX_CONCURRENCY = int(os.getenv("LLM_MAX_CONCURRENCY", "16"))
+LLM_MAX_QUEUE = int(os.getenv("LLM_MAX_QUEUE", "256"))
+LLM_MODEL_CONCURRENCY = os.getenv("LLM_MODEL_CONCURRENCY", "")
+# LLM 백엔드: "openai"(실제 호출) 또는 "fake"(부하 테스트용 로컬 가짜 응답)
+# fake 백엔드의 응답 지연(ms)과 ± 지터(ms), 출력 토큰당 생성 시간(ms)
+LLM_BACKEND = os.getenv("LLM_BACKEND", "openai")
+FAKE_LLM_LATENCY_MS = float(os.getenv("FAKE_LLM_LATENCY_MS", "800"))
+FAKE_LLM_JITTER_MS = float(os.getenv("FAKE_LLM_JITTER_MS", "200"))
+FAKE_LLM_MS_PER_OUTPUT_TOKEN = float(os.getenv("FAKE_LLM_MS_PER_OUTPUT_TOKEN", "0"))
+# fake 백엔드 OCR 응답의 불량 비율 (0~1): 항목별로 규칙에 어긋난 분류, 응답별로 잘린 JSON
+FAKE_LLM_INVALID_RATE = float(os.getenv("FAKE_LLM_INVALID_RATE", "0"))
+
+# 영수증 전처리: 사용 여부, 영수증 영역 자르기, 흑백 변환, 긴 변 최대 픽셀, JPEG 품질
+OCR_PREPROCESS = os.getenv("OCR_PREPROCESS", "true").lower() == "true"
+OCR_CROP_RECEIPT = os.getenv("OCR_CROP_RECEIPT", "true").lower() == "true"
+OCR_GRAYSCALE = os.getenv("OCR_GRAYSCALE", "true").lower() == "true"
+OCR_MAX_SIDE = int(os.getenv("OCR_MAX_SIDE", "1600"))
+OCR_JPEG_QUALITY = int(os.getenv("OCR_JPEG_QUALITY", "80"))
+
+# OCR 상품명 추출 캐시: 최대 이미지 수, 디스크 저장 경로(빈 값이면 메모리만),
+# 거의 같은 사진으로 볼 dHash 해밍 거리(0 이면 정확히 같은 파일만)
+OCR_CACHE_MAX_ENTRIES = int(os.getenv("OCR_CACHE_MAX_ENTRIES", "1000"))
+OCR_CACHE_DIR = os.getenv("OCR_CACHE_DIR", "")
+OCR_CACHE_PHASH_DISTANCE = int(os.getenv("OCR_CACHE_PHASH_DISTANCE", "0"))
+
+# 식재료 분류 사전의 프로세스 내 hot layer 크기
+OCR_DICTIONARY_HOT_SIZE = int(os.getenv("OCR_DICTIONARY_HOT_SIZE", "4096"))
+
+# 여러 장 일괄 OCR: 동시에 처리할 이미지 수, 한 번에 받을 최대 이미지 수
+OCR_BATCH_CONCURRENCY = int(os.getenv("OCR_BATCH_CONCURRENCY", "5"))
+OCR_BATCH_MAX_IMAGES = int(os.getenv("OCR_BATCH_MAX_IMAGES", "10"))
+
+# OCR 업로드 이미지 최대 크기 (MB)
+OCR_MAX_UPLOAD_BYTES = int(float(os.getenv("OCR_MAX_UPLOAD_MB", "20")) * 1024 * 1024)
+
+# classify_names 분할 병렬 처리: 한 번에 보낼 이름 수
+OCR_CLASSIFY_CHUNK_SIZE = int(os.getenv("OCR_CLASSIFY_CHUNK_SIZE", "10"))
+
+# OCR structured output: 파싱 실패 응답 / 규칙에 어긋난 항목을 다시 요청하는 횟수
+# (분류 묶음 하나가 쓰는 LLM 호출은 최대 OCR_OUTPUT_RETRIES + 1 회, 묶음 단위 재시도는 따로 없음)
+OCR_OUTPUT_RETRIES = int(os.getenv("OCR_OUTPUT_RETRIES", "2"))
+
+# 카테고리 캐시: 다른 워커가 추가한 카테고리를 반영하려고 DB 에서 다시 읽는 주기(초)
+CATEGORY_CACHE_TTL_SECONDS = int(os.getenv("CATEGORY_CACHE_TTL_SECONDS", "300"))
+
+# 백그라운드 작업 큐: 워커 수, 대기열 최대 길이, 끝난 작업 보관 시간(초)
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "4"))
+JOB_MAX_QUEUE = int(os.getenv("JOB_MAX_QUEUE", "100"))
+JOB_TTL_SECONDS = int(os.getenv("JOB_TTL_SECONDS", "600"))
@@ -0,0 +1,95 @@
+import logging
+import threading
+import time
+
+from sqlalchemy import tuple_
+from sqlalchemy.dialects.postgresql import insert
+
+from config import CATEGORY_CACHE_TTL_SECONDS
+from database import SessionLocal
+from domain.category.category_crud import get_all_categories
+from models import Category
+
+# 카테고리 캐시
+# categories 는 거의 바뀌지 않는 작은 (대분류, 소분류) 목록이라 프로세스 메모리에 통째로 둔다.
+# - 앱 시작 시 load_categories() 로 적재, CATEGORY_CACHE_TTL_SECONDS 마다 다시 읽음 (다른 워커가 추가한 것 반영)
+# - 없는 카테고리는 별도 세션에서 INSERT ... ON CONFLICT DO NOTHING 후 바로 commit → 호출한 쪽 트랜잭션과 무관,
+#   동시에 같은 카테고리를 만들어도 uq_categories_major_sub 로 한 행만 생긴다.
+
+logger = logging.getLogger(__name__)
+
+_lock = threading.Lock()
+_by_pair: dict[tuple[str, str], dict] = {}
+# time.monotonic() 기준 적재 시각 (None = 아직 적재 안 함). monotonic 은 시작점이 임의(대개 부팅 시각)라
+# 0.0 으로 두면 부팅 직후에는 "최근에 적재함" 으로 보여 첫 조회가 빈 목록이 된다.
+_loaded_at: float | None = None
+
+
+def _row(category) -> dict:
+    return {
+        "category_id": category.category_id,
+        "category_major_name": category.category_major_name,
+        "category_sub_name": category.category_sub_name,
+    }
+
+
+def load_categories():
+    """DB 의 카테고리 전체를 다시 읽어 캐시 교체"""
+    global _by_pair, _loaded_at
+    db = SessionLocal()
+    try:
+        rows = {(c.category_major_name, c.category_sub_name): _row(c) for c in get_all_categories(db)}
+    finally:
+        db.close()
+    with _lock:
+        _by_pair = rows
+        _loaded_at = time.monotonic()
+    logger.info(f"카테고리 캐시 적재: {len(rows)}개")
+
+
+def _ensure_fresh():
+    if _loaded_at is None or time.monotonic() - _loaded_at > CATEGORY_CACHE_TTL_SECONDS:
+        load_categories()
+
+
+def get_categories() -> list[dict]:
+    """/category/ 응답용 전체 목록 (category_id 순)"""
+    _ensure_fresh()
+    with _lock:
+        return sorted(_by_pair.values(), key=lambda c: c["category_id"])
+
+
+def get_category_ids(pairs) -> dict[tuple[str, str], int]:
+    """(대분류, 소분류) → category_id. 캐시에 없는 것만 DB 에서 만들거나 찾는다"""
+    _ensure_fresh()
+    pairs = set(pairs)
+    with _lock:
+        found = {pair: _by_pair[pair]["category_id"] for pair in pairs if pair in _by_pair}
+    missing = pairs - found.keys()
+    if missing:
+        for row in _create_categories(missing):
+            found[(row["category_major_name"], row["category_sub_name"])] = row["category_id"]
+    return found
+
+
+def _create_categories(pairs: set[tuple[str, str]]) -> list[dict]:
+    db = SessionLocal()
+    try:
+        db.execute(
+            insert(Category)
+              .values([{"category_major_name": major, "category_sub_name": sub} for major, sub in pairs])
+              .on_conflict_do_nothing(constraint="uq_categories_major_sub")
+        )
+        db.commit()
+        # 방금 만든 것 + 다른 워커가 먼저 만든 것 모두 조회
+        rows = [
+            _row(c)
+            for c in db.query(Category)
+                       .filter(tuple_(Category.category_major_name, Category.category_sub_name).in_(list(pairs)))
+        ]
+    finally:
+        db.close()
+    with _lock:
+        for row in rows:
+            _by_pair[(row["category_major_name"], row["category_sub_name"])] = row
+    return rows
@@ -1,10 +1,8 @@
-from fastapi import APIRouter, Depends, HTTPException
-from sqlalchemy.orm import Session
+from fastapi import APIRouter, HTTPException
 from typing import List
 
-from database import get_db
 from domain.category.category_schema import CategoryResponse
-from domain.category.category_crud import get_all_categories
+from domain.category.category_cache import get_categories
 
 router = APIRouter(
     prefix="/category",
@@ -12,8 +10,9 @@ router = APIRouter(
 )
 
 @router.get("/", response_model=List[CategoryResponse])
-def read_categories(db: Session = Depends(get_db)):
-    categories = get_all_categories(db)
+def read_categories():
+    # DB 대신 카테고리 캐시에서 응답
+    categories = get_categories()
     if not categories:
         raise HTTPException(status_code=404, detail="카테고리를 찾을 수 없습니다.")
     return categories
\ No newline at end of file
@@ -1,50 +1,33 @@
-from datetime import datetime, timezone
+import base64
+import json
+from datetime import date, datetime, timezone
+from fastapi import HTTPException
+from sqlalchemy import delete, select, tuple_
+from sqlalchemy.dialects.postgresql import insert
 from sqlalchemy.orm import Session, joinedload
+from domain.category.category_cache import get_category_ids
 from domain.item.item_schema import ItemCreate
 from domain.ocr.ocr_service import parse_expiry
+from domain.qa.qa_cache import invalidate_user
 from models import Item, Category
 from typing import List
 
-def get_or_create_category(
-    db: Session,
-    major: str,
-    sub: str
-) -> Category:
-    cat = (
-        db.query(Category)
-          .filter(
-             Category.category_major_name == major,
-             Category.category_sub_name  == sub
-          )
-          .first()
-    )
-    if not cat:
-        cat = Category(
-            category_major_name=major,
-            category_sub_name = sub
-        )
-        db.add(cat)
-        db.commit()
-        db.refresh(cat)
-    return cat
-
 def create_item(db: Session, item_create: ItemCreate):
-    # 1) 아이템 생성 전, category 레코드 확보
-    cat = get_or_create_category(
-        db,
-        item_create.category_major_name,
-        item_create.category_sub_name
-    )
+    # 1) 아이템 생성 전, category_id 확보 (카테고리 캐시, 없으면 생성)
+    pair = (item_create.category_major_name, item_create.category_sub_name)
+    category_id = get_category_ids([pair])[pair]
     # 2) 이제 DB에 FK로 넣을 수 있는 category_id 가 준비됨
     payload = item_create.model_dump()
     payload.pop("category_major_name")
     payload.pop("category_sub_name")
-    payload["category_id"] = cat.category_id
+    payload["category_id"] = category_id
 
     db_item = Item(**payload)
     db.add(db_item)
     db.commit()
     db.refresh(db_item)
+    # 재고 변경 → 레시피 추천 캐시 무효화
+    invalidate_user(db_item.user_id)
     return db_item
 
 def get_items_by_user(db: Session, user_id: int) -> list[Item]:
@@ -56,28 +39,132 @@ def get_items_by_user(db: Session, user_id: int) -> list[Item]:
           .all()
     )
 
-def delete_items_by_user(db: Session, user_id: int, item_ids: List[int]) -> List[Item]:
+def get_items_expiring_on(db: Session, target: date) -> list[Item]:
+    # 유통기한 알림: 모든 사용자의 해당 날짜 재고 (ix_items_expiry_user)
+    return db.query(Item).filter(Item.expiry_date == target).all()
+
+def _encode_cursor(sort: str, item: Item) -> str:
+    key = item.created_at.isoformat() if sort == "created" else (
+        item.expiry_date.isoformat() if item.expiry_date else None
+    )
+    raw = json.dumps({"sort": sort, "key": key, "id": item.item_id})
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip("=")
+
+def _decode_cursor(sort: str, cursor: str):
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if raw["sort"] != sort:
+            raise ValueError("정렬 기준이 다른 cursor")
+        key = raw["key"]
+        if sort == "created":
+            key = datetime.fromisoformat(key)
+        elif key is not None:
+            key = date.fromisoformat(key)
+        return key, int(raw["id"])
+    except (ValueError, KeyError, TypeError) as e:
+        raise HTTPException(status_code=400, detail=f"잘못된 cursor 입니다: {e}")
+
+def get_items_page(
+    db: Session,
+    user_id: int,
+    sort: str = "created",
+    cursor: str | None = None,
+    limit: int = 30,
+    category_ids: List[int] | None = None,
+    expiring_before: date | None = None,
+    expiring_after: date | None = None,
+) -> tuple[list[Item], str | None]:
     """
-    주어진 user_id와 item_ids에 해당하는 Item 객체들을 먼저 조회한 뒤,
-    일괄 삭제하고, 삭제된 Item 리스트를 반환합니다.
+    재고 목록 keyset 페이지 → (아이템, 다음 cursor)
+    - sort="created": 최근 등록순 (created_at, item_id 내림차순)
+    - sort="expiry" : 유통기한 임박순 (expiry_date, item_id 오름차순, 무기한은 맨 뒤)
+    cursor 는 이전 페이지 마지막 아이템의 정렬 키라서 페이지마다 (user_id, 정렬 키) 인덱스를 limit 만큼만 읽는다.
+    expiring_before / expiring_after 는 유통기한 범위 (포함), 무기한 아이템은 빠진다.
     """
-    # 1) 삭제 대상 조회
-    # category 관계를 미리 불러와(detached 후에도 메모리에 유지)
-    to_delete = (
+    query = (
         db.query(Item)
           .options(joinedload(Item.category))
-          .filter(Item.user_id == user_id, Item.item_id.in_(item_ids))
-          .all()
+          .filter(Item.user_id == user_id)
     )
-    if not to_delete:
-        return []
+    if category_ids is not None:
+        query = query.filter(Item.category_id.in_(category_ids))
+    if expiring_before is not None:
+        query = query.filter(Item.expiry_date <= expiring_before)
+    if expiring_after is not None:
+        query = query.filter(Item.expiry_date >= expiring_after)
+
+    # 한 개 더 읽어서 다음 페이지가 있는지 확인
+    if sort == "created":
+        if cursor:
+            created_at, item_id = _decode_cursor(sort, cursor)
+            query = query.filter(tuple_(Item.created_at, Item.item_id) < (created_at, item_id))
+        items = query.order_by(Item.created_at.desc(), Item.item_id.desc()).limit(limit + 1).all()
+    else:
+        # 유통기한 있는 구간 → 무기한 구간 순서. OR 로 합치면 인덱스 범위 조건을 못 쓰므로 구간별로 따로 읽는다
+        expiry_date, item_id = _decode_cursor(sort, cursor) if cursor else (None, None)
+        items = []
+        if not cursor or expiry_date is not None:
+            dated = query.filter(Item.expiry_date.isnot(None))
+            if cursor:
+                dated = dated.filter(tuple_(Item.expiry_date, Item.item_id) > (expiry_date, item_id))
+            items = dated.order_by(Item.expiry_date, Item.item_id).limit(limit + 1).all()
+        if len(items) <= limit and expiring_before is None and expiring_after is None:
+            undated = query.filter(Item.expiry_date.is_(None))
+            if cursor and expiry_date is None:
+                undated = undated.filter(Item.item_id > item_id)
+            items += undated.order_by(Item.item_id).limit(limit + 1 - len(items)).all()
+
+    next_cursor = _encode_cursor(sort, items[limit - 1]) if len(items) > limit else None
+    return items[:limit], next_cursor
 
-    # 2) 객체 단위 삭제
-    for item in to_delete:
-        db.delete(item)
+# IN 목록이 너무 길어지지 않도록 이 개수씩 나눠서 삭제
+DELETE_CHUNK_SIZE = 1000
+
+def delete_items_by_user(db: Session, user_id: int, item_ids: List[int]) -> List[dict]:
+    """
+    주어진 user_id와 item_ids에 해당하는 Item 을
+    DELETE ... RETURNING (카테고리와 조인) 한 문장으로 삭제하고,
+    삭제된 아이템 목록(ItemResponse 형식, 요청한 id 순서)을 반환합니다.
+    id 가 많으면 DELETE_CHUNK_SIZE 개씩 나눠 실행하고 commit 은 한 번.
+    """
+    ids = list(dict.fromkeys(item_ids))
+    deleted: List[dict] = []
+    for start in range(0, len(ids), DELETE_CHUNK_SIZE):
+        removed = (
+            delete(Item)
+              .where(Item.user_id == user_id, Item.item_id.in_(ids[start:start + DELETE_CHUNK_SIZE]))
+              .returning(
+                  Item.item_id, Item.user_id, Item.item_name,
+                  Item.expiry_date, Item.created_at, Item.category_id
+              )
+              .cte("removed")
+        )
+        rows = db.execute(
+            select(removed, Category.category_major_name, Category.category_sub_name)
+              .join(Category, Category.category_id == removed.c.category_id)
+        ).mappings()
+        for row in rows:
+            deleted.append({
+                "item_id": row["item_id"],
+                "user_id": row["user_id"],
+                "item_name": row["item_name"],
+                "expiry_date": row["expiry_date"],
+                "created_at": row["created_at"],
+                "category": {
+                    "category_id": row["category_id"],
+                    "category_major_name": row["category_major_name"],
+                    "category_sub_name": row["category_sub_name"],
+                },
+            })
+    if not deleted:
+        db.rollback()
+        return []
 
     #디비 업데이트
     db.commit()
+    invalidate_user(user_id)
+    order = {item_id: idx for idx, item_id in enumerate(ids)}
+    return sorted(deleted, key=lambda item: order[item["item_id"]])
 
 # ocr 재고 추가
 def upsert_items(db: Session, items: List[ItemCreate], user_id: int):
@@ -86,44 +173,44 @@ def upsert_items(db: Session, items: List[ItemCreate], user_id: int):
     user_id: 현재 사용자
     - 이미 있는 item_name+category → expiry_date, created_at 업데이트
     - 없으면 새 Item 생성
+    카테고리는 캐시에서 (새 카테고리만 DB), INSERT ... ON CONFLICT 1번 + 결과 조회 1번, commit 은 한 번.
+    반환: 입력 순서대로 반영된 Item (같은 이름+카테고리가 여러 번 오면 같은 Item, 마지막 값이 반영됨)
     """
-    updated_items: List[Item] = []
+    if not items:
+        return []
 
-    for item in items:
-        # 1) 카테고리 확보
-        cat = get_or_create_category(db, item.category_major_name, item.category_sub_name)
-
-        # 2) 기존 아이템 검색 (user_id+item_name+category_id)
-        db_item = (
-            db.query(Item)
-                .filter_by(
-                    user_id=user_id,
-                    item_name=item.item_name,
-                    category_id=cat.category_id
-                )
-                .first()
-        )
+    category_ids = get_category_ids((item.category_major_name, item.category_sub_name) for item in items)
 
-        if db_item:
-            # 기존 재고: 유통기한만 갱신, 생성일 갱신
-            db_item.expiry_date = item.expiry_date
-            db_item.created_at = datetime.now(timezone.utc)
-        else:
-            # 신규 재고 생성
-            payload = item.model_dump()
-            # Pydantic 입력에서 제거
-            payload.pop("category_major_name")
-            payload.pop("category_sub_name")
-            payload["category_id"] = cat.category_id
-            payload["user_id"] = user_id
-
-            db_item = Item(**payload)
-            db.add(db_item)
-        # 기존이든 신규이든 updated_items에 추가
-        updated_items.append(db_item)   
+    now = datetime.now(timezone.utc)
+    keys = []
+    values = {}
+    for item in items:
+        key = (item.item_name, category_ids[(item.category_major_name, item.category_sub_name)])
+        keys.append(key)
+        # 한 문장 안에서 같은 행을 두 번 갱신할 수 없으므로 마지막 값만 남김
+        values[key] = {
+            "user_id": user_id,
+            "item_name": key[0],
+            "category_id": key[1],
+            "expiry_date": item.expiry_date,
+            "created_at": now,
+        }
 
+    stmt = insert(Item).values(list(values.values()))
+    stmt = stmt.on_conflict_do_update(
+        constraint="uq_items_user_name_category",
+        # 기존 재고: 유통기한만 갱신, 생성일 갱신
+        set_={"expiry_date": stmt.excluded.expiry_date, "created_at": stmt.excluded.created_at},
+    ).returning(Item.item_id, Item.item_name, Item.category_id)
+    item_ids = {(name, category_id): item_id for item_id, name, category_id in db.execute(stmt)}
     db.commit()
-    for item in updated_items:
-        db.refresh(item)
+    invalidate_user(user_id)
 
-    return updated_items  # 최종 반영된 아이템 리스트 반환
\ No newline at end of file
+    # 응답에 필요한 카테고리까지 한 번에 로딩
+    loaded = {
+        itm.item_id: itm
+        for itm in db.query(Item)
+                     .options(joinedload(Item.category))
+                     .filter(Item.item_id.in_(list(item_ids.values())))
+    }
+    return [loaded[item_ids[key]] for key in keys]  # 최종 반영된 아이템 리스트 반환
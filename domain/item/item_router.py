@@ -1,12 +1,16 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
 
-from domain.item.item_schema import ItemCreate, ItemResponse, ItemDeleteRequest, ItemDeleteResponse, ItemUpsertRequest
-from domain.item.item_crud import get_items_by_user, delete_items_by_user, upsert_items
+from domain.item.item_schema import (
+    ItemCreate, ItemResponse, ItemDeleteRequest, ItemDeleteResponse, ItemUpsertRequest, ItemPageResponse
+)
+from domain.item.item_crud import get_items_by_user, get_items_page, delete_items_by_user, upsert_items
+from domain.category.category_cache import get_categories
 from domain.ocr.ocr_service import parse_expiry
 
 from database import get_db
-from typing import List
+from datetime import date
+from typing import List, Literal, Optional
 
 from fastapi import Body
 
@@ -21,6 +25,45 @@ def read_items_by_user(user_id: int, db: Session = Depends(get_db)) -> List[Item
     # Pydantic이 category_major_name/sub_name까지 직렬화해 줍니다.
     return get_items_by_user(db, user_id)
 
+@router.get("/page", response_model=ItemPageResponse)
+def read_items_page(
+    user_id: int,
+    sort: Literal["created", "expiry"] = "created",
+    cursor: Optional[str] = None,
+    limit: int = Query(30, ge=1, le=100),
+    category_id: Optional[List[int]] = Query(None),
+    category_major_name: Optional[str] = None,
+    category_sub_name: Optional[str] = None,
+    expiring_before: Optional[date] = None,
+    expiring_after: Optional[date] = None,
+    db: Session = Depends(get_db),
+):
+    """
+    재고 목록을 페이지 단위로 조회 (전체 목록은 기존 GET /item/{user_id}/).
+    sort=created: 최근 등록순 / sort=expiry: 유통기한 임박순 (무기한은 맨 뒤)
+    응답의 next_cursor 를 cursor 로 넘기면 다음 페이지, 필터는 페이지마다 같은 값으로 보낼 것.
+    """
+    category_ids = category_id
+    if category_major_name or category_sub_name:
+        # 카테고리 이름은 카테고리 캐시에서 id 로 바꿔서 필터
+        named = [
+            c["category_id"] for c in get_categories()
+            if (not category_major_name or c["category_major_name"] == category_major_name)
+            and (not category_sub_name or c["category_sub_name"] == category_sub_name)
+        ]
+        category_ids = [i for i in named if i in category_ids] if category_ids else named
+
+    items, next_cursor = get_items_page(
+        db, user_id,
+        sort=sort,
+        cursor=cursor,
+        limit=limit,
+        category_ids=category_ids,
+        expiring_before=expiring_before,
+        expiring_after=expiring_after,
+    )
+    return {"items": items, "next_cursor": next_cursor}
+
 @router.delete(
     "/delete",
     response_model=ItemDeleteResponse,
@@ -33,10 +76,6 @@ def delete_items_by_user_endpoint(
 ) -> ItemDeleteResponse:
     deleted_items = delete_items_by_user(db, user_id, req.item_ids)
 
-    # deleted_items가 None일 경우 빈 리스트로 처리
-    if deleted_items is None:
-        deleted_items = []
-
     # Pydantic으로 변환하여 응답
     return ItemDeleteResponse(deleted_items=deleted_items)
     
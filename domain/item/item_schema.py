@@ -43,6 +43,12 @@ class ItemResponse(BaseModel):
         orm_mode = True
 
 
+# 재고 목록 페이지 응답: next_cursor 를 다음 요청의 cursor 로 (없으면 마지막 페이지)
+class ItemPageResponse(BaseModel):
+    items: List[ItemResponse]
+    next_cursor: Optional[str] = None
+
+
 # 삭제 요청 바디 스키마
 class ItemDeleteRequest(BaseModel):
     item_ids: List[int]
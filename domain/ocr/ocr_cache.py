@@ -0,0 +1,150 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+from typing import BinaryIO
+
+from cachetools import LRUCache
+from PIL import Image, ImageOps
+
+from config import OCR_CACHE_MAX_ENTRIES, OCR_CACHE_DIR, OCR_CACHE_PHASH_DISTANCE
+from domain.ocr.ocr_utils import iter_chunks
+
+# 영수증 OCR(상품명 추출) 결과 캐시
+# - 키: 원본 이미지 바이트의 sha256 (같은 파일 재업로드)
+# - 선택: dHash(64bit 지각 해시) 해밍 거리가 OCR_CACHE_PHASH_DISTANCE 이하이면
+#         다시 찍은 거의 같은 사진으로 보고 재사용 (0 이면 사용 안 함)
+#         같은 가게의 다른 영수증도 해시가 가까울 수 있으므로 거리는 작게(≤ 4) 둘 것
+# - 메모리 LRU 로 크기 제한, OCR_CACHE_DIR 을 주면 <sha256>.json 파일로도 저장
+#   (재시작/다른 워커에서도 재사용, LRU 에서 밀려나면 파일도 삭제)
+
+logger = logging.getLogger(__name__)
+
+
+class _DiskBackedLRU(LRUCache):
+    def popitem(self):
+        digest, entry = super().popitem()
+        if OCR_CACHE_DIR:
+            try:
+                os.remove(_path(digest))
+            except OSError:
+                pass
+        return digest, entry
+
+
+_lock = threading.Lock()
+_entries = _DiskBackedLRU(maxsize=OCR_CACHE_MAX_ENTRIES)  # sha256 → {"names", "dhash"}
+_stats = {"hits": 0, "near_hits": 0, "misses": 0}
+_loaded = False
+
+
+def _path(digest: str) -> str:
+    return os.path.join(OCR_CACHE_DIR, f"{digest}.json")
+
+
+def dhash(fp: BinaryIO) -> int | None:
+    """9x8 흑백 축소 후 가로로 이웃한 픽셀 밝기 비교 → 64bit 정수"""
+    try:
+        fp.seek(0)
+        image = Image.open(fp)
+        image.draft("L", (64, 64))  # JPEG 은 작게 디코딩
+        image = ImageOps.exif_transpose(image).convert("L").resize((9, 8), Image.Resampling.LANCZOS)
+    except Exception:
+        return None
+    pixels = list(image.getdata())
+    bits = 0
+    for row in range(8):
+        for col in range(8):
+            bits = (bits << 1) | (pixels[row * 9 + col] > pixels[row * 9 + col + 1])
+    return bits
+
+
+def image_key(fp: BinaryIO) -> tuple[str, int | None]:
+    """(sha256, dHash) — dHash 는 지각 해시를 쓸 때만 계산. 파일은 조각 단위로 읽는다."""
+    sha = hashlib.sha256()
+    for chunk in iter_chunks(fp):
+        sha.update(chunk)
+    return sha.hexdigest(), dhash(fp) if OCR_CACHE_PHASH_DISTANCE > 0 else None
+
+
+def _load_dir():
+    """디스크 저장소를 처음 쓸 때 한 번 메모리 인덱스로 불러옴 (최근 파일 우선)"""
+    global _loaded
+    _loaded = True
+    if not OCR_CACHE_DIR:
+        return
+    os.makedirs(OCR_CACHE_DIR, exist_ok=True)
+    files = sorted(
+        (f for f in os.scandir(OCR_CACHE_DIR) if f.name.endswith(".json")),
+        key=lambda f: f.stat().st_mtime,
+    )
+    # 크기 제한을 넘는 오래된 파일은 정리
+    for f in files[:-OCR_CACHE_MAX_ENTRIES]:
+        try:
+            os.remove(f.path)
+        except OSError:
+            pass
+    for f in files[-OCR_CACHE_MAX_ENTRIES:]:
+        try:
+            with open(f.path, encoding="utf-8") as fp:
+                _entries[f.name[:-5]] = json.load(fp)
+        except (OSError, ValueError) as e:
+            logger.warning(f"OCR 캐시 파일 읽기 실패 {f.name}: {e}")
+
+
+def _read_file(digest: str) -> dict | None:
+    try:
+        with open(_path(digest), encoding="utf-8") as fp:
+            return json.load(fp)
+    except (OSError, ValueError):
+        return None
+
+
+def get_cached_names(digest: str, phash: int | None) -> list[str] | None:
+    with _lock:
+        if not _loaded:
+            _load_dir()
+        entry = _entries.get(digest)
+        if entry is None and OCR_CACHE_DIR:
+            # 다른 워커가 저장한 결과
+            entry = _read_file(digest)
+            if entry is not None:
+                _entries[digest] = entry
+        if entry is not None:
+            _stats["hits"] += 1
+            return list(entry["names"])
+
+        if phash is not None:
+            for other, entry in _entries.items():
+                if entry.get("dhash") is not None and bin(entry["dhash"] ^ phash).count("1") <= OCR_CACHE_PHASH_DISTANCE:
+                    _entries[other]  # LRU 순서 갱신
+                    _stats["near_hits"] += 1
+                    return list(entry["names"])
+
+        _stats["misses"] += 1
+        return None
+
+
+def store_names(digest: str, phash: int | None, names: list[str]):
+    entry = {"names": list(names), "dhash": phash}
+    with _lock:
+        _entries[digest] = entry
+    if OCR_CACHE_DIR:
+        try:
+            # 임시 파일에 쓴 뒤 교체 → 다른 워커가 반쯤 쓴 파일을 읽지 않도록
+            tmp = _path(digest) + f".{os.getpid()}.tmp"
+            with open(tmp, "w", encoding="utf-8") as fp:
+                json.dump(entry, fp, ensure_ascii=False)
+            os.replace(tmp, _path(digest))
+        except OSError as e:
+            logger.warning(f"OCR 캐시 파일 저장 실패: {e}")
+
+
+def ocr_cache_stats() -> dict:
+    with _lock:
+        snapshot = dict(_stats)
+        snapshot["entries"] = len(_entries)
+    total = snapshot["hits"] + snapshot["near_hits"] + snapshot["misses"]
+    snapshot["hit_rate"] = (snapshot["hits"] + snapshot["near_hits"]) / total if total else 0.0
+    return snapshot
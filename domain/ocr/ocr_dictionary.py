@@ -0,0 +1,135 @@
+import logging
+import threading
+from datetime import datetime, timezone
+
+from cachetools import LRUCache
+from sqlalchemy import select
+from sqlalchemy.dialects.postgresql import insert
+from starlette.concurrency import run_in_threadpool
+
+from config import OCR_DICTIONARY_HOT_SIZE
+from database import SessionLocal
+from models import IngredientDictionary
+
+# 식재료 분류 사전
+# 이름 → (대분류, 소분류, 유통기한 텍스트)
+# - 1단계: 프로세스 내 LRU (hot layer)
+# - 2단계: ingredient_dictionary 테이블 (기존 재고로 시드, LLM 분류 결과를 계속 추가)
+# classify_names 는 사전에 없는 이름만 LLM 으로 보낸다.
+
+logger = logging.getLogger(__name__)
+
+FIELDS = ("category_major_name", "category_sub_name", "expiry_text")
+
+_lock = threading.Lock()
+_hot = LRUCache(maxsize=OCR_DICTIONARY_HOT_SIZE)
+_stats = {"scans": 0, "scans_without_llm": 0, "dictionary_names": 0, "llm_names": 0}
+
+
+def normalize_name(name: str) -> str:
+    return " ".join(name.split())
+
+
+def _entry(item_name: str, value: dict) -> dict:
+    return {"item_name": item_name, **value}
+
+
+def get_dictionary_entries(names: list[str]) -> dict[str, dict]:
+    """사전에 있는 이름 → OCRClassifyItem 형식 dict (item_name 은 요청한 이름 그대로)"""
+    found: dict[str, dict] = {}
+    missing: dict[str, list[str]] = {}
+    with _lock:
+        for name in names:
+            key = normalize_name(name)
+            cached = _hot.get(key)
+            if cached is not None:
+                found[name] = _entry(name, cached)
+            elif key:
+                missing.setdefault(key, []).append(name)
+    if not missing:
+        return found
+
+    try:
+        db = SessionLocal()
+        try:
+            rows = db.execute(
+                select(IngredientDictionary).where(IngredientDictionary.item_name.in_(list(missing)))
+            ).scalars().all()
+        finally:
+            db.close()
+    except Exception as e:
+        # 사전 장애는 분류 자체를 막지 않는다 (전부 LLM 으로)
+        logger.warning(f"ingredient dictionary 조회 실패: {e}")
+        return found
+
+    with _lock:
+        for row in rows:
+            value = {f: getattr(row, f) for f in FIELDS}
+            _hot[row.item_name] = value
+            for name in missing[row.item_name]:
+                found[name] = _entry(name, value)
+    return found
+
+
+def save_dictionary_entries(items: list[dict]):
+    """LLM 분류 결과를 사전에 기록 (같은 이름이 있으면 덮어씀)"""
+    values = {}
+    for item in items:
+        key = normalize_name(item.get("item_name") or "")
+        if key and all(item.get(f) for f in FIELDS):
+            values[key] = {f: item[f] for f in FIELDS}
+    if not values:
+        return
+    with _lock:
+        for key, value in values.items():
+            _hot[key] = value
+
+    now = datetime.now(timezone.utc)
+    stmt = insert(IngredientDictionary).values([
+        {"item_name": key, **value, "source": "llm", "updated_at": now}
+        for key, value in values.items()
+    ])
+    stmt = stmt.on_conflict_do_update(
+        index_elements=[IngredientDictionary.item_name],
+        set_={
+            "category_major_name": stmt.excluded.category_major_name,
+            "category_sub_name": stmt.excluded.category_sub_name,
+            "expiry_text": stmt.excluded.expiry_text,
+            "source": stmt.excluded.source,
+            "updated_at": stmt.excluded.updated_at,
+        },
+    )
+    try:
+        db = SessionLocal()
+        try:
+            db.execute(stmt)
+            db.commit()
+        finally:
+            db.close()
+    except Exception as e:
+        logger.warning(f"ingredient dictionary 저장 실패: {e}")
+
+
+async def aget_dictionary_entries(names: list[str]) -> dict[str, dict]:
+    return await run_in_threadpool(get_dictionary_entries, names)
+
+
+async def asave_dictionary_entries(items: list[dict]):
+    await run_in_threadpool(save_dictionary_entries, items)
+
+
+def record_lookup(dictionary_names: int, llm_names: int):
+    with _lock:
+        _stats["scans"] += 1
+        _stats["scans_without_llm"] += llm_names == 0
+        _stats["dictionary_names"] += dictionary_names
+        _stats["llm_names"] += llm_names
+
+
+def dictionary_stats() -> dict:
+    with _lock:
+        snapshot = dict(_stats)
+        snapshot["hot_entries"] = len(_hot)
+    total = snapshot["dictionary_names"] + snapshot["llm_names"]
+    snapshot["hit_rate"] = snapshot["dictionary_names"] / total if total else 0.0
+    return snapshot
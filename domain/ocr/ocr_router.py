@@ -1,11 +1,31 @@
-from fastapi import APIRouter, File, UploadFile, Depends, HTTPException
+import asyncio
+import json
+import logging
+import shutil
+import tempfile
+import time
+from typing import BinaryIO
+
+from fastapi import APIRouter, File, Form, UploadFile, Depends, HTTPException
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from .ocr_schema import (
     OCRExtractResponse, OCRClassifyRequest,
-    OCRClassifyResponse, OCRSaveRequest, OCRSaveResponse
+    OCRClassifyResponse, OCRClassifyItem, OCRSaveRequest, OCRSaveResponse, OCRScanResponse,
+    OCRBatchExtractResponse, OCRJobResponse
 )
 from .ocr_service import (
-    extract_names_from_image, classify_names, parse_expiry
+    extract_names_from_image, classify_names, scan_receipt, parse_expiry, structured_output_stats, OCR_MODEL
+)
+from .ocr_utils import preprocess_receipt, preprocess_stats, check_upload_size
+from .ocr_cache import image_key, get_cached_names, store_names, ocr_cache_stats
+from .ocr_dictionary import (
+    aget_dictionary_entries, asave_dictionary_entries, record_lookup, dictionary_stats, normalize_name
+)
+from llm_dispatcher import dispatch
+from job_queue import submit
+from config import (
+    OCR_BATCH_CONCURRENCY, OCR_BATCH_MAX_IMAGES, OCR_CLASSIFY_CHUNK_SIZE
 )
 from domain.item.item_crud import upsert_items
 from domain.item.item_schema import ItemCreate
@@ -15,31 +35,257 @@ from fastapi import Path
 
 router = APIRouter(prefix="/ocr")
 
+logger = logging.getLogger(__name__)
+
+
+def _copy_file(fp: BinaryIO) -> tempfile.SpooledTemporaryFile:
+    # 조각 단위로 임시 파일에 복사 (1MB 까지는 메모리, 넘으면 디스크)
+    copy = tempfile.SpooledTemporaryFile(max_size=1024 * 1024)
+    fp.seek(0)
+    shutil.copyfileobj(fp, copy)
+    return copy
+
+async def _preprocess(img: BinaryIO) -> BinaryIO:
+    # 전처리(CPU 작업)는 스레드풀에서 → 줄어든 이미지로 vision 호출
+    # dispatch 팩토리 안에서 부르지 말 것 (모델 동시 실행 슬롯을 잡은 채로 CPU 작업을 하게 됨)
+    processed, report = await run_in_threadpool(preprocess_receipt, img)
+    logger.info(
+        f"영수증 전처리 {report['bytes_before']} → {report['bytes_after']} bytes, "
+        f"단계별(ms) {', '.join(f'{k}={v:.1f}' for k, v in report['timings_ms'].items())}"
+    )
+    # 돌려준 파일은 dispatch 태스크가 읽는다. 합쳐진(shield) 호출은 원래 요청이 끝나고
+    # UploadFile 이 닫힌 뒤에도 돌 수 있으므로, 전처리를 건너뛰어 원본이 그대로 왔으면 사본으로 넘긴다.
+    if processed is img:
+        processed = await run_in_threadpool(_copy_file, img)
+    return processed
+
+async def _extract_cached(img: BinaryIO) -> list[str]:
+    # 같은(또는 거의 같은) 영수증을 다시 올리면 캐시된 결과를 바로 반환
+    digest, phash = await run_in_threadpool(image_key, img)
+    names = await run_in_threadpool(get_cached_names, digest, phash)
+    if names is not None:
+        return names
+
+    # 전처리는 모델 슬롯을 잡기 전에 (CPU 작업이 LLM 동시 실행 슬롯을 점유하지 않도록)
+    # 같은 이미지가 동시에 여러 번 올라오면 vision 호출은 한 번만
+    processed = await _preprocess(img)
+    names = await dispatch(OCR_MODEL, "extract_names\n" + digest, lambda: extract_names_from_image(processed))
+    await run_in_threadpool(store_names, digest, phash, names)
+    return names
+
 @router.post("/extract-names", response_model=OCRExtractResponse)
 async def extract_names_endpoint(file: UploadFile = File(...)):
     try:
-        img = await file.read()
-        names = extract_names_from_image(img)
-        return {"extracted_names": names}
+        # 업로드는 spooled 임시 파일 그대로 사용 (메모리에 통째로 읽지 않음)
+        check_upload_size(file)
+        return {"extracted_names": await _extract_cached(file.file)}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(400, f"OCR 추출 실패: {e}")
 
+@router.post("/extract-names/batch", response_model=OCRBatchExtractResponse)
+async def extract_names_batch_endpoint(files: list[UploadFile] = File(...)):
+    """
+    긴 영수증/여러 장의 주문내역 캡처를 한 번에 추출.
+    최대 OCR_BATCH_CONCURRENCY 장씩 동시에 처리하고, 이름은 순서를 유지하며 중복 제거.
+    한 장이 실패해도 나머지 결과는 반환 (이미지별 error 에 사유)
+    """
+    if len(files) > OCR_BATCH_MAX_IMAGES:
+        raise HTTPException(400, f"이미지는 한 번에 최대 {OCR_BATCH_MAX_IMAGES}장까지 올릴 수 있습니다.")
+
+    started = time.perf_counter()
+    sem = asyncio.Semaphore(OCR_BATCH_CONCURRENCY)
+
+    async def one(file: UploadFile) -> dict:
+        async with sem:
+            image_started = time.perf_counter()
+            result = {"filename": file.filename, "extracted_names": []}
+            try:
+                check_upload_size(file)
+                result["extracted_names"] = await _extract_cached(file.file)
+            except HTTPException as e:
+                result["error"] = str(e.detail)
+            except Exception as e:
+                result["error"] = f"OCR 추출 실패: {e}"
+            result["elapsed_ms"] = (time.perf_counter() - image_started) * 1000
+            return result
+
+    images = await asyncio.gather(*(one(f) for f in files))
+    if all("error" in r for r in images):
+        raise HTTPException(400, images[0]["error"])
+
+    merged: dict[str, str] = {}
+    for r in images:
+        for name in r["extracted_names"]:
+            key = normalize_name(name)
+            if key:
+                merged.setdefault(key, name)
+    return {
+        "extracted_names": list(merged.values()),
+        "images": images,
+        "elapsed_ms": (time.perf_counter() - started) * 1000,
+    }
+
+def _copy_upload(file: UploadFile) -> tempfile.SpooledTemporaryFile:
+    # 응답 후 UploadFile 이 닫히므로 작업용 임시 파일로 복사
+    return _copy_file(file.file)
+
+@router.post("/jobs/extract-names", response_model=OCRJobResponse, status_code=202)
+async def extract_names_job_endpoint(file: UploadFile = File(...)):
+    """extract-names 의 작업 버전: job_id 를 바로 반환, 결과는 /jobs/{job_id} 로 조회/구독"""
+    check_upload_size(file)
+    img = await run_in_threadpool(_copy_upload, file)
+
+    async def run():
+        return {"extracted_names": await _extract_cached(img)}
+
+    job = submit("extract_names", run, cleanup=img.close)
+    return {"job_id": job.id, "status": job.status}
+
+@router.post("/jobs/classify-names", response_model=OCRJobResponse, status_code=202)
+async def classify_names_job_endpoint(req: OCRClassifyRequest):
+    """classify-names 의 작업 버전"""
+    async def run():
+        items, unclassified = await _classify(req.names)
+        return {"items": items, "unclassified": unclassified}
+
+    job = submit("classify_names", run)
+    return {"job_id": job.id, "status": job.status}
+
+@router.get("/preprocess-stats")
+def read_preprocess_stats():
+    return preprocess_stats()
+
+@router.get("/cache-stats")
+def read_ocr_cache_stats():
+    return ocr_cache_stats()
+
+@router.get("/dictionary-stats")
+def read_dictionary_stats():
+    return dictionary_stats()
+
+@router.get("/output-stats")
+def read_structured_output_stats():
+    return structured_output_stats()
+
+async def _classify_chunk(names: list[str]) -> dict[str, dict]:
+    """
+    이름 한 묶음을 LLM 으로 분류 → 이름 기준 dict.
+    재시도는 classify_names 안에서만 (파싱 실패/불량 항목, 묶음당 최대 OCR_OUTPUT_RETRIES + 1 회 호출).
+    끝내 분류하지 못한 이름은 dict 에 없다.
+    """
+    key = "classify_names\n" + json.dumps(names, ensure_ascii=False)
+    items = await dispatch(OCR_MODEL, key, lambda: classify_names(names))
+    await asave_dictionary_entries(items)
+
+    # LLM 이 돌려준 item_name 으로 매칭, 안 되면 같은 순서로 매칭
+    by_name = {normalize_name(it["item_name"] or ""): it for it in items}
+    classified = {}
+    for idx, name in enumerate(names):
+        item = by_name.get(name)
+        if item is None and len(items) == len(names):
+            item = items[idx]
+        if item is not None:
+            classified[name] = item
+    return classified
+
+async def _classify_unknown(names: list[str]) -> dict[str, dict]:
+    """
+    사전에 없는 (정규화된) 이름들을 OCR_CLASSIFY_CHUNK_SIZE 개씩 나눠 동시에 분류.
+    출력 토큰 생성 시간이 지연의 대부분이라, 지연이 전체 개수가 아닌 묶음 크기에 비례한다.
+    결과는 사전에 기록된다.
+    """
+    chunks = [names[i:i + OCR_CLASSIFY_CHUNK_SIZE] for i in range(0, len(names), OCR_CLASSIFY_CHUNK_SIZE)]
+    classified = {}
+    for result in await asyncio.gather(*(_classify_chunk(chunk) for chunk in chunks)):
+        classified.update(result)
+    return classified
+
+async def _classify(names: list[str]) -> tuple[list[dict], list[str]]:
+    # 사전 조회 → 남은 이름은 정규화 후 중복 제거해서 LLM 으로 → 원래 순서대로 합침
+    # (분류된 항목, 재시도 후에도 분류하지 못해 빠진 이름) 반환
+    known = await aget_dictionary_entries(names)
+    unknown = list(dict.fromkeys(
+        normalize_name(name) for name in names if name not in known and normalize_name(name)
+    ))
+    record_lookup(sum(1 for name in names if name in known), len(unknown))
+    classified = await _classify_unknown(unknown) if unknown else {}
+
+    items = []
+    unclassified = []
+    for name in names:
+        item = known.get(name) or classified.get(normalize_name(name))
+        if item is not None:
+            items.append({**item, "item_name": name})
+        else:
+            unclassified.append(name)
+    if unclassified:
+        logger.warning(f"분류하지 못해 응답에서 빠진 이름 {len(unclassified)}개: {unclassified}")
+    return items, unclassified
+
 @router.post("/classify-names", response_model=OCRClassifyResponse)
 async def classify_names_endpoint(req: OCRClassifyRequest):
     try:
-        items = classify_names(req.names)
-        return {"items": items}
+        items, unclassified = await _classify(req.names)
+        return {"items": items, "unclassified": unclassified}
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(500, f"분류 실패: {e}")
 
-@router.post("/save-items", response_model=OCRSaveResponse)
-def save_items_endpoint(
-    req: OCRSaveRequest,
+@router.post("/scan", response_model=OCRScanResponse)
+async def scan_endpoint(
+    file: UploadFile = File(...),
+    save: bool = Form(False),
+    user_id: int | None = Form(None),
     db: Session = Depends(get_db)
 ):
-    # 1) OCR에서 받은 expiry_text → expiry_date 변환
+    """
+    영수증 이미지 → 분류된 아이템 (extract-names + classify-names 를 vision 호출 1회로)
+    save=false: 검토용으로 아이템만 반환 / save=true: user_id 재고에 바로 저장
+    """
+    if save and user_id is None:
+        raise HTTPException(400, "저장하려면 user_id 가 필요합니다.")
+    try:
+        check_upload_size(file)
+        img = file.file
+        digest, phash = await run_in_threadpool(image_key, img)
+        names = await run_in_threadpool(get_cached_names, digest, phash)
+        if names is not None:
+            # 이미 추출한 적 있는 영수증 → 이름 분류만 (대부분 사전에서 해결)
+            items, unclassified = await _classify(names)
+        else:
+            processed = await _preprocess(img)
+            items = await dispatch(OCR_MODEL, "scan_receipt\n" + digest, lambda: scan_receipt(processed))
+            items = [it for it in items if it["item_name"]]
+            await run_in_threadpool(store_names, digest, phash, [it["item_name"] for it in items])
+
+            # 분류는 사전에 있는 이름이면 사전을 따르고, 새 이름은 사전에 기록
+            known = await aget_dictionary_entries([it["item_name"] for it in items])
+            await asave_dictionary_entries([it for it in items if it["item_name"] not in known])
+            items = [known.get(it["item_name"], it) for it in items]
+            # 스캔은 이름과 분류를 한 번에 받으므로 이름만 남고 분류가 빠지는 경우가 없다
+            unclassified = []
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(400, f"영수증 스캔 실패: {e}")
+
+    if not save:
+        return {"items": items, "unclassified": unclassified}
+
+    try:
+        item_list = _to_item_creates([OCRClassifyItem(**it) for it in items])
+        updated_items = await run_in_threadpool(upsert_items, db, item_list, user_id)
+    except Exception as e:
+        raise HTTPException(500, f"Item 저장 실패: {e}")
+    return {"items": items, "unclassified": unclassified, "saved_items": [itm.item_id for itm in updated_items]}
+
+def _to_item_creates(items: list[OCRClassifyItem]) -> list[ItemCreate]:
+    # OCR에서 받은 expiry_text → expiry_date 변환
     item_list: list[ItemCreate] = []
-    for it in req.items:
+    for it in items:
         expiry_date = parse_expiry(it.expiry_text)
         item_list.append(ItemCreate(
             item_name=it.item_name,
@@ -47,6 +293,15 @@ def save_items_endpoint(
             category_sub_name=it.category_sub_name,
             expiry_date=expiry_date
         ))
+    return item_list
+
+@router.post("/save-items", response_model=OCRSaveResponse)
+def save_items_endpoint(
+    req: OCRSaveRequest,
+    db: Session = Depends(get_db)
+):
+    # 1) OCR에서 받은 expiry_text → expiry_date 변환
+    item_list = _to_item_creates(req.items)
 
     # 2) DB에 upsert (user_id는 upsert_items 함수에 전달)
     try:
@@ -1,5 +1,5 @@
 from pydantic import BaseModel
-from typing import List
+from typing import List, Optional
 from datetime import date
 
 # 1) OCR로 뽑아낸 원본 이름 목록
@@ -17,9 +17,10 @@ class OCRClassifyItem(BaseModel):
     category_sub_name: str
     expiry_text: str
 
-# 4) 분류 응답
+# 4) 분류 응답: 재시도 후에도 분류하지 못한 이름은 unclassified 로 (items 에서 빠진 이유 구분용)
 class OCRClassifyResponse(BaseModel):
     items: List[OCRClassifyItem]
+    unclassified: List[str] = []
 
 # 5) 최종 저장 요청: user_id + 분류된 아이템들
 class OCRSaveRequest(BaseModel):
@@ -29,3 +30,26 @@ class OCRSaveRequest(BaseModel):
 # 6) 저장 응답: 생성된 item_id 리스트
 class OCRSaveResponse(BaseModel):
     saved_items: List[int]
+
+# 7) 한 번에 스캔(추출 + 분류) 응답: save=true 면 저장된 item_id 도 함께
+class OCRScanResponse(BaseModel):
+    items: List[OCRClassifyItem]
+    unclassified: List[str] = []
+    saved_items: Optional[List[int]] = None
+
+# 8) 여러 장 일괄 추출: 합쳐서 중복 제거한 이름 + 이미지별 결과/소요 시간
+class OCRBatchImageResult(BaseModel):
+    filename: Optional[str] = None
+    extracted_names: List[str]
+    elapsed_ms: float
+    error: Optional[str] = None
+
+class OCRBatchExtractResponse(BaseModel):
+    extracted_names: List[str]
+    images: List[OCRBatchImageResult]
+    elapsed_ms: float
+
+# 9) 백그라운드 작업 등록 응답 (결과는 /jobs/{job_id} 로 조회)
+class OCRJobResponse(BaseModel):
+    job_id: str
+    status: str
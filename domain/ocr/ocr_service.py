@@ -1,66 +1,162 @@
 # src/domain/ocr/ocr_service.py
 
 import json
-import base64
-import openai
+import logging
 import re
 from datetime import date, timedelta, timezone, datetime
+from typing import BinaryIO
 
-def _strip_code_fence(raw: str) -> str:
-    """
-    ```json
-    [...]
-    ```
-    같은 코드펜스를 제거하고 순수 JSON 텍스트만 반환.
-    """
-    # 1) ```json ... ```
-    m = re.search(r"```(?:json)?\s*(\[[\s\S]*\])\s*```", raw, re.IGNORECASE)
-    if m:
-        return m.group(1)
-    # 2) ``` ... ```
-    m = re.search(r"```\s*([\s\S]*?)\s*```", raw)
-    if m:
-        return m.group(1)
-    # 3) 펜스 없으면 그대로
-    return raw
+from starlette.concurrency import run_in_threadpool
+
+from config import OCR_OUTPUT_RETRIES
+from llm_backend import get_openai_client
+from domain.ocr.ocr_schema import OCRClassifyItem
+from domain.ocr.ocr_utils import image_data_url
 
-def extract_names_from_image(img_bytes: bytes) -> list[str]:
-    b64 = base64.b64encode(img_bytes).decode("utf-8")
-    user_prompt = """
+logger = logging.getLogger(__name__)
+
+OCR_MODEL = "gpt-4.1"
+
+# 분류 체계 (CLASSIFY_PROMPT 의 대분류/소분류 목록과 같아야 함)
+CATEGORY_TREE = {
+    "식물성": ["곡류·서류", "두류·견과", "채소류", "버섯류", "과일류", "해조류"],
+    "동물성": ["육류", "알류", "유제품", "해산물"],
+    "조미료·양념": ["기본 조미료", "한식 양념"],
+    "가공·저장식품": ["가공식품", "저장식품/반찬"],
+    "기타": ["스낵/과자"],
+}
+SUB_TO_MAJOR = {sub: major for major, subs in CATEGORY_TREE.items() for sub in subs}
+
+# "1주", "2달" 같은 유통기한을 "n일" 로 바꿀 때 쓰는 단위
+EXPIRY_UNIT_DAYS = {"주": 7, "달": 30, "개월": 30, "년": 365}
+
+EXTRACT_PROMPT = """
 너는 식재료 및 요리 전문가야.
 이 영수증(주문목록, 결제내역 등) 이미지에서 **식재료**의 **상품명** 텍스트만 OCR로 추출하고,
 추출된 상품명을 “일반 식재료명”으로 정규화해줘. 
 추가 예시: 모둠쌈채소 → 모둠쌈채소, 찌개두부 → 찌개두부, 찌개용 돈뼈 → 찌개용 돈뼈, 
 포카칩 → 과자, 꿀사과 → 사과, 손질 오징어 → 손질 오징어, 건조 오징어 → 건조 오징어, 삼겹살 → 삼겹살,
 콩나물 → 콩나물(O), 콩나물 → 나물(X), 오이고추 → 고추(O), 오이고추 → 오이(X)
-최종적으로 JSON 배열(문자열 리스트) 형태로만 반환해.
+최종적으로 정규화한 상품명 목록을 names 에 담아 반환해.
 """.strip()
 
-    resp = openai.chat.completions.create(
-        model="gpt-4.1",
-        temperature=0,
-        messages=[
-            {"role":"system","content":"You are a helpful assistant."},
-            {
-              "role":"user",
-              "content":[
-                 {"type":"text","text":user_prompt},
-                 {"type":"image_url",
-                   "image_url":{"url":f"data:image/jpeg;base64,{b64}"}}
-              ]
-            }
-        ]
+def _items_schema(name: str) -> dict:
+    """분류된 아이템 목록 {"items": [OCRClassifyItem, ...]} 의 structured output 스키마"""
+    return {
+        "name": name,
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "items": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "item_name": {"type": "string"},
+                            "category_major_name": {"type": "string", "enum": list(CATEGORY_TREE)},
+                            "category_sub_name": {"type": "string", "enum": list(SUB_TO_MAJOR)},
+                            "expiry_text": {"type": "string"},
+                        },
+                        "required": ["item_name", "category_major_name", "category_sub_name", "expiry_text"],
+                        "additionalProperties": False,
+                    },
+                },
+            },
+            "required": ["items"],
+            "additionalProperties": False,
+        },
+    }
+
+# structured output 스키마: 상품명 추출 / 이름 분류 / 추출 + 분류를 한 번에 하는 vision 호출
+EXTRACT_SCHEMA = {
+    "name": "receipt_names",
+    "strict": True,
+    "schema": {
+        "type": "object",
+        "properties": {"names": {"type": "array", "items": {"type": "string"}}},
+        "required": ["names"],
+        "additionalProperties": False,
+    },
+}
+CLASSIFY_SCHEMA = _items_schema("classified_items")
+SCAN_SCHEMA = _items_schema("receipt_items")
+
+# structured output 지표 (호출 종류별)
+# - calls / parse_failures : LLM 응답 수 / 그중 JSON 파싱 실패 (잘린 응답, 거절 등) → 같은 요청 재시도
+# - entries / invalid_entries : 검사한 항목 수 / 로컬에서 고칠 수 없었거나 응답에서 빠진 항목
+# - repaired_entries : 로컬에서 고친 항목 ("1주" → "7일", 소분류에 맞게 대분류 수정)
+# - retried_entries : 다시 요청한 항목 / dropped_entries : 끝내 결과에서 뺀 항목
+_output_stats = {
+    kind: dict.fromkeys(
+        ("calls", "parse_failures", "entries", "invalid_entries",
+         "repaired_entries", "retried_entries", "dropped_entries"), 0
     )
+    for kind in ("extract", "classify", "scan")
+}
 
+async def _request_json(kind: str, schema: dict, messages: list[dict]) -> list | None:
+    """structured output 호출 1회 → 스키마의 배열 필드. 파싱에 실패하면 None"""
+    stats = _output_stats[kind]
+    stats["calls"] += 1
+    resp = await get_openai_client().chat.completions.create(
+        model=OCR_MODEL,
+        temperature=0,
+        response_format={"type": "json_schema", "json_schema": schema},
+        messages=messages,
+    )
     raw = resp.choices[0].message.content or ""
-    payload = _strip_code_fence(raw).strip()
+    key = schema["schema"]["required"][0]
     try:
-        return json.loads(payload)
-    except json.JSONDecodeError:
-        raise RuntimeError(f"OCR JSON 파싱 실패:\n{payload}")
+        value = json.loads(raw)[key]
+        if isinstance(value, list):
+            return value
+    except (json.JSONDecodeError, KeyError, TypeError):
+        pass
+    stats["parse_failures"] += 1
+    logger.warning(f"{kind} 응답 파싱 실패: {raw[:200]}")
+    return None
+
+async def _request_json_with_retry(kind: str, schema: dict, messages: list[dict]) -> list:
+    for _ in range(OCR_OUTPUT_RETRIES + 1):
+        value = await _request_json(kind, schema, messages)
+        if value is not None:
+            return value
+    raise RuntimeError(f"{kind} JSON 파싱 실패 ({OCR_OUTPUT_RETRIES + 1}회)")
 
-def classify_names(names: list[str]) -> list[dict]:
-    system = """
+def structured_output_stats() -> dict:
+    snapshot = {}
+    for kind, s in _output_stats.items():
+        snapshot[kind] = {
+            **s,
+            "parse_failure_rate": s["parse_failures"] / s["calls"] if s["calls"] else 0.0,
+            "invalid_rate": s["invalid_entries"] / s["entries"] if s["entries"] else 0.0,
+        }
+    return snapshot
+
+async def extract_names_from_image(image: BinaryIO) -> list[str]:
+    image_url = await run_in_threadpool(image_data_url, image)
+
+    names = await _request_json_with_retry("extract", EXTRACT_SCHEMA, [
+        {"role":"system","content":"You are a helpful assistant."},
+        {
+          "role":"user",
+          "content":[
+             {"type":"text","text":EXTRACT_PROMPT},
+             {"type":"image_url",
+               "image_url":{"url":image_url}}
+          ]
+        }
+    ])
+
+    valid = [name.strip() for name in names if isinstance(name, str) and name.strip()]
+    stats = _output_stats["extract"]
+    stats["entries"] += len(names)
+    stats["invalid_entries"] += len(names) - len(valid)
+    stats["dropped_entries"] += len(names) - len(valid)
+    return valid
+
+CLASSIFY_PROMPT = """
 너는 식재료 및 요리 전문가야.  
 아래의 다섯 가지 **대분류** 중 하나로 `category_major_name` 를,  
 각 대분류에 속하는 **소분류** 중 하나로 `category_sub_name` 를 정확히 매핑하고,  
@@ -103,35 +199,120 @@ def classify_names(names: list[str]) -> list[dict]:
 5. 기타 
 - 스낵/과자
 
-반환 형식(JSON 배열):  
-  [  
+반환 형식(JSON):  
+  {"items": [  
     {  
       "item_name": "사과",  
       "category_major_name": "식물성",  
       "category_sub_name": "과일류",  
-      "expiry_text": "1주"  
+      "expiry_text": "7일"  
     },  
     …  
-  ]  
-절대로 추가 설명 없이, 순수 JSON만 리턴하세요.
+  ]}  
+item_name 은 입력받은 이름을 그대로 쓰고, 절대로 추가 설명 없이 순수 JSON만 리턴하세요.
 """.strip()
 
-    resp = openai.chat.completions.create(
-        model="gpt-4.1",
-        temperature=0,
-        messages=[
-           {"role":"system","content":system},
-           {"role":"user","content": json.dumps(names, ensure_ascii=False)}
-        ]
-    )
+async def classify_names(names: list[str]) -> list[dict]:
+    """
+    이름 목록 → 분류 결과 (요청한 순서, item_name 은 요청한 이름 그대로).
+    응답 항목은 OCRClassifyItem + 분류 체계/유통기한 규칙으로 검사해서
+    고칠 수 있으면 고치고, 못 고치거나 빠진 이름만 OCR_OUTPUT_RETRIES 번까지 다시 요청한다.
+    그래도 분류하지 못한 이름은 결과에서 빠진다.
+    """
+    stats = _output_stats["classify"]
+    classified: dict[str, dict] = {}
+    pending = list(dict.fromkeys(names))
+    for attempt in range(OCR_OUTPUT_RETRIES + 1):
+        if attempt:
+            stats["retried_entries"] += len(pending)
+        raw_items = await _request_json("classify", CLASSIFY_SCHEMA, [
+           {"role":"system","content":CLASSIFY_PROMPT},
+           {"role":"user","content": json.dumps(pending, ensure_ascii=False)}
+        ])
+        if raw_items is None:
+            continue
 
-    raw = resp.choices[0].message.content or ""
-    payload = _strip_code_fence(raw).strip()
-    try:
-        items = json.loads(payload)
-    except json.JSONDecodeError:
-        raise RuntimeError(f"분류 JSON 파싱 실패:\n{payload}")
+        matched = _match_names(raw_items, pending)
+        invalid = []
+        for name in pending:
+            stats["entries"] += 1
+            try:
+                if name not in matched:
+                    raise ValueError("응답에 없음")
+                item, repaired = _validate_item(matched[name])
+            except ValueError as e:
+                stats["invalid_entries"] += 1
+                logger.info(f"분류 항목 불량 {name}: {e}")
+                invalid.append(name)
+                continue
+            stats["repaired_entries"] += repaired
+            classified[name] = {**item, "item_name": name}
+        pending = invalid
+        if not pending:
+            break
+
+    if pending:
+        stats["dropped_entries"] += len(pending)
+        if not classified:
+            raise RuntimeError(f"분류 실패: {pending}")
+        logger.warning(f"분류하지 못해 제외한 이름: {pending}")
+    return [classified[name] for name in names if name in classified]
+
+def _match_names(raw_items: list, names: list[str]) -> dict[str, dict]:
+    """응답 항목을 요청한 이름과 짝지음: item_name 이 같으면 그 이름, 남은 것끼리는 개수가 같을 때 순서대로"""
+    matched: dict[str, dict] = {}
+    leftover = []
+    for raw in raw_items:
+        name = raw.get("item_name") if isinstance(raw, dict) else None
+        name = name.strip() if isinstance(name, str) else None
+        if name in names and name not in matched:
+            matched[name] = raw
+        else:
+            leftover.append(raw)
+    rest = [name for name in names if name not in matched]
+    if len(rest) == len(leftover):
+        matched.update(zip(rest, leftover))
+    return matched
+
+def _expiry_in_days(text: str) -> str | None:
+    """유통기한 텍스트를 "n일" / "무기한" 으로 (바꿀 수 없으면 None)"""
+    text = text.replace(" ", "")
+    if text == "무기한" or re.fullmatch(r"\d+일", text):
+        return text
+    m = re.fullmatch(r"(\d+)(주|달|개월|년)", text)
+    if m:
+        return f"{int(m.group(1)) * EXPIRY_UNIT_DAYS[m.group(2)]}일"
+    return None
+
+def _validate_item(raw) -> tuple[dict, bool]:
+    """
+    응답 항목 하나를 OCRClassifyItem 으로 검증하고 분류 체계/유통기한 규칙을 확인.
+    (항목, 로컬에서 고쳤는지) 반환, 고칠 수 없으면 ValueError
+    """
+    if not isinstance(raw, dict):
+        raise ValueError("객체가 아님")
+    item = OCRClassifyItem(**_standardize([raw])[0]).model_dump()  # ValidationError 도 ValueError
+    item["item_name"] = item["item_name"].strip()
+    if not item["item_name"]:
+        raise ValueError("상품명 없음")
+
+    repaired = False
+    if item["category_sub_name"] not in CATEGORY_TREE.get(item["category_major_name"], ()):
+        major = SUB_TO_MAJOR.get(item["category_sub_name"])
+        if major is None:
+            raise ValueError(f"목록에 없는 분류 {item['category_major_name']}/{item['category_sub_name']}")
+        item["category_major_name"] = major
+        repaired = True
 
+    expiry = _expiry_in_days(item["expiry_text"])
+    if expiry is None:
+        raise ValueError(f"유통기한 형식 오류 {item['expiry_text']!r}")
+    if expiry != item["expiry_text"]:
+        item["expiry_text"] = expiry
+        repaired = True
+    return item, repaired
+
+def _standardize(items: list[dict]) -> list[dict]:
     standardized = []
     for it in items:
         standardized.append({
@@ -142,6 +323,63 @@ def classify_names(names: list[str]) -> list[dict]:
         })
     return standardized
 
+async def scan_receipt(image: BinaryIO) -> list[dict]:
+    """
+    영수증 이미지 → 분류까지 끝난 아이템 목록 (vision 호출 1회)
+    extract_names_from_image + classify_names 를 합친 것으로,
+    추출 규칙은 EXTRACT_PROMPT, 분류 규칙은 CLASSIFY_PROMPT 를 그대로 쓴다.
+    규칙에 어긋난 항목은 고칠 수 있으면 고치고, 아니면 그 이름들만 텍스트로 다시 분류한다.
+    """
+    image_url = await run_in_threadpool(image_data_url, image)
+
+    raw_items = await _request_json_with_retry("scan", SCAN_SCHEMA, [
+        {"role":"system","content":CLASSIFY_PROMPT},
+        {
+          "role":"user",
+          "content":[
+             {"type":"text","text":EXTRACT_PROMPT.replace(
+                 "최종적으로 정규화한 상품명 목록을 names 에 담아 반환해.",
+                 "정규화한 상품명마다 위 분류 규칙대로 대분류/소분류/유통기한을 붙여서 반환해."
+             )},
+             {"type":"image_url",
+               "image_url":{"url":image_url}}
+          ]
+        }
+    ])
+
+    # 규칙에 어긋난 항목은 (이미지 없이) 그 이름만 classify_names 로 다시 분류
+    stats = _output_stats["scan"]
+    slots: list[dict | str] = []
+    for raw in raw_items:
+        stats["entries"] += 1
+        try:
+            item, repaired = _validate_item(raw)
+            stats["repaired_entries"] += repaired
+            slots.append(item)
+        except ValueError as e:
+            stats["invalid_entries"] += 1
+            name = raw.get("item_name") if isinstance(raw, dict) else None
+            if isinstance(name, str) and name.strip():
+                logger.info(f"스캔 항목 불량 {name}: {e}")
+                slots.append(name.strip())
+            else:
+                stats["dropped_entries"] += 1
+
+    retry = [slot for slot in slots if isinstance(slot, str)]
+    fixed = {}
+    if retry:
+        stats["retried_entries"] += len(retry)
+        try:
+            fixed = {it["item_name"]: it for it in await classify_names(retry)}
+        except RuntimeError as e:
+            logger.warning(f"스캔 항목 재분류 실패: {e}")
+        stats["dropped_entries"] += len(set(retry) - set(fixed))
+    return [
+        slot if isinstance(slot, dict) else fixed[slot]
+        for slot in slots
+        if isinstance(slot, dict) or slot in fixed
+    ]
+
 def parse_expiry(expiry_text: str) -> date | None:
     """
     - "YYYY-MM-DD" (수동 수정된 ISO 포맷)인 경우 그대로 파싱해서 리턴
@@ -0,0 +1,254 @@
+import base64
+import io
+import logging
+import os
+import threading
+import time
+from typing import BinaryIO, Iterator
+
+import cv2
+import numpy as np
+from PIL import Image, ImageOps
+
+from fastapi import HTTPException, UploadFile
+from starlette.responses import JSONResponse
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from config import (
+    OCR_PREPROCESS, OCR_CROP_RECEIPT, OCR_GRAYSCALE, OCR_MAX_SIDE, OCR_JPEG_QUALITY,
+    OCR_MAX_UPLOAD_BYTES, OCR_BATCH_MAX_IMAGES
+)
+
+# 영수증 이미지 전처리 (vision OCR 호출 전)
+# 휴대폰 원본 사진(4~12MB)을 그대로 보내면 업로드/추론 시간이 크기에 비례해서 늘어나므로
+# 1) EXIF 방향 보정  2) 영수증 영역만 잘라내기  3) 긴 변 기준 축소
+# 4) 흑백 변환  5) JPEG 재압축
+# 을 거쳐 보낸다. 단계별 소요 시간과 전/후 바이트 수를 함께 돌려준다.
+# CPU 작업이므로 이벤트 루프가 아닌 스레드풀에서 호출할 것.
+#
+# 업로드 파일은 bytes 로 통째로 읽지 않고 UploadFile 의 spooled 임시 파일을 그대로 넘긴다.
+# (해시/디코딩/base64 모두 파일에서 조각 단위로 읽음 → 원본 bytes 전체를 메모리에 올리지 않음)
+# base64 data URL 자체는 문자열이라 인코딩된 크기(원본의 4/3)만큼은 메모리에 만들어진다.
+
+logger = logging.getLogger(__name__)
+
+# 잘라낸 영역이 원본의 이 비율보다 작으면 윤곽선 검출이 틀린 것으로 보고 자르지 않음
+MIN_CROP_AREA_RATIO = 0.2
+CROP_PADDING = 10
+
+# multipart 경계/헤더/폼 필드 몫으로 요청 본문 한도에 더해 주는 여유분
+MULTIPART_OVERHEAD = 64 * 1024
+
+# 한 번에 읽을 크기. base64 는 3바이트 단위로 인코딩되므로 3의 배수여야 조각을 이어 붙일 수 있다.
+CHUNK_SIZE = 3 * 256 * 1024
+
+_stats_lock = threading.Lock()
+_stats = {
+    "images": 0,
+    "skipped": 0,
+    "bytes_before": 0,
+    "bytes_after": 0,
+    "timings_ms": {},
+}
+
+
+def _too_large() -> HTTPException:
+    return HTTPException(
+        413, f"이미지가 너무 큽니다. 최대 {OCR_MAX_UPLOAD_BYTES // (1024 * 1024)}MB 까지 올릴 수 있습니다."
+    )
+
+
+def check_upload_size(file: UploadFile):
+    """
+    OCR_MAX_UPLOAD_BYTES 를 넘는 업로드는 413 (파일 한 장 기준)
+    본문 전체 크기는 UploadSizeLimitMiddleware 가 받기 전에/받는 중에 먼저 막는다.
+    """
+    size = file.size if file.size is not None else file_size(file.file)
+    if size > OCR_MAX_UPLOAD_BYTES:
+        raise _too_large()
+
+
+def upload_body_limit(path: str) -> int:
+    """/ocr 요청 본문 한도: 이미지 한 장(일괄 추출은 최대 장수만큼) + multipart 여유분"""
+    images = OCR_BATCH_MAX_IMAGES if path.rstrip("/").endswith("/batch") else 1
+    return OCR_MAX_UPLOAD_BYTES * images + MULTIPART_OVERHEAD
+
+
+class UploadSizeLimitMiddleware:
+    """
+    /ocr 요청 본문을 Starlette 가 임시 파일로 다 받기 전에 크기 제한
+    - Content-Length 가 한도를 넘으면 본문을 읽지 않고 바로 413
+    - Content-Length 가 없거나(chunked) 거짓이면 받은 바이트를 세다가 한도를 넘는 순간 413
+    """
+
+    def __init__(self, app: ASGIApp, path_prefix: str = "/ocr"):
+        self.app = app
+        self.path_prefix = path_prefix
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send):
+        if scope["type"] != "http" or not scope["path"].startswith(self.path_prefix):
+            await self.app(scope, receive, send)
+            return
+
+        limit = upload_body_limit(scope["path"])
+        content_length = dict(scope["headers"]).get(b"content-length")
+        if content_length is not None and content_length.isdigit() and int(content_length) > limit:
+            response = JSONResponse({"detail": _too_large().detail}, status_code=413)
+            await response(scope, receive, send)
+            return
+
+        received = 0
+
+        async def limited_receive() -> Message:
+            nonlocal received
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > limit:
+                    raise _too_large()
+            return message
+
+        await self.app(scope, limited_receive, send)
+
+
+def file_size(fp: BinaryIO) -> int:
+    fp.seek(0, os.SEEK_END)
+    return fp.tell()
+
+
+def iter_chunks(fp: BinaryIO, chunk_size: int = CHUNK_SIZE) -> Iterator[bytes]:
+    fp.seek(0)
+    while chunk := fp.read(chunk_size):
+        yield chunk
+
+
+def image_data_url(fp: BinaryIO, mime: str = "image/jpeg") -> str:
+    """
+    파일 → base64 data URL. 원본은 조각 단위로 읽어서 인코딩한다.
+    인코딩된 조각들을 한 번에 이어 붙여 최종 문자열을 한 번만 만든다 (중간 bytes/bytearray 사본 없음).
+    """
+    pieces = [f"data:{mime};base64,"]
+    pieces.extend(base64.b64encode(chunk).decode("ascii") for chunk in iter_chunks(fp))
+    return "".join(pieces)
+
+
+def _crop_to_receipt(image: Image.Image) -> Image.Image:
+    """가장 큰 밝은 윤곽선(영수증 용지)의 외접 사각형으로 자르기"""
+    # 윤곽선 검출은 작은 흑백 사본으로 (속도 + 메모리)
+    scale = min(1.0, 800 / max(image.size))
+    small_image = image.convert("L")
+    if scale < 1:
+        small_image = small_image.resize(
+            (max(1, round(image.width * scale)), max(1, round(image.height * scale))),
+            Image.Resampling.BILINEAR,
+        )
+    small = np.asarray(small_image)
+    blurred = cv2.GaussianBlur(small, (5, 5), 0)
+    _, mask = cv2.threshold(blurred, 0, 255, cv2.THRESH_BINARY + cv2.THRESH_OTSU)
+    mask = cv2.morphologyEx(mask, cv2.MORPH_CLOSE, np.ones((9, 9), np.uint8))
+    contours, _ = cv2.findContours(mask, cv2.RETR_EXTERNAL, cv2.CHAIN_APPROX_SIMPLE)
+    if not contours:
+        return image
+
+    x, y, w, h = cv2.boundingRect(max(contours, key=cv2.contourArea))
+    if w * h < MIN_CROP_AREA_RATIO * small.shape[0] * small.shape[1]:
+        return image
+
+    left = max(0, int(x / scale) - CROP_PADDING)
+    top = max(0, int(y / scale) - CROP_PADDING)
+    right = min(image.width, int((x + w) / scale) + CROP_PADDING)
+    bottom = min(image.height, int((y + h) / scale) + CROP_PADDING)
+    return image.crop((left, top, right, bottom))
+
+
+def preprocess_receipt(
+    fp: BinaryIO,
+    crop: bool = OCR_CROP_RECEIPT,
+    grayscale: bool = OCR_GRAYSCALE,
+    max_side: int = OCR_MAX_SIDE,
+    quality: int = OCR_JPEG_QUALITY,
+) -> tuple[BinaryIO, dict]:
+    """
+    영수증 이미지 파일 → (전처리된 JPEG 파일, 리포트)
+    리포트: bytes_before / bytes_after / size_before / size_after / timings_ms(단계별)
+    디코딩할 수 없거나 결과가 원본보다 크면 원본 파일을 그대로 돌려준다.
+    """
+    report = {"bytes_before": file_size(fp), "timings_ms": {}}
+    timings = report["timings_ms"]
+
+    def stage(name: str, started: float):
+        timings[name] = (time.perf_counter() - started) * 1000
+
+    if not OCR_PREPROCESS:
+        return _finish(fp, report, skipped=True)
+
+    started = time.perf_counter()
+    try:
+        fp.seek(0)
+        image = Image.open(fp)
+        report["size_before"] = image.size
+        # JPEG 은 긴 변이 max_side 이상인 범위에서 1/2~1/8 로 줄여서 디코딩 (픽셀 버퍼 크기 감소)
+        scale = max_side / max(image.size)
+        image.draft(image.mode, (int(image.width * scale), int(image.height * scale)))
+        image.load()
+    except Exception as e:
+        logger.warning(f"영수증 이미지 디코딩 실패, 원본 사용: {e}")
+        return _finish(fp, report, skipped=True)
+    stage("decode", started)
+
+    started = time.perf_counter()
+    image = ImageOps.exif_transpose(image)
+    stage("orient", started)
+
+    if crop:
+        started = time.perf_counter()
+        image = _crop_to_receipt(image)
+        stage("crop", started)
+
+    if max(image.size) > max_side:
+        started = time.perf_counter()
+        image.thumbnail((max_side, max_side), Image.Resampling.LANCZOS)
+        stage("resize", started)
+
+    started = time.perf_counter()
+    image = image.convert("L") if grayscale else image.convert("RGB")
+    stage("convert", started)
+
+    started = time.perf_counter()
+    buf = io.BytesIO()
+    image.save(buf, format="JPEG", quality=quality, optimize=True)
+    stage("encode", started)
+    report["size_after"] = image.size
+
+    if buf.tell() >= report["bytes_before"]:
+        return _finish(fp, report, skipped=True)
+    return _finish(buf, report)
+
+
+def _finish(out: BinaryIO, report: dict, skipped: bool = False) -> tuple[BinaryIO, dict]:
+    report["bytes_after"] = file_size(out)
+    report["skipped"] = skipped
+    with _stats_lock:
+        _stats["images"] += 1
+        _stats["skipped"] += skipped
+        _stats["bytes_before"] += report["bytes_before"]
+        _stats["bytes_after"] += report["bytes_after"]
+        # 단계별 [누적 ms, 횟수]
+        for name, ms in report["timings_ms"].items():
+            total = _stats["timings_ms"].setdefault(name, [0.0, 0])
+            total[0] += ms
+            total[1] += 1
+    return out, report
+
+
+def preprocess_stats() -> dict:
+    with _stats_lock:
+        images = _stats["images"]
+        return {
+            "images": images,
+            "skipped": _stats["skipped"],
+            "bytes_before": _stats["bytes_before"],
+            "bytes_after": _stats["bytes_after"],
+            "compression_ratio": _stats["bytes_after"] / _stats["bytes_before"] if _stats["bytes_before"] else 0.0,
+            "avg_timings_ms": {k: ms / n for k, (ms, n) in _stats["timings_ms"].items()},
+        }
@@ -0,0 +1,104 @@
+import hashlib
+import itertools
+import math
+import threading
+
+from cachetools import TTLCache
+
+from config import QA_CACHE_MAXSIZE, QA_CACHE_TTL_SECONDS
+from domain.qa.qa_classifier import normalize_request
+
+# 레시피 추천 응답 캐시
+# 키: (user_id, 사용자 세대 번호, 재료 집합 해시, 분류 라벨, 정규화된 요청 문장)
+# - LRU + TTL 만료 (cachetools.TTLCache)
+# - 재고가 바뀌면 invalidate_user() 로 세대 번호를 올려 이전 응답을 모두 무효화
+# - 세대 번호는 재고를 읽기 전에 current_generation() 으로 잡아 두고 그 값으로 키를 만든다.
+#   생성 도중 무효화되면 키의 세대가 현재 세대와 달라지므로 store_response() 가 저장하지 않는다.
+#   (재료 해시가 그대로인 변경, 예: 유통기한만 수정해도 이전 재고로 만든 응답이 새 세대로 들어가지 않음)
+#
+# 세대 번호는 전역 카운터에서 받으므로 한 번 쓴 번호는 다시 나오지 않는다.
+# 사용자별 세대는 마지막 무효화 후 QA_CACHE_TTL_SECONDS 가 지나면 잊는다 (기본 세대 0 으로 돌아감).
+# 그 시점에는 세대 0 으로 저장된 응답(= 첫 무효화 전에 세대 0 일 때 저장된 것)도 모두 만료됐으므로 안전하다.
+# 그래서 _generations 는 최근 TTL 안에 재고를 바꾼 사용자 수만큼만 커진다.
+# (크기로 내보내면 이 보장이 깨지므로 maxsize 는 두지 않고 만료로만 줄어든다)
+#
+# 캐시와 세대 번호는 프로세스 메모리에 있다. invalidate_user() 는 호출한 프로세스에만 적용되므로
+# uvicorn 워커가 여러 개면 재고를 바꾼 요청을 받지 않은 워커는 TTL(QA_CACHE_TTL_SECONDS) 동안
+# 이전 재고로 만든 응답을 계속 줄 수 있다. 여러 워커로 띄울 때는 TTL 을 그만큼 짧게 잡을 것.
+
+_lock = threading.Lock()
+_responses = TTLCache(maxsize=QA_CACHE_MAXSIZE, ttl=QA_CACHE_TTL_SECONDS)
+# 분류 없이 바로 답하는 경로(single 모드)를 위해 마지막으로 본 라벨도 기억
+_labels = TTLCache(maxsize=QA_CACHE_MAXSIZE, ttl=QA_CACHE_TTL_SECONDS)
+_generations = TTLCache(maxsize=math.inf, ttl=QA_CACHE_TTL_SECONDS)
+_generation_counter = itertools.count(1)
+_stats = {"hits": 0, "misses": 0, "invalidations": 0, "stale_stores": 0}
+
+
+def ingredient_set_key(user_ingredients: str) -> str:
+    """", " 로 이어 붙인 재료 문자열 → 정규화·중복 제거·정렬한 집합의 해시"""
+    names = {" ".join(name.lower().split()) for name in user_ingredients.split(",")}
+    names.discard("")
+    joined = "\n".join(sorted(names))
+    return hashlib.sha1(joined.encode("utf-8")).hexdigest()
+
+
+def current_generation(user_id: int) -> int:
+    """재고를 읽기 전에 호출해서 cache_key() 에 넘긴다"""
+    with _lock:
+        return _generations.get(user_id, 0)
+
+
+def cache_key(user_id: int, generation: int, user_ingredients: str, user_request: str) -> tuple:
+    return (user_id, generation, ingredient_set_key(user_ingredients), normalize_request(user_request))
+
+
+def _is_current(uid: int, gen: int) -> bool:
+    return gen == _generations.get(uid, 0)
+
+
+def lookup_label(key: tuple) -> str | None:
+    """같은 재고·같은 요청에 대해 이전에 결정된 분류 라벨"""
+    with _lock:
+        uid, gen, _, _ = key
+        return _labels.get(key) if _is_current(uid, gen) else None
+
+
+def get_cached_response(key: tuple, category: str) -> str | None:
+    """key 를 만든 뒤 무효화됐으면 (키의 세대가 지난 것) 이전 응답을 주지 않고 미스로 처리"""
+    with _lock:
+        uid, gen, ingr, req = key
+        result = _responses.get((uid, gen, ingr, category, req)) if _is_current(uid, gen) else None
+        _stats["hits" if result is not None else "misses"] += 1
+        return result
+
+
+def store_response(key: tuple, category: str, result: str):
+    """key 는 생성 전에 만든 것. 그 사이 무효화됐으면 저장하지 않음"""
+    with _lock:
+        uid, gen, ingr, req = key
+        if not _is_current(uid, gen):
+            _stats["stale_stores"] += 1
+            return
+        _responses[(uid, gen, ingr, category, req)] = result
+        _labels[key] = category
+
+
+def invalidate_user(user_id: int):
+    """해당 사용자의 재고가 바뀌었을 때 호출 → 캐시된 응답 전부 무효화"""
+    with _lock:
+        _generations[user_id] = next(_generation_counter)
+        _stats["invalidations"] += 1
+
+
+def cache_stats() -> dict:
+    with _lock:
+        snapshot = dict(_stats)
+        snapshot["size"] = len(_responses)
+        _generations.expire()
+        snapshot["tracked_users"] = len(_generations)
+        snapshot["maxsize"] = _responses.maxsize
+        snapshot["ttl_seconds"] = _responses.ttl
+    lookups = snapshot["hits"] + snapshot["misses"]
+    snapshot["hit_rate"] = snapshot["hits"] / lookups if lookups else 0.0
+    return snapshot
@@ -1,18 +1,40 @@
-from langchain_openai import ChatOpenAI
+import asyncio
+import logging
+import random
+
 from langchain.prompts import PromptTemplate
 from langchain_core.runnables import Runnable
-from config import OPENAI_API_KEY
+from pydantic import BaseModel, Field
+from typing import Literal
+from config import (
+    QA_FAST_CLASSIFIER_THRESHOLD, QA_FAST_CLASSIFIER_SHADOW_RATE, QA_ROUTE_MODE
+)
+from domain.qa.qa_classifier import (
+    fast_classify, record_fast_hit, record_memo_hit, record_fallback, record_comparison
+)
+from llm_backend import get_chat_model
+from llm_dispatcher import dispatch, llm_slot
+from domain.qa.qa_recipes import recommend_by_inventory, recommend_by_keyword
+from domain.qa.qa_memo import get_memo_label, save_memo_label, aget_memo_label, asave_memo_label
+from domain.qa.qa_cache import (
+    get_cached_response, store_response, lookup_label, cache_key, current_generation
+)
 
+logger = logging.getLogger(__name__)
 
-llm = ChatOpenAI(
-    temperature=0.2,
-    openai_api_key=OPENAI_API_KEY,
-    model_name="gpt-4.1" 
-)
+LLM_MODEL = "gpt-4.1"
+
+llm = get_chat_model(LLM_MODEL, temperature=0.2)
+
+# 비동기 LLM 호출은 모두 디스패처를 거친다
+# (모델별 동시 실행 제한 + 같은 프롬프트의 중복 호출 합치기)
+async def _ainvoke(prompt: PromptTemplate, inputs: dict) -> str:
+    chain = prompt | llm
+    message = await dispatch(LLM_MODEL, prompt.format(**inputs), lambda: chain.ainvoke(inputs))
+    return message.content.strip()
 
 # 1. 입력 분류 에이전트
-def classify_input(user_request: str) -> str:
-    prompt = PromptTemplate.from_template("""
+classify_prompt = PromptTemplate.from_template("""
         너는 사용자의 요청을 아래 다섯 가지 유형 중 하나로 분류하는 분류기 역할을 해.
 
         사용자의 입력은 다음 중 하나에 해당할 수 있어:
@@ -80,14 +102,68 @@ def classify_input(user_request: str) -> str:
         사용자 요청: "{user_request}"
 
         분류:
-    """)
-    chain = prompt | llm
+""")
+
+def classify_input(user_request: str) -> str:
+    chain = classify_prompt | llm
     return chain.invoke({"user_request": user_request}).content.strip()
 
+async def aclassify_input(user_request: str) -> str:
+    return await _ainvoke(classify_prompt, {"user_request": user_request})
+
+# 1-1. 로컬 빠른 분류기 → 확신도가 낮을 때만 LLM 분류
+def classify_request(user_request: str) -> str:
+    label, confidence = fast_classify(user_request)
+    if label is not None and confidence >= QA_FAST_CLASSIFIER_THRESHOLD:
+        record_fast_hit()
+        return label
+
+    # 이전에 (어느 워커에서든) LLM 으로 분류한 적 있는 문장
+    memo_label = get_memo_label(user_request)
+    if memo_label is not None:
+        record_memo_hit()
+        return memo_label
+
+    record_fallback()
+    llm_label = classify_input(user_request)
+    record_comparison(label, llm_label)
+    save_memo_label(user_request, llm_label)
+    return llm_label
+
+# 표본 비교용 백그라운드 태스크 (GC 방지를 위해 참조 보관)
+_shadow_tasks: set = set()
+
+async def _shadow_compare(user_request: str, local_label: str):
+    try:
+        record_comparison(local_label, await aclassify_input(user_request), shadow=True)
+    except Exception as e:
+        logger.warning(f"shadow classify 실패: {e}", exc_info=True)
+
+async def aclassify_request(user_request: str) -> str:
+    label, confidence = fast_classify(user_request)
+    if label is not None and confidence >= QA_FAST_CLASSIFIER_THRESHOLD:
+        record_fast_hit()
+        # 일부 요청만 LLM 으로도 분류해 일치율 측정 (응답은 기다리지 않음)
+        if random.random() < QA_FAST_CLASSIFIER_SHADOW_RATE:
+            task = asyncio.create_task(_shadow_compare(user_request, label))
+            _shadow_tasks.add(task)
+            task.add_done_callback(_shadow_tasks.discard)
+        return label
+
+    memo_label = await aget_memo_label(user_request)
+    if memo_label is not None:
+        record_memo_hit()
+        return memo_label
+
+    record_fallback()
+    llm_label = await aclassify_input(user_request)
+    record_comparison(label, llm_label)
+    await asave_memo_label(user_request, llm_label)
+    return llm_label
+
 
 # 2. 일반 레시피 추천 (재고만 사용)
-def recipe_by_inventory(ingredients: str, user_request: str) -> str:
-    prompt = PromptTemplate.from_template("""
+inventory_prompt = PromptTemplate.from_template("""
 
         당신은 사용자의 냉장고 속 재료만을 사용하여, 1인분 요리를 추천하는 요리 추천 도우미입니다.
 
@@ -126,14 +202,25 @@ def recipe_by_inventory(ingredients: str, user_request: str) -> str:
         [마지막 주의사항]
         - 출력 형식과 조건을 반드시 지켜주세요.
         - 사용자의 재료가 10개 이하라면 반드시 "재료가 적어서 간단한 요리만 가능합니다."라는 안내 문구를 레시피 앞에 출력해줘
-    """)
-    chain = prompt | llm
+""")
+
+def recipe_by_inventory(ingredients: str, user_request: str) -> str:
+    # 로컬 레시피 인덱스에 알맞은 레시피가 있으면 LLM 호출 생략
+    local = recommend_by_inventory(ingredients)
+    if local is not None:
+        return local
+    chain = inventory_prompt | llm
     return chain.invoke({"ingredients": ingredients, "user_request": user_request}).content.strip()
 
+async def arecipe_by_inventory(ingredients: str, user_request: str) -> str:
+    local = recommend_by_inventory(ingredients)
+    if local is not None:
+        return local
+    return await _ainvoke(inventory_prompt, {"ingredients": ingredients, "user_request": user_request})
+
 
 # 3. 요리 키워드 추천 (추가 재료 포함)
-def recipe_with_extra(ingredients: str, user_request: str) -> str:
-    prompt = PromptTemplate.from_template("""
+extra_prompt = PromptTemplate.from_template("""
         당신은 사용자의 요리 요청 키워드를 바탕으로 요리를 추천하는 레시피 도우미입니다.
 
         [사용자 요청]
@@ -180,14 +267,17 @@ def recipe_with_extra(ingredients: str, user_request: str) -> str:
         - ‘추가로 필요한 재료’는 절대 누락하지 마세요.
         - 사용자의 요청 키워드가 구체적인 요리 이름인지 일반 키워드인지 잘 파악하세요.
         
-    """)
+""")
 
-    chain = prompt | llm
+def recipe_with_extra(ingredients: str, user_request: str) -> str:
+    chain = extra_prompt | llm
     return chain.invoke({"ingredients": ingredients, "user_request": user_request}).content.strip()
 
+async def arecipe_with_extra(ingredients: str, user_request: str) -> str:
+    return await _ainvoke(extra_prompt, {"ingredients": ingredients, "user_request": user_request})
+
 # 재료키워드
-def keword_recipe(ingredients: str, user_request: str) -> str:
-    prompt = PromptTemplate.from_template("""
+keyword_prompt = PromptTemplate.from_template("""
         당신은 사용자가 입력한 재료 키워드를 바탕으로, 해당 재료를 활용한 요리 레시피를 추천하는 친절한 레시피 도우미입니다.
 
         [사용자 요청]  
@@ -218,13 +308,24 @@ def keword_recipe(ingredients: str, user_request: str) -> str:
         - 사용자의 요청이 재료 키워드임을 인지하고 그에 맞게 레시피를 추천하세요.
 
     
-    """)
-    chain = prompt | llm
+""")
+
+def keword_recipe(ingredients: str, user_request: str) -> str:
+    # 요청한 재료를 주재료로 쓰는 레시피가 인덱스에 있으면 LLM 호출 생략
+    local = recommend_by_keyword(ingredients, user_request)
+    if local is not None:
+        return local
+    chain = keyword_prompt | llm
     return chain.invoke({"ingredients": ingredients,"user_request": user_request}).content.strip()
 
+async def akeword_recipe(ingredients: str, user_request: str) -> str:
+    local = recommend_by_keyword(ingredients, user_request)
+    if local is not None:
+        return local
+    return await _ainvoke(keyword_prompt, {"ingredients": ingredients,"user_request": user_request})
+
 # 4. 카테고리 기반 요리 추천
-def category_recipe(ingredients : str, user_request: str) -> str:
-    prompt = PromptTemplate.from_template("""
+category_prompt = PromptTemplate.from_template("""
         당신은 요리 전문가이자 레시피 도우미입니다.
                                           
          [사용자 요청]  
@@ -247,10 +348,15 @@ def category_recipe(ingredients : str, user_request: str) -> str:
 
         출력 형식 외 다른 문장이나 설명은 작성하지 마세요.  
         반드시 형식에 맞게 출력해주시기 바랍니다.
-    """)
-    chain = prompt | llm
+""")
+
+def category_recipe(ingredients : str, user_request: str) -> str:
+    chain = category_prompt | llm
     return chain.invoke({"ingredients": ingredients, "user_request": user_request}).content.strip()
 
+async def acategory_recipe(ingredients : str, user_request: str) -> str:
+    return await _ainvoke(category_prompt, {"ingredients": ingredients, "user_request": user_request})
+
 
 # 5. 앱 설명 에이전트
 def explain_app() -> str:
@@ -280,8 +386,7 @@ def explain_app() -> str:
 """
 
 # 예외 에이전트
-def other(user_request: str) -> str:
-    prompt = PromptTemplate.from_template("""
+other_prompt = PromptTemplate.from_template("""
         너는 사용자의 질문에 답하는 친절한 챗봇이야. 하지만 너는 오직 요리나 식재료에 관한 질문에만 대답할 수 있어.
 
         아래 지침을 따르세요:
@@ -293,16 +398,74 @@ def other(user_request: str) -> str:
         사용자 질문: "{user_request}"
 
         답변:
-    """)
-    chain = prompt | llm
+""")
+
+def other(user_request: str) -> str:
+    chain = other_prompt | llm
     return chain.invoke({"user_request": user_request}).content.strip()
 
+async def aother(user_request: str) -> str:
+    return await _ainvoke(other_prompt, {"user_request": user_request})
 
-#  전체 요청 라우팅 함수
-def route_request(user_request: str, user_ingredients: str) -> str:
-    category = classify_input(user_request)
-    print(category)
 
+# 6. 분류 + 답변 단일 호출 (function calling)
+class ClassifiedAnswer(BaseModel):
+    """요청 유형과 그 유형에 맞는 최종 답변"""
+    category: Literal["일반레시피", "요리키워드", "재료키워드", "카테고리", "챗봇정보", "예외"] = Field(
+        description="사용자 요청의 유형"
+    )
+    answer: str = Field(description="유형별 출력 규칙을 따른 최종 답변. 챗봇정보이면 빈 문자열")
+
+classify_answer_prompt = PromptTemplate.from_template("""
+        당신은 『뭐먹을냉?』 요리 추천 챗봇입니다. 사용자의 요청을 먼저 분류하고, 같은 응답 안에서 그 유형에 맞는 답변까지 작성합니다.
+
+        [사용자 요청]
+        - 사용자 요청: "{user_request}"
+        - 사용자 보유 재료: {ingredients}
+
+        [1단계: 분류 (category)]
+        - 일반레시피: 특정 요리를 지정하지 않고 무엇을 먹을지 추천해달라는 요청 (예: 오늘 뭐 먹지?, 저녁 메뉴 추천해줘, 오뭐먹)
+        - 요리키워드: 파스타, 김치찌개, 볶음밥 등 특정 요리 이름을 포함한 요청 (예: 김치찌개 레시피 알려줘)
+        - 재료키워드: 감자, 면, 김치, 시금치 등 특정 재료 중심의 요청 (예: 감자요리 뭐 있을까?)
+        - 카테고리: 한식, 중식, 일식, 양식 등 큰 분류나 국가/지역별 요청 (예: 한식 추천해줘)
+        - 챗봇정보: 챗봇의 정체, 역할, 사용법을 묻는 요청 (예: ?, 너 뭐야?, 무슨 기능이 있어?)
+        - 예외: 위 어디에도 속하지 않는 요청 (예: 오늘 날씨 뭐야, 졸려, 라면의 유래가 뭘까)
+
+        [2단계: 답변 (answer)]
+        공통 출력 형식 (레시피 유형):
+        🍲 요리 이름  
+        📋 필요한 재료: (재료명과 구체적인 양 포함)  
+        👨‍🍳 요리 방법: (1번부터 번호 순서로 단계별 작성)  
+        🛒 추가로 필요한 재료: (필요한 재료 중 보유 재료에 없는 재료만 누락 없이 기재)
+
+        - 일반레시피: 보유 재료를 기반으로 보편적인 1인분 요리를 추천. 🛒 항목은 생략.
+          보유 재료가 10개 이하이면 "재료가 적어서 간단한 요리만 가능합니다."라는 문구를 먼저 출력하고 1~3개,
+          10개 이상이면 반드시 3개 추천.
+        - 요리키워드: 일반적인 키워드(예: 파스타)면 관련 레시피 1~3가지, 구체적인 요리명(예: 참치김치찌개)이면 그 요리 1가지.
+        - 재료키워드: 요청한 재료를 반드시 사용하는 흔한 가정식 레시피 1~3가지.
+        - 카테고리: 해당 카테고리의 대표적이고 일반적인 요리 3가지.
+        - 챗봇정보: answer 는 빈 문자열로 둡니다.
+        - 예외: 요리나 식재료에 관한 질문(유통기한, 조리법, 손질법, 보관법 등)이면 간단하고 정확하게 답변하고,
+          관련 없는 질문이면 "저는 [뭐먹을냉?] 입니다. 요리나 식재료와 관련된 이야기만 해주세요."를 그대로 출력.
+
+        [주의사항]
+        - 너무 생소하거나 특수한 요리는 피하세요.
+        - 레시피 유형은 출력 형식 외 다른 문장을 쓰지 마세요.
+""")
+
+def classify_and_answer(user_request: str, user_ingredients: str) -> ClassifiedAnswer:
+    chain = classify_answer_prompt | llm.with_structured_output(ClassifiedAnswer, method="function_calling")
+    return chain.invoke({"ingredients": user_ingredients, "user_request": user_request})
+
+async def aclassify_and_answer(user_request: str, user_ingredients: str) -> ClassifiedAnswer:
+    chain = classify_answer_prompt | llm.with_structured_output(ClassifiedAnswer, method="function_calling")
+    inputs = {"ingredients": user_ingredients, "user_request": user_request}
+    key = "classify_and_answer\n" + classify_answer_prompt.format(**inputs)
+    return await dispatch(LLM_MODEL, key, lambda: chain.ainvoke(inputs))
+
+
+#  분류 결과에 맞는 생성기 호출
+def generate_for_category(category: str, user_request: str, user_ingredients: str) -> str:
     if category == "일반레시피":
         return recipe_by_inventory(user_ingredients, user_request)
     elif category == "요리키워드":
@@ -314,4 +477,184 @@ def route_request(user_request: str, user_ingredients: str) -> str:
     elif category == "챗봇정보":
         return explain_app()
     else: # 예외
-        return other(user_request)
\ No newline at end of file
+        return other(user_request)
+
+async def agenerate_for_category(category: str, user_request: str, user_ingredients: str) -> str:
+    if category == "일반레시피":
+        return await arecipe_by_inventory(user_ingredients, user_request)
+    elif category == "요리키워드":
+        return await arecipe_with_extra(user_ingredients, user_request)
+    elif category == "카테고리":
+        return await acategory_recipe(user_ingredients, user_request)
+    elif category == "재료키워드":
+        return await akeword_recipe(user_ingredients, user_request)
+    elif category == "챗봇정보":
+        return explain_app()
+    else: # 예외
+        return await aother(user_request)
+
+
+#  스트리밍 생성: 선택된 생성기 체인의 토큰을 도착하는 대로 전달
+_category_prompts = {
+    "일반레시피": inventory_prompt,
+    "요리키워드": extra_prompt,
+    "카테고리": category_prompt,
+    "재료키워드": keyword_prompt,
+}
+
+async def astream_for_category(category: str, user_request: str, user_ingredients: str):
+    if category == "챗봇정보":
+        yield explain_app()
+        return
+    # 로컬 레시피 인덱스로 답할 수 있으면 한 번에 전달
+    if category == "일반레시피":
+        local = recommend_by_inventory(user_ingredients)
+    elif category == "재료키워드":
+        local = recommend_by_keyword(user_ingredients, user_request)
+    else:
+        local = None
+    if local is not None:
+        yield local
+        return
+    prompt = _category_prompts.get(category)
+    if prompt is None: # 예외
+        chain, inputs = other_prompt | llm, {"user_request": user_request}
+    else:
+        chain, inputs = prompt | llm, {"ingredients": user_ingredients, "user_request": user_request}
+    # 스트리밍은 호출자마다 따로 받아야 하므로 합치지 않고 동시 실행 슬롯만 점유
+    async with llm_slot(LLM_MODEL):
+        async for chunk in chain.astream(inputs):
+            if chunk.content:
+                yield chunk.content
+
+
+#  응답 캐시를 거쳐 생성 (key 가 없으면 캐시 사용 안 함)
+#  key 는 생성 전에 만든 것 (생성 중 재고가 바뀌면 store_response 가 버림)
+def _generate_cached(category: str, user_request: str, user_ingredients: str, key: tuple | None) -> str:
+    if key is None or category == "챗봇정보":
+        return generate_for_category(category, user_request, user_ingredients)
+    cached = get_cached_response(key, category)
+    if cached is not None:
+        return cached
+    result = generate_for_category(category, user_request, user_ingredients)
+    store_response(key, category, result)
+    return result
+
+async def _agenerate_cached(category: str, user_request: str, user_ingredients: str, key: tuple | None) -> str:
+    if key is None or category == "챗봇정보":
+        return await agenerate_for_category(category, user_request, user_ingredients)
+    cached = get_cached_response(key, category)
+    if cached is not None:
+        return cached
+    result = await agenerate_for_category(category, user_request, user_ingredients)
+    store_response(key, category, result)
+    return result
+
+def _cache_key(user_request: str, user_ingredients: str, user_id: int | None, generation: int | None) -> tuple | None:
+    if user_id is None:
+        return None
+    if generation is None:
+        generation = current_generation(user_id)
+    return cache_key(user_id, generation, user_ingredients, user_request)
+
+
+#  전체 요청 라우팅 함수
+#  - two_hop: 분류 → 생성 (LLM 최대 2회)
+#  - single : 로컬 분류기가 확신하지 못하면 분류와 답변을 한 번의 호출로 처리
+#  user_id 를 넘기면 (재고, 분류, 요청) 기준 응답 캐시를 사용
+#  generation: 재고를 읽기 전에 잡아 둔 current_generation(user_id) (없으면 지금 값)
+def route_request(
+    user_request: str, user_ingredients: str, user_id: int | None = None, generation: int | None = None
+) -> str:
+    key = _cache_key(user_request, user_ingredients, user_id, generation)
+    if QA_ROUTE_MODE == "single":
+        label, confidence = fast_classify(user_request)
+        if label is not None and confidence >= QA_FAST_CLASSIFIER_THRESHOLD:
+            record_fast_hit()
+            category = label
+        else:
+            # 같은 재고·같은 요청을 이미 처리했다면 그때의 라벨로 캐시 조회
+            category = lookup_label(key) if key is not None else None
+            if category is None:
+                category = get_memo_label(user_request)
+                if category is not None:
+                    record_memo_hit()
+            if category is None:
+                record_fallback()
+                result = classify_and_answer(user_request, user_ingredients)
+                record_comparison(label, result.category)
+                save_memo_label(user_request, result.category)
+                logger.debug(f"분류 결과 (single): {result.category}")
+                if result.category == "챗봇정보":
+                    return explain_app()
+                answer = result.answer.strip()
+                if key is not None:
+                    store_response(key, result.category, answer)
+                return answer
+    else:
+        category = classify_request(user_request)
+    logger.debug(f"분류 결과: {category}")
+    return _generate_cached(category, user_request, user_ingredients, key)
+
+# 비동기 라우팅 함수 (ainvoke 사용, 스레드풀 워커를 점유하지 않음)
+async def aroute_request(
+    user_request: str, user_ingredients: str, user_id: int | None = None, generation: int | None = None
+) -> str:
+    key = _cache_key(user_request, user_ingredients, user_id, generation)
+    if QA_ROUTE_MODE == "single":
+        label, confidence = fast_classify(user_request)
+        if label is not None and confidence >= QA_FAST_CLASSIFIER_THRESHOLD:
+            record_fast_hit()
+            category = label
+        else:
+            category = lookup_label(key) if key is not None else None
+            if category is None:
+                category = await aget_memo_label(user_request)
+                if category is not None:
+                    record_memo_hit()
+            if category is None:
+                record_fallback()
+                result = await aclassify_and_answer(user_request, user_ingredients)
+                record_comparison(label, result.category)
+                await asave_memo_label(user_request, result.category)
+                logger.debug(f"분류 결과 (single): {result.category}")
+                if result.category == "챗봇정보":
+                    return explain_app()
+                answer = result.answer.strip()
+                if key is not None:
+                    store_response(key, result.category, answer)
+                return answer
+    else:
+        category = await aclassify_request(user_request)
+    logger.debug(f"분류 결과: {category}")
+    return await _agenerate_cached(category, user_request, user_ingredients, key)
+
+
+# 스트리밍 라우팅: ("category", 라벨) 이후 ("token", 조각)들을 순서대로 yield
+# 첫 바이트까지의 시간은 분류 1회(로컬 분류기 적중 시 0회) 수준
+async def astream_route_request(
+    user_request: str, user_ingredients: str, user_id: int | None = None, generation: int | None = None
+):
+    key = _cache_key(user_request, user_ingredients, user_id, generation)
+    category = None
+    if QA_ROUTE_MODE == "single" and key is not None:
+        category = lookup_label(key)
+    if category is None:
+        category = await aclassify_request(user_request)
+    logger.debug(f"분류 결과 (stream): {category}")
+    yield "category", category
+
+    use_cache = key is not None and category != "챗봇정보"
+    if use_cache:
+        cached = get_cached_response(key, category)
+        if cached is not None:
+            yield "token", cached
+            return
+
+    parts = []
+    async for token in astream_for_category(category, user_request, user_ingredients):
+        parts.append(token)
+        yield "token", token
+    # 끝까지 생성된 응답만 캐시에 저장 (중간에 끊기면 저장하지 않음)
+    if use_cache:
+        store_response(key, category, "".join(parts).strip())
@@ -0,0 +1,240 @@
+import re
+import threading
+
+# 로컬 빠른 분류기: classify_input(LLM) 앞단에서 확실한 요청은 직접 분류
+# - 프롬프트 예시 문장과의 n-gram 유사도
+# - 요리/재료/카테고리 어휘 사전 매칭
+# 확신도가 낮으면 None 을 돌려주고 LLM 분류로 넘어간다.
+# 요리명만 있는 요청은 레시피 요청이 아닐 수도 있으므로(유래/칼로리/맛집 등) 레시피 의도 표현이
+# 함께 있을 때만 요리키워드를 확정하고, 질문/부정 표현이 있으면 항상 LLM 에 맡긴다.
+
+LABELS = ("일반레시피", "요리키워드", "재료키워드", "카테고리", "챗봇정보", "예외")
+
+# classify_input 프롬프트에 있는 예시 문장
+PROMPT_EXAMPLES = {
+    "일반레시피": ["오늘 뭐 먹지?", "저녁 메뉴 추천해줘", "아무거나 추천해줘", "레시피 추천해줘", "오뭐먹"],
+    "요리키워드": ["파스타 요리 알려줘", "김치찌개 레시피 알려줘", "볶음밥 어떻게 만들어?", "떡볶이 만들고 싶어"],
+    "재료키워드": ["감자요리 뭐 있을까?", "면 요리 추천해줘", "김치로 만들 수 있는 요리 알려줘", "시금치 요리 뭐 있어?"],
+    "카테고리": ["한식 추천해줘", "오늘은 중식 먹고 싶어", "양식 요리 알려줘", "일식으로 뭐 먹지?"],
+    "챗봇정보": ["?", "너 뭐야?", "무슨 기능이 있어?", "어떻게 사용해?", "할 수 있는 게 뭐야?",
+               "뭐 해줄 수 있어?", "어떤 요리를 추천해줘?", "사용할 수 있는 명령어 알려줘", "이 챗봇은 뭔가요?"],
+    "예외": ["오늘 날씨 뭐야", "어슷썰기는 어떻게 하는거야?", "졸려", "음하하", "라면의 유래가 뭘까"],
+}
+
+CUISINE_WORDS = frozenset({
+    "한식", "중식", "일식", "양식", "분식", "태국음식", "베트남음식", "인도음식", "멕시코음식",
+    "이탈리안", "이탈리아음식", "프랑스음식", "중국음식", "일본음식", "한국음식", "서양음식",
+    "동남아음식", "퓨전음식", "아시안", "브런치", "디저트", "비건", "채식",
+})
+
+DISH_WORDS = frozenset({
+    "파스타", "김치찌개", "된장찌개", "순두부찌개", "부대찌개", "볶음밥", "김치볶음밥", "떡볶이",
+    "비빔밥", "불고기", "제육볶음", "닭갈비", "잡채", "김밥", "라면", "카레", "짜장면", "짬뽕",
+    "탕수육", "미역국", "된장국", "콩나물국", "계란국", "떡국", "만둣국", "삼계탕", "갈비찜",
+    "닭볶음탕", "감자탕", "김치전", "파전", "해물파전", "계란말이", "계란찜", "오므라이스",
+    "돈가스", "돈까스", "우동", "라멘", "초밥", "덮밥", "규동", "샐러드", "샌드위치", "스테이크",
+    "리조또", "피자", "햄버거", "토스트", "수제비", "칼국수", "냉면", "쫄면", "잔치국수",
+    "비빔국수", "떡갈비", "동그랑땡", "어묵볶음", "멸치볶음", "감자조림", "장조림", "두부조림",
+    "시금치나물", "콩나물무침", "오이무침", "알리오올리오", "까르보나라", "크림파스타",
+    "토마토파스타", "마파두부", "깐풍기", "유린기", "훠궈", "쌀국수", "팟타이", "오코노미야키",
+    "타코", "그라탕", "수육", "보쌈", "족발", "찜닭", "순대", "전골", "국밥",
+})
+
+# 위 목록에 없는 요리명도 흔한 접미어로 인식 (예: 참치김치찌개, 소고기덮밥)
+DISH_SUFFIX = re.compile(
+    r"[가-힣]+(찌개|볶음밥|덮밥|전골|볶음|조림|무침|구이|튀김|찜|탕|파스타|김밥|비빔밥|국수|샐러드|스튜)"
+)
+
+INGREDIENT_WORDS = frozenset({
+    "감자", "고구마", "양파", "대파", "파", "마늘", "당근", "애호박", "호박", "가지", "오이",
+    "배추", "양배추", "무", "시금치", "콩나물", "숙주", "버섯", "표고버섯", "팽이버섯", "두부",
+    "계란", "달걀", "김치", "면", "국수", "쌀", "밥", "떡", "어묵", "햄", "소시지", "참치",
+    "스팸", "베이컨", "돼지고기", "삼겹살", "목살", "소고기", "닭고기", "닭가슴살", "닭", "오리고기",
+    "고등어", "연어", "새우", "오징어", "조개", "바지락", "멸치", "미역", "김", "치즈", "우유",
+    "토마토", "브로콜리", "파프리카", "피망", "고추", "깻잎", "상추", "부추", "옥수수", "콩",
+    "단호박", "연근", "우엉", "무말랭이", "게맛살", "만두", "당면", "소면", "파스타면",
+})
+
+# 재료 중심 요청에 자주 붙는 표현
+INGREDIENT_MARKERS = ("요리", "로만들", "으로만들", "로할", "으로할", "넣은", "넣고", "들어간",
+                      "활용", "남았", "있는데", "처리", "로뭐", "으로뭐")
+
+# 요리명과 함께 있으면 레시피 요청으로 확정하는 표현
+RECIPE_INTENT_MARKERS = ("레시피", "만드는법", "만드는방법", "만들", "해먹", "요리해", "요리알려",
+                         "조리법", "끓이는법", "끓여", "볶는법", "굽는법")
+
+# 레시피 요청이 아닌 질문(유래, 영양, 맛집, 이유)이나 부정/제외 표현 → 로컬 분류를 믿지 않고 LLM 으로
+FALLBACK_MARKERS = ("유래", "역사", "어원", "뜻이", "의미", "칼로리", "열량", "영양", "단백질", "탄수화물",
+                    "맛집", "식당", "배달", "가게", "가격", "얼마", "왜", "말고", "빼고", "싫어", "대신",
+                    "보관", "유통기한", "상했", "먹어도돼", "먹어도되")
+
+GENERAL_PHRASES = ("뭐먹지", "뭐먹을까", "뭐먹어", "뭐해먹", "메뉴추천", "메뉴좀", "아무거나",
+                   "레시피추천", "요리추천", "오뭐먹", "배고파", "저녁추천", "점심추천",
+                   "아침추천", "야식추천", "저녁뭐", "점심뭐", "아침뭐", "야식뭐")
+
+BOT_PHRASES = ("너뭐야", "너는뭐야", "넌뭐야", "누구야", "무슨기능", "어떤기능", "기능이뭐",
+               "어떻게사용", "어떻게써", "사용법", "할수있는", "뭐해줄수", "뭘할수", "명령어",
+               "챗봇", "도움말")
+
+# 한 글자 재료(면, 파, 무, 김, 떡, 밥)는 부분 문자열로 찾으면 오탐이 많아 토큰 단위로만 인정
+_MULTI_CHAR_INGREDIENTS = frozenset(w for w in INGREDIENT_WORDS if len(w) > 1)
+
+_PUNCT = re.compile(r"[^\w?]+")
+
+
+def normalize_request(user_request: str) -> str:
+    """소문자화 + 구두점 제거 + 공백 정리"""
+    text = _PUNCT.sub(" ", user_request.lower())
+    return " ".join(text.split())
+
+
+def _bigrams(text: str) -> set[str]:
+    compact = text.replace(" ", "")
+    if len(compact) < 2:
+        return {compact} if compact else set()
+    return {compact[i:i + 2] for i in range(len(compact) - 1)}
+
+
+_EXAMPLE_NGRAMS = [
+    (label, normalize_request(example).replace(" ", ""), _bigrams(normalize_request(example)))
+    for label, examples in PROMPT_EXAMPLES.items()
+    for example in examples
+]
+
+
+def _longest_match(compact: str, words: frozenset) -> str | None:
+    found = [w for w in words if w in compact]
+    return max(found, key=len) if found else None
+
+
+def fast_classify(user_request: str) -> tuple[str | None, float]:
+    """
+    요청을 로컬에서 분류해 (라벨, 확신도)를 반환.
+    아무 신호도 없으면 (None, 0.0).
+    """
+    text = normalize_request(user_request)
+    compact = text.replace(" ", "")
+    tokens = text.split()
+
+    # 1) 물음표만 있거나 빈 입력 → 챗봇정보
+    if compact.strip("?") == "":
+        return "챗봇정보", 1.0
+
+    # 2) 프롬프트 예시와 완전히 같으면 그 라벨로 확정
+    key = compact.rstrip("?")
+    for label, ex_compact, _ in _EXAMPLE_NGRAMS:
+        if key == ex_compact.rstrip("?"):
+            return label, 1.0
+
+    # 3) 프롬프트 예시와의 bigram 유사도
+    scores = dict.fromkeys(LABELS, 0.0)
+    grams = _bigrams(text)
+    for label, _, ex_grams in _EXAMPLE_NGRAMS:
+        if grams and ex_grams:
+            sim = len(grams & ex_grams) / len(grams | ex_grams)
+            scores[label] = max(scores[label], sim)
+
+    # 4) 어휘 사전 매칭
+    cuisine = _longest_match(compact, CUISINE_WORDS)
+    dish = _longest_match(compact, DISH_WORDS)
+    if dish is None:
+        m = DISH_SUFFIX.search(compact)
+        dish = m.group(0) if m else None
+    # 요리명 안에 포함된 재료(김치찌개의 김치)는 재료 신호로 보지 않는다
+    rest = compact.replace(dish, " ") if dish else compact
+    ingredient = _longest_match(rest, _MULTI_CHAR_INGREDIENTS) or next(
+        (t for t in tokens if t.rstrip("로으") in INGREDIENT_WORDS), None
+    )
+
+    if cuisine:
+        scores["카테고리"] = max(scores["카테고리"], 0.95)
+    if dish:
+        # 요리명만으로는 임계값(기본 0.8) 아래 → 레시피 의도 표현이 있어야 확정
+        intent = any(m in compact for m in RECIPE_INTENT_MARKERS)
+        scores["요리키워드"] = max(scores["요리키워드"], 0.9 if intent else 0.7)
+    if ingredient:
+        marked = any(m in compact for m in INGREDIENT_MARKERS)
+        scores["재료키워드"] = max(scores["재료키워드"], 0.9 if marked else 0.7)
+    if any(p in compact for p in GENERAL_PHRASES):
+        scores["일반레시피"] = max(scores["일반레시피"], 0.9)
+    if any(p in compact for p in BOT_PHRASES):
+        scores["챗봇정보"] = max(scores["챗봇정보"], 0.9)
+
+    # 5) 더 구체적인 신호가 있으면 일반적인 신호는 낮춘다
+    #    (일식으로 뭐 먹지 → 카테고리, 김치 넣은 볶음밥 → 요리키워드)
+    if cuisine or dish:
+        scores["일반레시피"] = min(scores["일반레시피"], 0.6)
+    if dish and ingredient:
+        scores["재료키워드"] = min(scores["재료키워드"], 0.6)
+
+    ranked = sorted(scores.items(), key=lambda kv: kv[1], reverse=True)
+    (best, top), (_, second) = ranked[0], ranked[1]
+    if top == 0.0:
+        return None, 0.0
+    # 질문/부정 표현이 있으면 추정 라벨만 남기고(폴백 일치율 통계용) 확신도 0 → 항상 LLM
+    if any(m in compact for m in FALLBACK_MARKERS):
+        return best, 0.0
+    # 상위 두 라벨이 비슷하면 확신도를 절반으로
+    confidence = top if top - second >= 0.15 else top / 2
+    return best, confidence
+
+
+# ---------------------------------------------------------------------------
+# 적중률 / LLM 일치율 통계
+# ---------------------------------------------------------------------------
+_stats_lock = threading.Lock()
+_stats = {
+    "total": 0,             # 전체 분류 요청 수
+    "fast_hits": 0,         # 로컬 분류기로 바로 응답한 수
+    "memo_hits": 0,         # 분류 메모(이전 LLM 분류 결과)로 응답한 수
+    "llm_fallbacks": 0,     # 확신도가 낮아 LLM 으로 넘긴 수
+    "shadow_compared": 0,   # 로컬 응답 중 표본으로 LLM 과 비교한 수
+    "shadow_agreed": 0,
+    "fallback_compared": 0, # LLM 으로 넘긴 요청 중 로컬 추정이 있던 수
+    "fallback_agreed": 0,
+}
+
+
+def record_fast_hit():
+    with _stats_lock:
+        _stats["total"] += 1
+        _stats["fast_hits"] += 1
+
+
+def record_memo_hit():
+    with _stats_lock:
+        _stats["total"] += 1
+        _stats["memo_hits"] += 1
+
+
+def record_fallback():
+    with _stats_lock:
+        _stats["total"] += 1
+        _stats["llm_fallbacks"] += 1
+
+
+def record_comparison(local_label: str | None, llm_label: str, shadow: bool = False):
+    """로컬 라벨과 LLM 라벨 비교 결과 기록 (로컬 추정이 없으면 건너뜀)"""
+    if local_label is None:
+        return
+    prefix = "shadow" if shadow else "fallback"
+    with _stats_lock:
+        _stats[f"{prefix}_compared"] += 1
+        if local_label == llm_label:
+            _stats[f"{prefix}_agreed"] += 1
+
+
+def classifier_stats() -> dict:
+    with _stats_lock:
+        snapshot = dict(_stats)
+    total = snapshot["total"]
+    snapshot["hit_rate"] = snapshot["fast_hits"] / total if total else 0.0
+    # 로컬 분류기가 직접 응답한 경우의 LLM 일치율 (표본 기준)
+    snapshot["agreement_rate"] = (
+        snapshot["shadow_agreed"] / snapshot["shadow_compared"] if snapshot["shadow_compared"] else None
+    )
+    # 확신도가 낮았던 추정의 LLM 일치율 (임계값 조정용)
+    snapshot["fallback_agreement_rate"] = (
+        snapshot["fallback_agreed"] / snapshot["fallback_compared"] if snapshot["fallback_compared"] else None
+    )
+    return snapshot
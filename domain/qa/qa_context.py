@@ -0,0 +1,85 @@
+import logging
+from datetime import date
+from functools import lru_cache
+
+import tiktoken
+
+from config import QA_INGREDIENT_TOKEN_BUDGET
+from models import Item
+
+# QA 프롬프트에 넣을 재료 목록 생성기
+# 1) 이름 정규화 + 중복 제거 (중복이면 유통기한이 가장 가까운 것을 남김)
+# 2) 유통기한이 가까운 순 + 카테고리 다양성 순으로 정렬
+#    (각 카테고리의 1순위 재료들 → 2순위 재료들 → … 순서로 섞음)
+# 3) tiktoken 으로 센 토큰 수가 예산을 넘기 전까지만 포함
+# 재고가 아무리 많아도 프롬프트 크기가 일정하게 유지된다.
+
+SEPARATOR = ", "
+
+logger = logging.getLogger(__name__)
+
+
+@lru_cache(maxsize=1)
+def _encoding():
+    # gpt-4.1 계열은 o200k_base 인코딩 사용
+    try:
+        return tiktoken.get_encoding("o200k_base")
+    except Exception as e:
+        # 인코딩 파일을 받을 수 없는 환경 → 글자 수로 보수적으로 추정
+        logger.warning(f"tiktoken 인코딩 로드 실패, 글자 수로 토큰 추정: {e}")
+        return None
+
+
+def count_tokens(text: str) -> int:
+    enc = _encoding()
+    if enc is None:
+        return len(text)
+    return len(enc.encode(text))
+
+
+def normalize_name(name: str) -> str:
+    return " ".join(name.split())
+
+
+def _rank_items(items: list[Item]) -> list[Item]:
+    # 이름 기준 중복 제거
+    unique: dict[str, Item] = {}
+    for item in items:
+        name = normalize_name(item.item_name or "")
+        if not name:
+            continue
+        key = name.lower()
+        kept = unique.get(key)
+        if kept is None or (item.expiry_date or date.max) < (kept.expiry_date or date.max):
+            unique[key] = item
+
+    # 카테고리별로 유통기한 순 정렬 후, 카테고리 안에서의 순위를 1차 기준으로 사용
+    by_category: dict[int, list[Item]] = {}
+    for item in unique.values():
+        by_category.setdefault(item.category_id, []).append(item)
+
+    ranked = []
+    for group in by_category.values():
+        group.sort(key=lambda it: it.expiry_date or date.max)
+        for rank, item in enumerate(group):
+            ranked.append((rank, item.expiry_date or date.max, item))
+    ranked.sort(key=lambda r: (r[0], r[1]))
+    return [item for _, _, item in ranked]
+
+
+def build_ingredient_context(items: list[Item], token_budget: int = QA_INGREDIENT_TOKEN_BUDGET) -> str:
+    """
+    재고 아이템 목록 → 토큰 예산 안에 들어가는 ", " 구분 재료 문자열
+    재료가 하나도 없으면 빈 문자열
+    """
+    names: list[str] = []
+    used = 0
+    sep_tokens = count_tokens(SEPARATOR)
+    for item in _rank_items(items):
+        name = normalize_name(item.item_name)
+        cost = count_tokens(name) + (sep_tokens if names else 0)
+        if used + cost > token_budget:
+            break
+        names.append(name)
+        used += cost
+    return SEPARATOR.join(names)
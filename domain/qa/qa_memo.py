@@ -0,0 +1,131 @@
+import logging
+import threading
+from datetime import datetime, timezone
+
+from cachetools import LRUCache
+from sqlalchemy import select, delete
+from sqlalchemy.dialects.postgresql import insert
+from starlette.concurrency import run_in_threadpool
+
+from config import QA_CLASSIFICATION_MEMO_HOT_SIZE, QA_CLASSIFICATION_MEMO_MAX_ROWS
+from database import SessionLocal
+from domain.qa.qa_classifier import LABELS, normalize_request
+from models import ClassificationMemo
+
+# 요청 문장 분류 결과 메모
+# - 1단계: 프로세스 내 LRU (hot layer)
+# - 2단계: classification_memo 테이블 (모든 uvicorn 워커가 공유)
+# 같은 문장은 배포 전체에서 한 번만 LLM 으로 분류된다.
+# 테이블은 QA_CLASSIFICATION_MEMO_MAX_ROWS 를 넘으면 가장 오래 쓰이지 않은 행부터 삭제.
+
+logger = logging.getLogger(__name__)
+
+MAX_KEY_LENGTH = 100
+PRUNE_EVERY = 100  # 이 횟수만큼 저장할 때마다 테이블 크기 정리
+
+_lock = threading.Lock()
+_hot = LRUCache(maxsize=QA_CLASSIFICATION_MEMO_HOT_SIZE)
+_writes = 0
+
+
+def _memo_key(user_request: str) -> str | None:
+    key = normalize_request(user_request)
+    # 긴 문장은 재사용될 일이 거의 없으므로 메모하지 않음
+    if not key or len(key) > MAX_KEY_LENGTH:
+        return None
+    return key
+
+
+def _load_label(key: str) -> str | None:
+    db = SessionLocal()
+    try:
+        memo = db.execute(
+            select(ClassificationMemo).where(ClassificationMemo.request_key == key)
+        ).scalar_one_or_none()
+        if memo is None:
+            return None
+        memo.hit_count += 1
+        memo.last_used_at = datetime.now(timezone.utc)
+        db.commit()
+        return memo.label
+    finally:
+        db.close()
+
+
+def _save_label(key: str, label: str):
+    global _writes
+    db = SessionLocal()
+    try:
+        now = datetime.now(timezone.utc)
+        stmt = insert(ClassificationMemo).values(
+            request_key=key, label=label, hit_count=0, last_used_at=now
+        ).on_conflict_do_update(
+            index_elements=[ClassificationMemo.request_key],
+            set_={"label": label, "last_used_at": now},
+        )
+        db.execute(stmt)
+
+        with _lock:
+            _writes += 1
+            prune = _writes % PRUNE_EVERY == 0
+        if prune:
+            # 최근 사용 순 상위 N개를 제외한 나머지 삭제
+            keep = (
+                select(ClassificationMemo.request_key)
+                .order_by(ClassificationMemo.last_used_at.desc())
+                .limit(QA_CLASSIFICATION_MEMO_MAX_ROWS)
+            )
+            db.execute(
+                delete(ClassificationMemo).where(ClassificationMemo.request_key.not_in(keep))
+            )
+        db.commit()
+    finally:
+        db.close()
+
+
+def get_memo_label(user_request: str) -> str | None:
+    key = _memo_key(user_request)
+    if key is None:
+        return None
+    with _lock:
+        label = _hot.get(key)
+    if label is not None:
+        return label
+    try:
+        label = _load_label(key)
+    except Exception as e:
+        # 메모 저장소 장애는 분류 자체를 막지 않는다
+        logger.warning(f"classification memo 조회 실패: {e}")
+        return None
+    if label is not None:
+        with _lock:
+            _hot[key] = label
+    return label
+
+
+def save_memo_label(user_request: str, label: str):
+    key = _memo_key(user_request)
+    if key is None or label not in LABELS:
+        return
+    with _lock:
+        _hot[key] = label
+    try:
+        _save_label(key, label)
+    except Exception as e:
+        logger.warning(f"classification memo 저장 실패: {e}")
+
+
+async def aget_memo_label(user_request: str) -> str | None:
+    key = _memo_key(user_request)
+    if key is None:
+        return None
+    # hot layer 적중이면 스레드풀을 거치지 않음
+    with _lock:
+        label = _hot.get(key)
+    if label is not None:
+        return label
+    return await run_in_threadpool(get_memo_label, user_request)
+
+
+async def asave_memo_label(user_request: str, label: str):
+    await run_in_threadpool(save_memo_label, user_request, label)
@@ -0,0 +1,254 @@
+import json
+import re
+import threading
+from pathlib import Path
+
+from config import QA_RECIPE_INDEX_MIN_COVERAGE
+
+# 로컬 레시피 인덱스
+# 자주 쓰이는 가정식 레시피(recipes.json)를 주재료 → 레시피 역색인으로 들고 있다가
+# 사용자의 재고가 주재료를 얼마나 채우는지(coverage)로 점수를 매겨 바로 답한다.
+# 알맞은 레시피가 없을 때만 LLM 생성기로 넘어간다.
+# recipes.json 은 자주 나오는 가정식 59개로 시작한 시드이고, 코드 수정 없이 항목을 늘리면 된다.
+# 재료는 정규화한 이름이 같을 때만 맞는 것으로 본다 (부분 문자열 X: 양배추 ≠ 배추, 고추장 ≠ 고추).
+
+RECIPES: list[dict] = json.loads(
+    Path(__file__).with_name("recipes.json").read_text(encoding="utf-8")
+)
+
+# 같은 재료의 다른 이름 (서로 바꿔 써도 되는 것끼리 한 묶음)
+VARIANTS = [
+    {"달걀", "계란"},
+    {"참치", "참치캔"},
+    {"미역", "건미역"},
+    {"카레", "카레가루"},
+    {"치즈", "슬라이스 치즈"},
+    {"스파게티 면", "스파게티", "파스타면"},
+    {"소면", "국수"},
+    {"대파", "파"},
+    {"마늘", "다진 마늘", "깐마늘"},
+    {"소고기", "쇠고기"},
+    {"어묵", "오뎅"},
+]
+
+# 구체적인 재고 이름 → 레시피에서 쓰는 일반 이름 (한 방향: 두부가 있다고 찌개두부가 있는 건 아님)
+ALIASES = {
+    "찌개두부": ["두부"],
+    "부침두부": ["두부"],
+    "삼겹살": ["돼지고기"],
+    "목살": ["돼지고기"],
+    "앞다리살": ["돼지고기"],
+    "대패삼겹살": ["돼지고기", "삼겹살"],
+    "다진 돼지고기": ["돼지고기"],
+    "불고기감": ["소고기"],
+    "국거리 소고기": ["소고기"],
+    "다진 소고기": ["소고기"],
+    "닭가슴살": ["닭고기"],
+    "닭다리": ["닭고기"],
+    "닭봉": ["닭고기"],
+    "생닭": ["닭고기"],
+    "떡볶이떡": ["떡"],
+    "떡국떡": ["떡"],
+    "쪽파": ["대파"],
+    "표고버섯": ["버섯"],
+    "새송이버섯": ["버섯"],
+    "느타리버섯": ["버섯"],
+    "팽이버섯": ["버섯"],
+    "양송이버섯": ["버섯"],
+    "비엔나소시지": ["소시지"],
+    "스팸": ["햄"],
+    "즉석밥": ["밥"],
+    "햇반": ["밥"],
+    "배추김치": ["김치"],
+    "포기김치": ["김치"],
+    "묵은지": ["김치"],
+    "손질 오징어": ["오징어"],
+    "칵테일새우": ["새우"],
+    "냉동새우": ["새우"],
+    "저지방우유": ["우유"],
+    # 영수증 추출 규칙(오이고추 → 고추)과 같은 방향. 오이 / 고추장은 다른 재료
+    "오이고추": ["고추"],
+    "청양고추": ["고추"],
+    "풋고추": ["고추"],
+}
+
+# 재료 키워드 요청에 이런 조건이 붙으면 인덱스(가정식 반찬/국/한 그릇 요리)로는 맞출 수 없으므로 LLM 으로
+CONSTRAINT_WORDS = (
+    "디저트", "간식", "베이킹", "케이크", "쿠키", "빵", "브런치", "샐러드", "스프", "수프",
+    "양식", "중식", "일식", "이탈리안", "멕시칸", "태국",
+    "다이어트", "저칼로리", "저탄수", "키토", "비건", "채식",
+    "안주", "야식", "도시락", "이유식", "아이",
+    "매운", "맵게", "안매운", "맵지않", "손님", "파티",
+    "에어프라이어", "오븐", "전자레인지",
+    "말고", "빼고", "없이", "제외",
+)
+_TIME_LIMIT = re.compile(r"\d+분")
+
+
+def _key(name: str) -> str:
+    """비교용 이름: 공백을 모두 없앰 (다진마늘 = 다진 마늘)"""
+    return "".join(name.split())
+
+
+_VARIANT_OF = {_key(n): {_key(v) for v in group} for group in VARIANTS for n in group}
+_ALIAS_OF = {_key(n): [_key(t) for t in targets] for n, targets in ALIASES.items()}
+
+
+def _variants(name: str) -> set[str]:
+    """레시피 쪽 이름: 자기 자신 + 다른 이름 (레시피의 삼겹살은 돼지고기 아무거나로 대신할 수 없음)"""
+    return _VARIANT_OF.get(_key(name), {_key(name)})
+
+
+def _expand(name: str) -> set[str]:
+    """이름 하나가 뜻하는 (비교용) 이름들: 자기 자신 + 다른 이름 + 일반 이름"""
+    names = {_key(name)}
+    for alias in _ALIAS_OF.get(_key(name), []):
+        names.add(alias)
+    for n in list(names):
+        names |= _VARIANT_OF.get(n, set())
+    return names
+
+
+# 주재료 → 레시피 번호 목록 (비교용 이름 기준)
+INDEX: dict[str, list[int]] = {}
+for _idx, _recipe in enumerate(RECIPES):
+    for _name in _recipe["main"]:
+        INDEX.setdefault(_key(_name), []).append(_idx)
+
+# 요청 문장에서 찾을 재료 이름 (인덱스 주재료 + 다른 이름 + 구체적인 이름)
+_KEYWORDS = sorted(
+    {k for k in INDEX} | set(_VARIANT_OF) | set(_ALIAS_OF),
+    key=len, reverse=True,
+)
+
+_stats_lock = threading.Lock()
+_stats = {"hits": 0, "misses": 0}
+
+
+def _owned_names(user_ingredients: str) -> set[str]:
+    owned = set()
+    for raw in user_ingredients.split(","):
+        if raw.strip():
+            owned |= _expand(raw)
+    return owned
+
+
+def _has(owned: set[str], name: str) -> bool:
+    """재료 보유 여부: 정규화한 이름이 같을 때만 (다른 이름/구체적인 이름은 _owned_names 에서 펼쳐 둠)"""
+    return bool(_variants(name) & owned)
+
+
+def _request_terms(user_request: str) -> tuple[list[tuple[str, set[str]]], str]:
+    """
+    요청 문장에서 재료 이름을 긴 것부터 찾음 (겹치는 짧은 이름은 무시: 오이고추 안의 오이).
+    ([(재료 이름, 그 재료가 뜻하는 이름 집합)], 재료 이름을 지운 나머지 문장) 반환
+    """
+    rest = _key(user_request)
+    terms = []
+    for keyword in _KEYWORDS:
+        if keyword in rest:
+            terms.append((keyword, _expand(keyword)))
+            rest = rest.replace(keyword, " ")
+    return terms, rest
+
+
+def _score(recipe: dict, owned: set[str]) -> tuple[float, float]:
+    main = recipe["main"]
+    main_cov = sum(_has(owned, n) for n in main) / len(main)
+    names = [n for n, _ in recipe["ingredients"]]
+    all_cov = sum(_has(owned, n) for n in names) / len(names)
+    return main_cov, all_cov
+
+
+def format_recipe(recipe: dict, owned: set[str] | None = None) -> str:
+    """프롬프트가 요구하는 🍲/📋/👨‍🍳(/🛒) 형식. owned 를 주면 부족한 재료도 표기"""
+    lines = [
+        f"🍲 {recipe['name']}",
+        "📋 필요한 재료: " + ", ".join(f"{n} {amount}" for n, amount in recipe["ingredients"]),
+        "👨‍🍳 요리 방법:",
+    ]
+    lines += [f"{i}. {step}" for i, step in enumerate(recipe["steps"], start=1)]
+    if owned is not None:
+        missing = [n for n, _ in recipe["ingredients"] if n != "물" and not _has(owned, n)]
+        lines.append("🛒 추가로 필요한 재료: " + (", ".join(missing) if missing else "없음"))
+    return "\n".join(lines)
+
+
+def _record(hit: bool):
+    with _stats_lock:
+        _stats["hits" if hit else "misses"] += 1
+
+
+def recommend_by_inventory(user_ingredients: str) -> str | None:
+    """
+    recipe_by_inventory 의 로컬 버전.
+    재고만으로 주재료를 모두 채우는 레시피를 고르고, 프롬프트의 출력 규칙
+    (10개 이하: 안내 문구 + 1~3개 / 그 이상: 반드시 3개)을 만족할 수 없으면 None.
+    """
+    owned = _owned_names(user_ingredients)
+    candidates = {idx for key, idxs in INDEX.items() if _has(owned, key) for idx in idxs}
+    scored = []
+    for idx in candidates:
+        main_cov, all_cov = _score(RECIPES[idx], owned)
+        if main_cov >= QA_RECIPE_INDEX_MIN_COVERAGE:
+            scored.append((main_cov, all_cov, idx))
+    scored.sort(key=lambda s: (s[0], s[1]), reverse=True)
+
+    few = sum(1 for raw in user_ingredients.split(",") if raw.strip()) <= 10
+    picked = [RECIPES[idx] for _, _, idx in scored[:3]]
+    if not picked or (not few and len(picked) < 3):
+        _record(False)
+        return None
+
+    _record(True)
+    body = "\n\n".join(format_recipe(r) for r in picked)
+    if few:
+        return "재료가 적어서 간단한 요리만 가능합니다.\n\n" + body
+    return body
+
+
+def recommend_by_keyword(user_ingredients: str, user_request: str) -> str | None:
+    """
+    keword_recipe 의 로컬 버전.
+    요청에 들어있는 재료를 모두 쓰는 레시피를 재고 보유율 순으로 1~3개.
+    재료를 인덱스에서 찾지 못하거나, 요리 종류/조건(디저트, 양식, 다이어트 등)이 붙어 있으면 None.
+    """
+    terms, rest = _request_terms(user_request)
+    if not terms or any(word in rest for word in CONSTRAINT_WORDS) or _TIME_LIMIT.search(rest):
+        _record(False)
+        return None
+
+    def uses_all(recipe: dict) -> bool:
+        names = set()
+        for n in recipe["main"] + [n for n, _ in recipe["ingredients"]]:
+            names |= _variants(n)
+        return all(term & names for _, term in terms)
+
+    def exact_main(recipe: dict) -> int:
+        # 요청한 이름 그대로를 주재료로 쓰는 레시피 우선 (삼겹살 → 삼겹살 구이 > 김치찌개)
+        main = {_key(n) for n in recipe["main"]}
+        return sum(keyword in main or bool(_variants(keyword) & main) for keyword, _ in terms)
+
+    candidates = {idx for _, term in terms for key in term & INDEX.keys() for idx in INDEX[key]}
+    matched = [idx for idx in candidates if uses_all(RECIPES[idx])]
+    if not matched:
+        _record(False)
+        return None
+
+    owned = _owned_names(user_ingredients)
+    ranked = sorted(
+        matched,
+        key=lambda idx: (exact_main(RECIPES[idx]), _score(RECIPES[idx], owned), -idx),
+        reverse=True,
+    )
+    _record(True)
+    return "\n\n".join(format_recipe(RECIPES[idx], owned) for idx in ranked[:3])
+
+
+def recipe_index_stats() -> dict:
+    with _stats_lock:
+        snapshot = dict(_stats)
+    total = snapshot["hits"] + snapshot["misses"]
+    snapshot["recipes"] = len(RECIPES)
+    snapshot["hit_rate"] = snapshot["hits"] / total if total else 0.0
+    return snapshot
@@ -1,6 +1,12 @@
 from fastapi import APIRouter, Depends, Query, Path
 from sqlalchemy.orm import Session
-from domain.qa.qa_service import recommend_recipes_from_fridge
+from sse_starlette.sse import EventSourceResponse
+from domain.qa.qa_service import (
+    arecommend_recipes_from_fridge, aget_ingredient_text, astream_recipes_from_fridge
+)
+from domain.qa.qa_classifier import classifier_stats
+from domain.qa.qa_cache import cache_stats, current_generation
+from domain.qa.qa_recipes import recipe_index_stats
 from database import get_db
 from auth import get_current_user
 from domain.user.user_schema import UserResponse  # 현재 로그인한 사용자 스키마
@@ -11,7 +17,7 @@ router = APIRouter(
 )
 
 @router.get("/{user_id}/recommend-recipes")
-def recommend_recipes(
+async def recommend_recipes(
     user_id : int= Path(..., description="요청할 사용자의 ID"),
     user_request: str = Query(..., description="예: 맵지 않은 요리, 간단한 도시락, 아이가 좋아할만한 반찬 등"),
     db: Session = Depends(get_db),
@@ -19,6 +25,7 @@ def recommend_recipes(
 ):
     """
     사용자의 냉장고 재료와 요청에 기반해 레시피 추천
+    (LLM 호출은 비동기로 대기하므로 스레드풀 워커를 점유하지 않음)
     """
 
     # 🔐 보안 체크 (선택 사항): 경로의 user_id가 로그인 사용자와 일치하는지 확인
@@ -26,10 +33,59 @@ def recommend_recipes(
         return {"error": "권한이 없습니다."}
     
 
-    result = recommend_recipes_from_fridge(
+    result = await arecommend_recipes_from_fridge(
         db=db,
         user_id=user_id,
         user_request=user_request
     )
     # result = recommend_recipes_from_fridge(db, current_user.user_id, user_request)
     return {"result": result}
+
+
+@router.get("/{user_id}/recommend-recipes/stream")
+async def recommend_recipes_stream(
+    user_id : int= Path(..., description="요청할 사용자의 ID"),
+    user_request: str = Query(..., description="예: 맵지 않은 요리, 간단한 도시락, 아이가 좋아할만한 반찬 등"),
+    db: Session = Depends(get_db),
+    current_user: UserResponse = Depends(get_current_user)
+):
+    """
+    레시피 추천 스트리밍 (Server-Sent Events)
+    - event: category → 분류 결과
+    - event: token    → 생성되는 답변 조각
+    - event: done     → 종료
+    """
+    if user_id != current_user.user_id:
+        return {"error": "권한이 없습니다."}
+
+    # 재고 조회는 스트리밍 시작 전에 끝낸다 (응답 전송 중에는 세션이 닫힘)
+    # 캐시 세대는 재고 조회 전에 잡아 둔다
+    generation = current_generation(user_id)
+    ingredient_text = await aget_ingredient_text(db, user_id)
+    return EventSourceResponse(
+        astream_recipes_from_fridge(ingredient_text, user_id, user_request, generation)
+    )
+
+
+@router.get("/classifier-stats")
+def read_classifier_stats():
+    """
+    로컬 빠른 분류기 적중률 및 LLM 일치율
+    """
+    return classifier_stats()
+
+
+@router.get("/cache-stats")
+def read_cache_stats():
+    """
+    레시피 추천 응답 캐시 적중/미스 통계
+    """
+    return cache_stats()
+
+
+@router.get("/recipe-index-stats")
+def read_recipe_index_stats():
+    """
+    로컬 레시피 인덱스 적중률 (LLM 생성 생략 비율)
+    """
+    return recipe_index_stats()
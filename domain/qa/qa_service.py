@@ -1,20 +1,60 @@
 from sqlalchemy.orm import Session
+from starlette.concurrency import run_in_threadpool
 from domain.item.item_crud import get_items_by_user
-from domain.qa.qa_chain import route_request
+from domain.qa.qa_chain import route_request, aroute_request, astream_route_request
+from domain.qa.qa_context import build_ingredient_context
+from domain.qa.qa_cache import current_generation
+
+NO_INGREDIENTS_MESSAGE = "냉장고에 재료가 없습니다. 재료를 먼저 등록해주세요."
 
 # # 체인 초기화
 # recipe_chain = get_recipe_chain()
 
 def recommend_recipes_from_fridge(db: Session, user_id: int, user_request: str) -> str:
+    # 캐시 세대는 재고를 읽기 전에 (읽은 뒤 바뀌면 이 응답은 캐시에 저장되지 않음)
+    generation = current_generation(user_id)
     # 사용자 냉장고 아이템 조회
     user_items = get_items_by_user(db, user_id)
-    ingredients = [item.item_name for item in user_items]
-
-    if not ingredients:
-        return "냉장고에 재료가 없습니다. 재료를 먼저 등록해주세요."
 
-    # 재료 텍스트로 변환
-    ingredient_text = ", ".join(ingredients)
+    # 재료 텍스트로 변환 (중복 제거 + 유통기한 임박 순 + 토큰 예산 제한)
+    ingredient_text = build_ingredient_context(user_items)
+    if not ingredient_text:
+        return NO_INGREDIENTS_MESSAGE
 
-    result = route_request(user_request=user_request, user_ingredients=ingredient_text)
+    result = route_request(
+        user_request=user_request, user_ingredients=ingredient_text, user_id=user_id, generation=generation
+    )
     return result  # AIMessage 객체 → content 문자열 추출
+
+async def aget_ingredient_text(db: Session, user_id: int) -> str | None:
+    # DB 조회는 동기 세션이므로 스레드풀에서 짧게 실행
+    user_items = await run_in_threadpool(get_items_by_user, db, user_id)
+    ingredient_text = build_ingredient_context(user_items)
+    return ingredient_text or None
+
+async def arecommend_recipes_from_fridge(db: Session, user_id: int, user_request: str) -> str:
+    generation = current_generation(user_id)
+    ingredient_text = await aget_ingredient_text(db, user_id)
+    if ingredient_text is None:
+        return NO_INGREDIENTS_MESSAGE
+
+    # LLM 호출은 ainvoke로 대기 → 이벤트 루프에서 동시에 수백 건 처리 가능
+    return await aroute_request(
+        user_request=user_request, user_ingredients=ingredient_text, user_id=user_id, generation=generation
+    )
+
+async def astream_recipes_from_fridge(
+    ingredient_text: str | None, user_id: int, user_request: str, generation: int | None = None
+):
+    """
+    SSE 스트리밍용 이벤트 생성기.
+    재고 조회는 호출 측(라우터)에서 응답 전에 끝내고 재료 텍스트만 넘긴다.
+    (StreamingResponse 전송 중에는 get_db 세션이 이미 닫혀 있음)
+    generation 은 재고 조회 전에 잡아 둔 캐시 세대.
+    """
+    if ingredient_text is None:
+        yield {"event": "token", "data": NO_INGREDIENTS_MESSAGE}
+    else:
+        async for event, data in astream_route_request(user_request, ingredient_text, user_id, generation):
+            yield {"event": event, "data": data}
+    yield {"event": "done", "data": ""}
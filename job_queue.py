@@ -0,0 +1,207 @@
+import asyncio
+import json
+import logging
+import time
+import uuid
+
+from fastapi import APIRouter, HTTPException
+from sse_starlette.sse import EventSourceResponse
+
+from config import JOB_WORKERS, JOB_MAX_QUEUE, JOB_TTL_SECONDS
+
+# 백그라운드 작업 큐 (외부 브로커 없이 프로세스 내 asyncio 워커)
+# - submit() 은 작업 id 를 바로 돌려주고, JOB_WORKERS 개의 워커가 순서대로 실행
+# - 클라이언트는 GET /jobs/{id} 로 폴링하거나 GET /jobs/{id}/stream (SSE) 으로 완료를 구독
+# - 끝난 작업은 JOB_TTL_SECONDS 뒤 정리
+# - 대기열 길이 / 대기 시간 / 처리 시간 지표
+# 상태는 프로세스 메모리에 있으므로 워커가 여럿이면 같은 워커로 폴링해야 한다 (sticky session).
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/jobs")
+
+CLEANUP_INTERVAL = 30  # 초
+
+
+class Job:
+    def __init__(self, kind: str, factory, cleanup=None):
+        self.id = uuid.uuid4().hex
+        self.kind = kind
+        self.factory = factory
+        self.cleanup = cleanup
+        self.status = "queued"
+        self.result = None
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+        self.done = asyncio.Event()
+
+    def to_dict(self) -> dict:
+        return {
+            "job_id": self.id,
+            "kind": self.kind,
+            "status": self.status,
+            "result": self.result,
+            "error": self.error,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+        }
+
+
+class _KindStats:
+    def __init__(self):
+        self.submitted = 0
+        self.succeeded = 0
+        self.failed = 0
+        self.queue_time_total = 0.0
+        self.queue_time_max = 0.0
+        self.processing_time_total = 0.0
+        self.processing_time_max = 0.0
+
+
+_jobs: dict[str, Job] = {}
+_queue: asyncio.Queue | None = None
+_workers: list[asyncio.Task] = []
+_stats: dict[str, _KindStats] = {}
+_counters = {"rejected": 0, "expired": 0}
+
+
+def start_workers():
+    """워커/정리 태스크 시작 (이미 시작했으면 무시)"""
+    global _queue
+    if _workers:
+        return
+    _queue = asyncio.Queue(maxsize=JOB_MAX_QUEUE)
+    _workers.extend(asyncio.create_task(_worker()) for _ in range(JOB_WORKERS))
+    _workers.append(asyncio.create_task(_cleanup_loop()))
+
+
+async def stop_workers():
+    for task in _workers:
+        task.cancel()
+    await asyncio.gather(*_workers, return_exceptions=True)
+    _workers.clear()
+
+
+def submit(kind: str, factory, cleanup=None) -> Job:
+    """
+    factory() 가 만드는 코루틴을 백그라운드에서 실행할 작업으로 등록.
+    cleanup() 은 작업이 끝나면(성공/실패 모두) 호출 — 임시 파일 정리 등.
+    대기열이 가득 차면 503.
+    """
+    start_workers()
+    job = Job(kind, factory, cleanup)
+    try:
+        _queue.put_nowait(job)
+    except asyncio.QueueFull:
+        _counters["rejected"] += 1
+        if cleanup:
+            cleanup()
+        raise HTTPException(status_code=503, detail="처리 대기 중인 작업이 많아 잠시 후 다시 시도해주세요.")
+    # put_nowait 와 아래 사이에는 await 가 없으므로 워커가 먼저 꺼내 갈 수 없다
+    _jobs[job.id] = job
+    _stats.setdefault(kind, _KindStats()).submitted += 1
+    return job
+
+
+async def _worker():
+    while True:
+        job = await _queue.get()
+        stats = _stats[job.kind]
+        job.status = "running"
+        job.started_at = time.time()
+        queued = job.started_at - job.created_at
+        stats.queue_time_total += queued
+        stats.queue_time_max = max(stats.queue_time_max, queued)
+        try:
+            job.result = await job.factory()
+            job.status = "succeeded"
+            stats.succeeded += 1
+        except Exception as e:
+            job.error = e.detail if isinstance(e, HTTPException) else str(e)
+            job.status = "failed"
+            stats.failed += 1
+            logger.warning(f"작업 실패 {job.kind} {job.id}: {job.error}")
+        finally:
+            job.finished_at = time.time()
+            processed = job.finished_at - job.started_at
+            stats.processing_time_total += processed
+            stats.processing_time_max = max(stats.processing_time_max, processed)
+            job.factory = None
+            if job.cleanup:
+                job.cleanup()
+                job.cleanup = None
+            job.done.set()
+            _queue.task_done()
+
+
+async def _cleanup_loop():
+    while True:
+        await asyncio.sleep(CLEANUP_INTERVAL)
+        expire_jobs()
+
+
+def expire_jobs():
+    """끝난 지 JOB_TTL_SECONDS 가 지난 작업 삭제"""
+    deadline = time.time() - JOB_TTL_SECONDS
+    expired = [jid for jid, job in _jobs.items() if job.finished_at and job.finished_at < deadline]
+    for jid in expired:
+        del _jobs[jid]
+    _counters["expired"] += len(expired)
+
+
+def get_job(job_id: str) -> Job:
+    job = _jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="작업을 찾을 수 없습니다. (만료되었거나 없는 작업)")
+    return job
+
+
+def job_metrics() -> dict:
+    kinds = {}
+    for kind, s in _stats.items():
+        finished = s.succeeded + s.failed
+        kinds[kind] = {
+            "submitted": s.submitted,
+            "succeeded": s.succeeded,
+            "failed": s.failed,
+            "queue_time_avg": s.queue_time_total / finished if finished else 0.0,
+            "queue_time_max": s.queue_time_max,
+            "processing_time_avg": s.processing_time_total / finished if finished else 0.0,
+            "processing_time_max": s.processing_time_max,
+        }
+    statuses = [job.status for job in _jobs.values()]
+    return {
+        "workers": JOB_WORKERS,
+        "queue_depth": _queue.qsize() if _queue else 0,
+        "running": statuses.count("running"),
+        "stored_jobs": len(statuses),
+        "rejected": _counters["rejected"],
+        "expired": _counters["expired"],
+        "kinds": kinds,
+    }
+
+
+@router.get("/metrics")
+def read_job_metrics():
+    return job_metrics()
+
+
+@router.get("/{job_id}")
+def read_job(job_id: str):
+    return get_job(job_id).to_dict()
+
+
+@router.get("/{job_id}/stream")
+async def stream_job(job_id: str):
+    """작업 상태를 SSE 로 전달: 현재 상태 한 번 → 끝나면 최종 결과 후 종료"""
+    job = get_job(job_id)
+
+    async def events():
+        yield {"event": "status", "data": job.status}
+        await job.done.wait()
+        yield {"event": job.status, "data": json.dumps(job.to_dict(), ensure_ascii=False)}
+
+    return EventSourceResponse(events())
@@ -0,0 +1,213 @@
+import asyncio
+import json
+import random
+import re
+import time
+from functools import lru_cache
+from types import SimpleNamespace
+
+import openai
+from langchain_core.language_models.chat_models import BaseChatModel
+from langchain_core.messages import AIMessage, AIMessageChunk
+from langchain_core.outputs import ChatGeneration, ChatGenerationChunk, ChatResult
+from langchain_core.utils.function_calling import convert_to_openai_tool
+from langchain_openai import ChatOpenAI
+
+from config import (
+    OPENAI_API_KEY, LLM_BACKEND, FAKE_LLM_LATENCY_MS, FAKE_LLM_JITTER_MS, FAKE_LLM_MS_PER_OUTPUT_TOKEN,
+    FAKE_LLM_INVALID_RATE
+)
+
+# LLM 백엔드 선택
+# - "openai": 실제 OpenAI (기본값)
+# - "fake"  : 로컬 가짜 백엔드. 설정한 지연시간(+지터) 후 형식에 맞는 고정 응답을 돌려줌
+#             → OpenAI 호출 없이 QA / OCR 경로의 처리량을 측정할 수 있다.
+
+
+def get_chat_model(model: str, temperature: float) -> BaseChatModel:
+    """QA 체인에서 쓰는 langchain 채팅 모델"""
+    if LLM_BACKEND == "fake":
+        return FakeChatModel(model=model)
+    return ChatOpenAI(
+        temperature=temperature,
+        openai_api_key=OPENAI_API_KEY,
+        model_name=model
+    )
+
+
+@lru_cache(maxsize=1)
+def get_openai_client():
+    """OCR 에서 쓰는 비동기 chat.completions 클라이언트 (첫 호출 때 한 번만 생성)"""
+    if LLM_BACKEND == "fake":
+        return FakeOpenAIClient()
+    return openai.AsyncOpenAI(api_key=OPENAI_API_KEY)
+
+
+# ---------------------------------------------------------------------------
+# 가짜 응답 생성
+# ---------------------------------------------------------------------------
+def _delay_seconds(output: str = "") -> float:
+    """고정 지연 ± 지터 + 출력 길이에 비례하는 생성 시간 (토큰 ≈ 2글자로 추정)"""
+    jitter = random.uniform(-FAKE_LLM_JITTER_MS, FAKE_LLM_JITTER_MS)
+    generation = len(output) / 2 * FAKE_LLM_MS_PER_OUTPUT_TOKEN
+    return max(0.0, FAKE_LLM_LATENCY_MS + jitter + generation) / 1000
+
+
+FAKE_RECIPE = """🍲 감자볶음
+📋 필요한 재료: 감자 2개, 양파 1/2개, 식용유 1큰술, 소금 약간
+👨‍🍳 요리 방법:
+1. 감자와 양파를 얇게 채 썹니다.
+2. 팬에 식용유를 두르고 감자를 중불에서 볶습니다.
+3. 양파를 넣고 소금으로 간을 맞춥니다."""
+
+FAKE_OTHER = "저는 [뭐먹을냉?] 입니다. 요리나 식재료와 관련된 이야기만 해주세요."
+
+FAKE_EXTRACTED_NAMES = ["감자", "양파", "두부", "삼겹살", "우유", "과자"]
+
+# 가짜 OCR 분류 결과 (모르는 이름은 기타)
+FAKE_CATEGORIES = {
+    "감자": ("식물성", "곡류·서류", "30일"),
+    "양파": ("식물성", "채소류", "30일"),
+    "두부": ("식물성", "두류·견과", "7일"),
+    "삼겹살": ("동물성", "육류", "3일"),
+    "우유": ("동물성", "유제품", "10일"),
+    "과자": ("기타", "스낵/과자", "180일"),
+}
+
+
+def _fake_label(prompt: str) -> str:
+    """프롬프트 안의 사용자 요청을 로컬 분류기로 분류"""
+    from domain.qa.qa_classifier import fast_classify
+    m = re.search(r'사용자 요청: "(.*)"', prompt)
+    label, _ = fast_classify(m.group(1) if m else "")
+    return label or "예외"
+
+
+def _fake_recipes(with_missing: bool) -> str:
+    recipe = FAKE_RECIPE
+    if with_missing:
+        recipe += "\n🛒 추가로 필요한 재료: 식용유, 소금"
+    return "\n\n".join([recipe] * 3)
+
+
+def fake_chat_response(prompt: str) -> str:
+    """프롬프트 종류에 맞는 형식의 고정 응답"""
+    if "분류기 역할" in prompt:
+        return _fake_label(prompt)
+    if "🍲" in prompt:
+        return _fake_recipes("🛒" in prompt)
+    return FAKE_OTHER
+
+
+def fake_tool_args(tool: dict, prompt: str) -> dict:
+    """function calling 스키마(분류 + 답변 등)의 필드를 채운 가짜 인자"""
+    label = _fake_label(prompt)
+    if label in ("일반레시피", "요리키워드", "재료키워드", "카테고리"):
+        answer = _fake_recipes(label != "일반레시피")
+    else:
+        answer = FAKE_OTHER
+    args = {}
+    for name, spec in tool["function"]["parameters"].get("properties", {}).items():
+        if "enum" in spec:
+            args[name] = label if label in spec["enum"] else spec["enum"][0]
+        elif spec.get("type") == "array":
+            args[name] = []
+        else:
+            args[name] = answer
+    return args
+
+
+def _fake_ocr_content(messages: list[dict], response_format: dict | None) -> str:
+    user = messages[-1]["content"]
+    schema = (response_format or {}).get("json_schema", {}).get("name")
+    if schema == "receipt_names":
+        # 이미지 → 상품명 추출
+        content = {"names": FAKE_EXTRACTED_NAMES}
+    elif schema == "receipt_items":
+        # 이미지 → 추출과 분류를 한 번에
+        content = {"items": _fake_classified(FAKE_EXTRACTED_NAMES)}
+    else:
+        # 이름 목록 → 분류
+        content = {"items": _fake_classified(json.loads(user))}
+    raw = json.dumps(content, ensure_ascii=False)
+    if random.random() < FAKE_LLM_INVALID_RATE:
+        # 출력 토큰 한도에 걸려 잘린 응답
+        return raw[:len(raw) // 2]
+    return raw
+
+
+def _fake_classified(names: list[str]) -> list[dict]:
+    items = []
+    for name in names:
+        major, sub, expiry = FAKE_CATEGORIES.get(name, ("기타", "스낵/과자", "30일"))
+        if random.random() < FAKE_LLM_INVALID_RATE:
+            # 규칙에 어긋난 항목: 단위가 다른 유통기한 / 대분류 불일치 / 목록에 없는 소분류
+            major, sub, expiry = random.choice([
+                (major, sub, "1주"),
+                ("동물성" if major != "동물성" else "식물성", sub, expiry),
+                (major, "기타식품", expiry),
+            ])
+        items.append({
+            "item_name": name,
+            "category_major_name": major,
+            "category_sub_name": sub,
+            "expiry_text": expiry,
+        })
+    return items
+
+
+class FakeChatModel(BaseChatModel):
+    """설정된 지연 후 형식에 맞는 응답을 주는 langchain 채팅 모델"""
+    model: str = "fake"
+
+    @property
+    def _llm_type(self) -> str:
+        return "fake-chat"
+
+    def bind_tools(self, tools, **kwargs):
+        return self.bind(tools=[convert_to_openai_tool(t) for t in tools], **kwargs)
+
+    def _respond(self, messages, tools) -> AIMessage:
+        prompt = "\n".join(str(m.content) for m in messages)
+        if tools:
+            tool = tools[0]
+            return AIMessage(content="", tool_calls=[{
+                "name": tool["function"]["name"],
+                "args": fake_tool_args(tool, prompt),
+                "id": "call_fake",
+            }])
+        return AIMessage(content=fake_chat_response(prompt))
+
+    def _generate(self, messages, stop=None, run_manager=None, tools=None, **kwargs) -> ChatResult:
+        message = self._respond(messages, tools)
+        time.sleep(_delay_seconds(message.content))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _agenerate(self, messages, stop=None, run_manager=None, tools=None, **kwargs) -> ChatResult:
+        message = self._respond(messages, tools)
+        await asyncio.sleep(_delay_seconds(message.content))
+        return ChatResult(generations=[ChatGeneration(message=message)])
+
+    async def _astream(self, messages, stop=None, run_manager=None, **kwargs):
+        # 첫 토큰까지 지연의 1/4, 나머지는 줄 단위로 나눠 전달
+        content = self._respond(messages, None).content
+        total = _delay_seconds(content)
+        await asyncio.sleep(total / 4)
+        lines = content.splitlines(keepends=True)
+        for line in lines:
+            await asyncio.sleep(total * 3 / 4 / max(len(lines), 1))
+            yield ChatGenerationChunk(message=AIMessageChunk(content=line))
+
+
+class _FakeCompletions:
+    async def create(self, model: str, messages: list[dict], response_format: dict | None = None, **kwargs):
+        content = _fake_ocr_content(messages, response_format)
+        await asyncio.sleep(_delay_seconds(content))
+        message = SimpleNamespace(content=content)
+        return SimpleNamespace(choices=[SimpleNamespace(message=message)])
+
+
+class FakeOpenAIClient:
+    """openai.AsyncOpenAI 의 chat.completions.create 만 흉내 내는 가짜 클라이언트"""
+    def __init__(self):
+        self.chat = SimpleNamespace(completions=_FakeCompletions())
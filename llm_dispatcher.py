@@ -0,0 +1,143 @@
+import asyncio
+import hashlib
+import time
+from contextlib import asynccontextmanager
+
+from fastapi import APIRouter, HTTPException
+
+from config import LLM_MAX_CONCURRENCY, LLM_MAX_QUEUE, LLM_MODEL_CONCURRENCY
+
+# LLM 호출 중앙 디스패처
+# - 모델별 동시 실행 수 제한 + 대기열 길이 제한 (초과 시 503)
+# - 같은 프롬프트가 이미 실행 중이면 새로 호출하지 않고 그 결과를 함께 기다림
+# - 대기 시간(queue time) / 실행 시간(service time) 지표 수집
+
+router = APIRouter(prefix="/llm")
+
+
+def _parse_limits(spec: str) -> dict[str, int]:
+    """"gpt-4.1=16,gpt-4.1-mini=32" → {"gpt-4.1": 16, "gpt-4.1-mini": 32}"""
+    limits = {}
+    for part in spec.split(","):
+        if "=" in part:
+            model, limit = part.split("=", 1)
+            limits[model.strip()] = int(limit)
+    return limits
+
+
+_model_limits = _parse_limits(LLM_MODEL_CONCURRENCY)
+
+
+class _ModelState:
+    def __init__(self, limit: int):
+        self.limit = limit
+        self.semaphore = asyncio.Semaphore(limit)
+        self.waiting = 0
+        self.in_flight = 0
+        self.requests = 0
+        self.coalesced = 0
+        self.rejected = 0
+        self.errors = 0
+        self.completed = 0
+        self.queue_time_total = 0.0
+        self.queue_time_max = 0.0
+        self.service_time_total = 0.0
+        self.service_time_max = 0.0
+
+
+_states: dict[str, _ModelState] = {}
+_inflight: dict[tuple, asyncio.Future] = {}
+
+
+def _state(model: str) -> _ModelState:
+    state = _states.get(model)
+    if state is None:
+        state = _states[model] = _ModelState(_model_limits.get(model, LLM_MAX_CONCURRENCY))
+    return state
+
+
+@asynccontextmanager
+async def llm_slot(model: str):
+    """모델 동시 실행 슬롯 하나를 점유 (스트리밍처럼 합치기가 불가능한 호출용)"""
+    state = _state(model)
+    if state.waiting >= LLM_MAX_QUEUE:
+        state.rejected += 1
+        raise HTTPException(status_code=503, detail="요청이 많아 잠시 후 다시 시도해주세요.")
+
+    state.waiting += 1
+    enqueued = time.perf_counter()
+    try:
+        await state.semaphore.acquire()
+    finally:
+        state.waiting -= 1
+    queued = time.perf_counter() - enqueued
+    state.queue_time_total += queued
+    state.queue_time_max = max(state.queue_time_max, queued)
+
+    state.in_flight += 1
+    started = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        state.errors += 1
+        raise
+    finally:
+        served = time.perf_counter() - started
+        state.service_time_total += served
+        state.service_time_max = max(state.service_time_max, served)
+        state.completed += 1
+        state.in_flight -= 1
+        state.semaphore.release()
+
+
+async def _run(model: str, factory):
+    async with llm_slot(model):
+        return await factory()
+
+
+async def dispatch(model: str, key: str | None, factory):
+    """
+    factory() 가 만드는 LLM 호출 코루틴을 모델 슬롯 안에서 실행.
+    key(프롬프트 전체 등)가 같은 호출이 이미 진행 중이면 그 결과를 공유한다.
+    """
+    state = _state(model)
+    state.requests += 1
+    if key is None:
+        return await _run(model, factory)
+
+    coalesce_key = (model, hashlib.sha256(key.encode("utf-8")).hexdigest())
+    running = _inflight.get(coalesce_key)
+    if running is not None:
+        state.coalesced += 1
+        return await asyncio.shield(running)
+
+    task = asyncio.ensure_future(_run(model, factory))
+    _inflight[coalesce_key] = task
+    task.add_done_callback(lambda _: _inflight.pop(coalesce_key, None))
+    # 한 호출자가 취소돼도 같은 결과를 기다리는 다른 호출자에게는 영향 없음
+    return await asyncio.shield(task)
+
+
+def dispatcher_metrics() -> dict:
+    metrics = {}
+    for model, s in _states.items():
+        metrics[model] = {
+            "limit": s.limit,
+            "in_flight": s.in_flight,
+            "queued": s.waiting,
+            "requests": s.requests,
+            "coalesced": s.coalesced,
+            "rejected": s.rejected,
+            "errors": s.errors,
+            "completed": s.completed,
+            "queue_time_avg": s.queue_time_total / s.completed if s.completed else 0.0,
+            "queue_time_max": s.queue_time_max,
+            "service_time_avg": s.service_time_total / s.completed if s.completed else 0.0,
+            "service_time_max": s.service_time_max,
+        }
+    return metrics
+
+
+@router.get("/metrics")
+def read_dispatcher_metrics():
+    return dispatcher_metrics()
@@ -4,6 +4,7 @@ from contextlib import asynccontextmanager
 from apscheduler.schedulers.asyncio import AsyncIOScheduler
 
 from domain.category import category_router
+from domain.category.category_cache import load_categories
 from notifications import notify_expiring_items
 from sqlalchemy.orm import Session
 
@@ -13,8 +14,11 @@ from domain.user import user_router, user_crud
 from domain.item import item_router
 from domain.qa import qa_router
 from domain.ocr.ocr_router import router as ocr_router
+from domain.ocr.ocr_utils import UploadSizeLimitMiddleware
 
 from notifications import notify_expiring_items, router as notifications_router
+from llm_dispatcher import router as llm_router
+from job_queue import router as jobs_router, start_workers, stop_workers
 
 # 1) 스케줄러 인스턴스 생성
 scheduler = AsyncIOScheduler()
@@ -26,15 +30,24 @@ async def lifespan(app: FastAPI):
     # 매일 오후 18:00에 알림 작업 실행
     scheduler.add_job(notify_expiring_items, 'cron', hour=10, minute=16)
     scheduler.start()
+    # 카테고리 캐시 적재
+    load_categories()
+    # 백그라운드 작업(OCR 등) 워커 시작
+    start_workers()
 
     yield  # 여기서 FastAPI가 “running” 상태로 전환됩니다
 
     # --- shutdown logic ---
     scheduler.shutdown()
+    await stop_workers()
 
 # 3) FastAPI 앱 생성 시 lifespan 파라미터로 전달
 app = FastAPI(lifespan=lifespan)
 
+# OCR 업로드 크기 제한 (본문을 임시 파일로 다 받기 전에 413)
+# CORS 보다 먼저 등록 → CORS 안쪽에서 실행되어 413 응답에도 CORS 헤더가 붙는다
+app.add_middleware(UploadSizeLimitMiddleware)
+
 # CORS 미들웨어 설정
 # 외부 도메인에서의 API 접근을 위한 보안 설정
 app.add_middleware(
@@ -55,6 +68,8 @@ app.include_router(ocr_router,           tags=["OCR"])
 app.include_router(qa_router.router)
 app.include_router(category_router.router)
 app.include_router(notifications_router, tags=["Notifications"])
+app.include_router(llm_router,           tags=["LLM"])
+app.include_router(jobs_router,          tags=["Jobs"])
 
 @app.get("/mypage/{user_id}", tags=["MyPage"])
 async def get_mypage(user_id: int, db: Session = Depends(get_db)):
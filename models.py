@@ -1,5 +1,5 @@
 from sqlalchemy import (
-    Column, Integer, String, Date, DateTime, Boolean, ForeignKey
+    Column, Integer, String, Date, DateTime, Boolean, ForeignKey, UniqueConstraint, Index
 )
 from sqlalchemy.orm import relationship
 from database import Base
@@ -18,6 +18,15 @@ class User(Base):
 
 class Item(Base):
     __tablename__ = "items"
+    # 한 사용자의 같은 이름+카테고리 재고는 한 행 (upsert_items 의 ON CONFLICT 대상)
+    __table_args__ = (
+        UniqueConstraint("user_id", "item_name", "category_id", name="uq_items_user_name_category"),
+        # 재고 목록 keyset 페이지: 사용자별 (등록일, id) / (유통기한, id) 순서
+        Index("ix_items_user_created", "user_id", "created_at", "item_id"),
+        Index("ix_items_user_expiry", "user_id", "expiry_date", "item_id"),
+        # 유통기한 알림: 날짜로 전체 사용자 재고 조회
+        Index("ix_items_expiry_user", "expiry_date", "user_id"),
+    )
     item_id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.user_id", ondelete="CASCADE"), nullable=False)
     category_id  = Column(Integer, ForeignKey("categories.category_id", ondelete="CASCADE"),
@@ -35,8 +44,39 @@ class Item(Base):
 
 class Category(Base):
     __tablename__ = "categories"
+    # (대분류, 소분류) 는 한 행 → 여러 워커가 동시에 만들어도 중복되지 않음
+    __table_args__ = (
+        UniqueConstraint("category_major_name", "category_sub_name", name="uq_categories_major_sub"),
+    )
     category_id = Column(Integer, primary_key=True, index=True)
     category_major_name = Column(String(30), nullable=False)
     category_sub_name = Column(String(30), nullable=False)
 
-    items = relationship("Item", back_populates="category", cascade="all, delete-orphan")
\ No newline at end of file
+    items = relationship("Item", back_populates="category", cascade="all, delete-orphan")
+
+# 요청 문장 → 분류 라벨 메모 (모든 워커가 공유)
+class ClassificationMemo(Base):
+    __tablename__ = "classification_memo"
+    request_key = Column(String(100), primary_key=True)  # 정규화된 요청 문장
+    label = Column(String(20), nullable=False)
+    hit_count = Column(Integer, nullable=False, default=0)
+    last_used_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False,
+        index=True
+    )
+
+# 식재료 이름 → 분류/유통기한 사전 (OCR classify_names 결과 재사용)
+class IngredientDictionary(Base):
+    __tablename__ = "ingredient_dictionary"
+    item_name = Column(String(50), primary_key=True)  # 정규화된 식재료 이름
+    category_major_name = Column(String(30), nullable=False)
+    category_sub_name = Column(String(30), nullable=False)
+    expiry_text = Column(String(20), nullable=False)
+    source = Column(String(10), nullable=False)  # "items"(기존 재고에서 시드) / "llm"
+    updated_at = Column(
+        DateTime(timezone=True),
+        default=lambda: datetime.now(timezone.utc),
+        nullable=False
+    )
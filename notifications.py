@@ -9,7 +9,8 @@ import firebase_admin
 from firebase_admin import credentials, initialize_app, messaging
 from sqlalchemy.orm import Session
 from database import SessionLocal, get_db
-from models import User, Item
+from models import User
+from domain.item.item_crud import get_items_expiring_on
 
 import config
 import logging
@@ -91,7 +92,7 @@ def notify_expiring_items():
         # days 튜플로 수정: (3,) 혹은 (1,3,7) 등 원하는 일수
         for days in (3,):
             target = today + timedelta(days=days)
-            items = db.query(Item).filter(Item.expiry_date == target).all()
+            items = get_items_expiring_on(db, target)
             for item in items:
                 user = item.user
                 if not user.notification or not user.fcm_token: